@@ -0,0 +1,101 @@
+"""
+Soporte de peticiones GET condicionales (ETag / Last-Modified) para ViewSets.
+"""
+
+import hashlib
+from calendar import timegm
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Sum
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Añade validadores a `list` y `retrieve` y responde 304 sin serializar nada
+    cuando el cliente envía un `If-None-Match` / `If-Modified-Since` vigente.
+
+    Los validadores salen de un agregado barato sobre el mismo queryset que
+    usaría la vista: `max(updated_at)`, número de filas y la suma de los campos
+    de `conditional_sum_fields` (contadores que cambian sin tocar `updated_at`).
+    La ETag incluye además el usuario, la URL completa y el formato de respuesta.
+
+    En `list` solo se envía ETag: una baja no cambia `max(updated_at)`, así que
+    `Last-Modified` no sería un validador fiable para el listado.
+
+    Si la vista define `get_stored_validators(request)` y devuelve los validadores
+    ya conocidos (p. ej. guardados junto a una respuesta cacheada, ver
+    posts/cache.py), el agregado no se ejecuta. Los validadores usados quedan en
+    `self.conditional_validators`.
+    """
+
+    conditional_timestamp_field = "updated_at"
+    conditional_sum_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        def validators():
+            etag, _ = self.get_validators(self.filter_queryset(self.get_queryset()))
+            return etag, None
+
+        return self.conditional_response(request, validators, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        def validators():
+            return self.get_validators(self.get_conditional_detail_queryset())
+
+        return self.conditional_response(request, validators, super().retrieve, *args, **kwargs)
+
+    def get_conditional_detail_queryset(self):
+        """Queryset cuyo agregado representa al objeto de `retrieve`."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Igual que get_object_or_404: un pk mal formado es un 404, no un 500
+            raise Http404
+
+    def get_validators(self, queryset):
+        """Devuelve (etag, last_modified) o (None, None) si no hay filas."""
+        aggregates = {
+            "last_modified": Max(self.conditional_timestamp_field),
+            "total": Count("pk"),
+        }
+        for field in self.conditional_sum_fields:
+            aggregates[f"sum_{field}"] = Sum(field)
+        values = queryset.order_by().aggregate(**aggregates)
+        if not values["total"]:
+            return None, None
+
+        user = self.request.user
+        parts = [
+            *(values[key] for key in sorted(values)),
+            user.pk if user.is_authenticated else None,
+            self.request.get_full_path(),
+            getattr(self.request, "accepted_media_type", None),
+        ]
+        digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        return f'"{digest}"', timegm(values["last_modified"].utctimetuple())
+
+    def conditional_response(self, request, get_validators, handler, *args, **kwargs):
+        get_stored_validators = getattr(self, "get_stored_validators", None)
+        validators = get_stored_validators(request) if get_stored_validators else None
+        if validators is None:
+            validators = get_validators()
+        self.conditional_validators = validators
+        etag, last_modified = validators
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
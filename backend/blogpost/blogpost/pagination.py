@@ -0,0 +1,187 @@
+"""
+Clases de paginación compartidas por las apps de la API.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) ordenada por (created_at, id) descendente.
+
+    En lugar de OFFSET filtra con `created_at < t OR (created_at = t AND id < i)`,
+    por lo que cada página es un rango sobre los índices que empiezan por
+    created_at y no se ejecuta ningún COUNT(*). Ignora el parámetro `ordering`.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Cursor inválido."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        position, reverse = self.decode_cursor(request)
+        if reverse:
+            queryset = queryset.order_by("created_at", "id")
+        else:
+            queryset = queryset.order_by("-created_at", "-id")
+
+        if position is not None:
+            created_at, pk = position
+            if reverse:
+                keyset = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            else:
+                keyset = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            queryset = queryset.filter(keyset)
+
+        # Pedimos un elemento extra para saber si hay más páginas sin contar
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        """Devuelve ((created_at, id), reverse) a partir del parámetro `cursor`."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            created_at = parse_datetime(payload["t"])
+            pk = int(payload["i"])
+            reverse = bool(payload.get("r", False))
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (created_at, pk), reverse
+
+    def encode_cursor(self, instance, reverse=False):
+        payload = {"t": instance.created_at.isoformat(), "i": instance.pk}
+        if reverse:
+            payload["r"] = True
+        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class OptionalCursorPagination(BasePagination):
+    """
+    Paginación por número de página por defecto, con paginación keyset opcional.
+
+    El cliente activa el modo cursor por petición con `?pagination=cursor`
+    (o enviando directamente un `cursor`), lo que permite migrar el frontend
+    de forma gradual sin romper a los clientes que usan `?page=`.
+    """
+
+    mode_query_param = "pagination"
+    page_number_class = PageNumberPagination
+    cursor_class = KeysetPagination
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.paginator = self.cursor_class()
+        else:
+            self.paginator = self.page_number_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, "display_page_controls", False)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = self.page_number_class().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Usa `cursor` para activar la paginación keyset.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            }
+        )
+        return parameters
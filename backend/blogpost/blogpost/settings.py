@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from datetime import timedelta
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,6 +53,8 @@ INSTALLED_APPS = [
     "posts",
     "comments",
     "likes",
+    "search",
+    "stats",
 ]
 
 MIDDLEWARE = [
@@ -92,10 +95,44 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Base de tests en archivo (no en memoria) para que los tests con varios
+        # hilos tengan conexiones independientes (ver likes/tests.py)
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Memoria local por defecto; para compartirla entre procesos sin servicios externos
+# puede usarse "django.core.cache.backends.filebased.FileBasedCache".
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "blogpost",
+    }
+}
+
+# Segundos que se guardan las respuestas anónimas de /api/posts/ (ver posts/cache.py)
+POSTS_RESPONSE_CACHE_TIMEOUT = 300
+
+# Segundos que se guarda la respuesta de /api/auth/me/ de cada usuario (ver users/cache.py)
+ME_CACHE_TIMEOUT = 300
+
+# Lecturas de posts: se acumulan en memoria y se vuelcan cada N segundos
+POST_VIEWS_FLUSH_INTERVAL = 30
+
+# Tendencias: los posts más antiguos que esto no puntúan (ver posts/hotness.py)
+HOT_SCORE_MAX_AGE_DAYS = 14
+
+# Comentarios casi duplicados (MinHash): los nuevos que se parecen a uno reciente
+# del mismo autor o de otro post quedan pendientes de aprobación
+COMMENT_DUPLICATE_DETECTION = True
+COMMENT_DUPLICATE_WINDOW = 24 * 60 * 60  # segundos
+COMMENT_DUPLICATE_SIMILARITY = 0.75  # similitud de Jaccard de las palabras (0 a 1)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -147,9 +184,11 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        # JWT primero: las lecturas se autentican sin consultar la base de datos
+        "users.authentication.JWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
-        # "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Basic con caché de credenciales verificadas (ver users/authentication.py)
+        "users.authentication.CachedBasicAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -166,6 +205,21 @@ REST_FRAMEWORK = {
     "MAX_PAGE_SIZE": 100,
 }
 
+SIMPLE_JWT = {
+    # Vida corta: las lecturas confían en los claims sin volver a mirar el usuario
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "UPDATE_LAST_LOGIN": False,
+    "TOKEN_USER_CLASS": "users.authentication.TokenUser",
+}
+
+# Credenciales Basic verificadas que se recuerdan por proceso, y durante cuántos segundos
+BASIC_AUTH_CACHE_SIZE = 1024
+BASIC_AUTH_CACHE_TTL = 300
+
+# Cliente HTTP que renueva los tokens OAuth de los proveedores (ver users/oauth.py)
+OAUTH_TOKEN_REFRESH_CLIENT = "users.oauth.RequestsTokenRefreshClient"
+
 AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",  # login normal
     "allauth.account.auth_backends.AuthenticationBackend",  # login allauth
@@ -15,10 +15,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.contrib import admin
-from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.contrib import admin
+from django.urls import include, path
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -26,6 +26,7 @@ urlpatterns = [
     path("api/", include("users.urls")),
     path("api/", include("comments.urls")),
     path("api/", include("likes.urls")),
+    path("api/", include("stats.urls")),
 ]
 
 # Servir archivos de media en desarrollo
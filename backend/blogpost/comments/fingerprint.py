@@ -0,0 +1,93 @@
+"""
+Huella MinHash del contenido de los comentarios para detectar casi-duplicados.
+
+El texto se normaliza (minúsculas, sin acentos ni signos) y se reduce al
+conjunto de sus palabras. La firma son los mínimos de SIGNATURE_SIZE funciones
+hash sobre ese conjunto: la fracción de posiciones iguales entre dos firmas
+estima la similitud de Jaccard entre los textos.
+
+Para buscar sin recorrer la tabla (LSH), la firma se divide en BAND_COUNT
+bandas de ROWS_PER_BAND valores y cada banda se resume en un entero que se
+guarda en una columna indexada. Dos textos con similitud alta comparten alguna
+banda con probabilidad muy alta (~0.88 con Jaccard 0.8, ~0.99 con 0.9), así
+que basta con buscar por igualdad en cada banda. Con solo 16 valores la
+estimación de la firma es ruidosa, por lo que los candidatos se confirman con
+la similitud de Jaccard exacta de sus conjuntos de palabras (`jaccard`).
+"""
+
+import hashlib
+import random
+import re
+import unicodedata
+
+SIGNATURE_SIZE = 16
+BAND_COUNT = 4
+ROWS_PER_BAND = SIGNATURE_SIZE // BAND_COUNT
+
+# Textos con menos palabras distintas que esto no se comparan ("Gracias!", "+1", ...)
+MIN_WORDS = 6
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Coeficientes fijos de las funciones hash (a * x + b) mod p: no deben cambiar
+# o las firmas guardadas dejarían de ser comparables
+_rng = random.Random(1729)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(SIGNATURE_SIZE)
+]
+del _rng
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Minúsculas y sin acentos, para que "Genial" y "genial!!" cuenten igual."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def words(text):
+    """Conjunto de palabras normalizadas del texto."""
+    return set(_WORD_RE.findall(normalize(text)))
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def signature(text):
+    """Firma MinHash (tupla de SIGNATURE_SIZE enteros) o None si el texto es muy corto."""
+    tokens = words(text)
+    if len(tokens) < MIN_WORDS:
+        return None
+
+    hashes = [_hash(token) for token in tokens]
+    return tuple(
+        min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def bands(sig):
+    """Resume cada banda de la firma en un entero de 31 bits (cabe en un INTEGER)."""
+    result = []
+    for band in range(BAND_COUNT):
+        rows = sig[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            b"".join(value.to_bytes(4, "big") for value in rows), digest_size=4
+        ).digest()
+        result.append(int.from_bytes(digest, "big") & 0x7FFFFFFF)
+    return tuple(result)
+
+
+def jaccard(first, second):
+    """Similitud de Jaccard exacta entre dos conjuntos de palabras (0 a 1)."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def encode(sig):
+    """Firma en texto hexadecimal de ancho fijo, para guardarla en una columna."""
+    return "".join(f"{value:08x}" for value in sig)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from comments.models import FINGERPRINT_FIELDS, Comment
+
+
+class Command(BaseCommand):
+    help = "Calcula la huella MinHash de los comentarios existentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Cantidad de comentarios procesados por lote (por defecto 500).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recalcula todos los comentarios, no solo los que no tienen huella.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Comment.all_objects.order_by("pk").only("id", "content")
+        if not options["all"]:
+            queryset = queryset.filter(fingerprint="")
+
+        last_id = 0
+        updated = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+
+            for comment in batch:
+                comment.update_fingerprint()
+            Comment.all_objects.bulk_update(batch, FINGERPRINT_FIELDS)
+
+            updated += len(batch)
+            last_id = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} comentarios actualizados."))
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+PATH_SEGMENT_WIDTH = 10
+BATCH_SIZE = 1000
+
+
+def backfill_thread_paths(apps, schema_editor):
+    """Calcula path y depth de los comentarios existentes recorriendo los ids en orden."""
+    Comment = apps.get_model("comments", "Comment")
+    paths = {}
+    pending = []
+    # Un padre siempre tiene un id menor que sus respuestas
+    for comment in Comment.objects.only("id", "parent_id").order_by("id").iterator():
+        parent_path, parent_depth = paths.get(comment.parent_id, ("", -1))
+        comment.path = f"{parent_path}{comment.id:0{PATH_SEGMENT_WIDTH}d}/"
+        comment.depth = parent_depth + 1
+        paths[comment.id] = (comment.path, comment.depth)
+        pending.append(comment)
+        if len(pending) >= BATCH_SIZE:
+            Comment.objects.bulk_update(pending, ["path", "depth"])
+            pending = []
+    if pending:
+        Comment.objects.bulk_update(pending, ["path", "depth"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0001_initial"),
+        ("posts", "0006_tag_posts_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(blank=True, default="", max_length=451),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["post", "path"], name="comments_thread_path_idx"),
+        ),
+        migrations.RunPython(backfill_thread_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_replies_count(apps, schema_editor):
+    """Inicializa replies_count con las respuestas no eliminadas de cada comentario."""
+    Comment = apps.get_model("comments", "Comment")
+    counts = (
+        Comment.objects.filter(parent_id=OuterRef("pk"), deleted_at__isnull=True)
+        .order_by()
+        .values("parent_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Comment.objects.update(replies_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0002_comment_thread_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="replies_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_replies_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0003_comment_replies_count"),
+        ("posts", "0006_tag_posts_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True), ("is_approved", False)),
+                fields=["post", "created_at"],
+                name="comments_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0004_comment_pending_index"),
+        ("posts", "0006_tag_posts_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="fingerprint",
+            field=models.CharField(blank=True, default="", editable=False, max_length=128),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="fingerprint_band_0",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="fingerprint_band_1",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="fingerprint_band_2",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="fingerprint_band_3",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["fingerprint_band_0", "created_at"], name="comments_fp_band_0_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["fingerprint_band_1", "created_at"], name="comments_fp_band_1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["fingerprint_band_2", "created_at"], name="comments_fp_band_2_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["fingerprint_band_3", "created_at"], name="comments_fp_band_3_idx"
+            ),
+        ),
+    ]
@@ -1,9 +1,107 @@
-from django.db import models
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
 from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_save
 from django.utils import timezone
+from posts import counters
+
+from . import fingerprint
+
+# Ruta materializada: ids de los ancestros y del propio comentario, con ancho fijo
+# para que el orden alfabético de `path` sea el orden del hilo ("0000000001/0000000007/")
+PATH_SEGMENT_WIDTH = 10
+MAX_THREAD_DEPTH = 40
+
+FINGERPRINT_BAND_FIELDS = tuple(
+    f"fingerprint_band_{band}" for band in range(fingerprint.BAND_COUNT)
+)
+FINGERPRINT_FIELDS = ("fingerprint", *FINGERPRINT_BAND_FIELDS)
+# Contadores desnormalizados: solo se escriben con UPDATE atómicos (ver Comment.save)
+COUNTER_FIELDS = ("replies_count",)
+
+# Candidatos que se comparan como máximo al buscar casi-duplicados
+NEAR_DUPLICATE_CANDIDATES = 200
+
+
+class CommentQuerySet(models.QuerySet):
+    """
+    QuerySet con las operaciones de moderación de comentarios.
+    """
+
+    def visible_to(self, user):
+        """
+        Comentarios que puede ver `user`: los aprobados y, si está autenticado,
+        los suyos y los pendientes de moderación en sus posts.
+        """
+        if not user.is_authenticated:
+            return self.filter(is_approved=True)
+        return self.filter(Q(is_approved=True) | Q(author_id=user.pk) | Q(post__author_id=user.pk))
+
+    def for_post_page(self):
+        """
+        Carga solo las columnas que muestra la página de un post, con el autor
+        limitado a id, username y avatar (sin traer el post).
+        """
+        return self.select_related("author").only(
+            "id",
+            "content",
+            "post_id",
+            "parent_id",
+            "created_at",
+            "updated_at",
+            "is_approved",
+            "is_edited",
+            "replies_count",
+            "author__id",
+            "author__username",
+            "author__avatar_url",
+        )
+
+    def near_duplicates_of(self, content, since, min_similarity):
+        """
+        Ids de los comentarios creados desde `since` cuyo contenido tiene una
+        similitud de Jaccard >= `min_similarity` con `content`. Solo lee las filas
+        que comparten alguna banda MinHash, a través de sus índices, y confirma
+        cada candidata con la similitud exacta de sus palabras.
+        """
+        sig = fingerprint.signature(content)
+        if sig is None:
+            return []
+        tokens = fingerprint.words(content)
+        band_match = reduce(
+            or_,
+            (
+                Q(**{field: band})
+                for field, band in zip(FINGERPRINT_BAND_FIELDS, fingerprint.bands(sig))
+            ),
+        )
+        candidates = self.filter(band_match, created_at__gte=since).values_list("pk", "content")[
+            :NEAR_DUPLICATE_CANDIDATES
+        ]
+        return [
+            pk
+            for pk, other in candidates
+            if fingerprint.jaccard(tokens, fingerprint.words(other)) >= min_similarity
+        ]
+
+    def pending(self):
+        """Comentarios pendientes de aprobación (usa el índice parcial de moderación)."""
+        return self.filter(is_approved=False, deleted_at__isnull=True)
+
+    def approve(self):
+        """Aprueba todos los comentarios del queryset en un solo UPDATE."""
+        return self.filter(is_approved=False).update(is_approved=True, updated_at=timezone.now())
 
+    def disapprove(self):
+        """Desaprueba todos los comentarios del queryset en un solo UPDATE."""
+        return self.filter(is_approved=True).update(is_approved=False, updated_at=timezone.now())
 
-class CommentManager(models.Manager):
+
+class CommentManager(models.Manager.from_queryset(CommentQuerySet)):
     """
     Manager personalizado que filtra automáticamente los comentarios eliminados.
     """
@@ -34,9 +132,27 @@ class Comment(models.Model):
     is_approved = models.BooleanField(default=True)
     is_edited = models.BooleanField(default=False)
 
+    # Árbol del hilo (materialized path), se asigna al crear el comentario
+    path = models.CharField(
+        max_length=(PATH_SEGMENT_WIDTH + 1) * (MAX_THREAD_DEPTH + 1), blank=True, default=""
+    )
+    depth = models.PositiveSmallIntegerField(default=0)
+
+    # Respuestas directas no eliminadas (desnormalizado, ver _adjust_replies_count)
+    replies_count = models.PositiveIntegerField(default=0)
+
+    # Firma MinHash del contenido y sus bandas indexadas (ver comments/fingerprint.py)
+    fingerprint = models.CharField(
+        max_length=fingerprint.SIGNATURE_SIZE * 8, blank=True, default="", editable=False
+    )
+    fingerprint_band_0 = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    fingerprint_band_1 = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    fingerprint_band_2 = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    fingerprint_band_3 = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
     # Managers
     objects = CommentManager()  # Manager personalizado (filtra eliminados)
-    all_objects = models.Manager()  # Manager para ver todos (incluyendo eliminados)
+    all_objects = CommentQuerySet.as_manager()  # Manager para ver todos (incluyendo eliminados)
 
     class Meta:
         ordering = ["-created_at"]
@@ -44,15 +160,159 @@ class Comment(models.Model):
             models.Index(fields=["post", "created_at"]),
             models.Index(fields=["author", "created_at"]),
             models.Index(fields=["parent", "created_at"]),
+            models.Index(fields=["post", "path"], name="comments_thread_path_idx"),
+            # Cola de moderación: solo contiene los comentarios pendientes
+            models.Index(
+                fields=["post", "created_at"],
+                condition=Q(is_approved=False, deleted_at__isnull=True),
+                name="comments_pending_idx",
+            ),
+            # Búsqueda de casi-duplicados recientes: igualdad en una banda + rango de fechas
+            models.Index(
+                fields=["fingerprint_band_0", "created_at"], name="comments_fp_band_0_idx"
+            ),
+            models.Index(
+                fields=["fingerprint_band_1", "created_at"], name="comments_fp_band_1_idx"
+            ),
+            models.Index(
+                fields=["fingerprint_band_2", "created_at"], name="comments_fp_band_2_idx"
+            ),
+            models.Index(
+                fields=["fingerprint_band_3", "created_at"], name="comments_fp_band_3_idx"
+            ),
         ]
 
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.title}"
 
+    @staticmethod
+    def build_path(pk, parent_path=""):
+        return f"{parent_path}{pk:0{PATH_SEGMENT_WIDTH}d}/"
+
+    def save(self, *args, **kwargs):
+        """
+        Al crear un comentario calcula su ruta en el hilo e incrementa el
+        contador del post (y el de respuestas del padre).
+
+        La huella del contenido se recalcula cuando cambia el contenido, y los
+        comentarios nuevos casi idénticos a otros recientes quedan pendientes
+        de aprobación.
+
+        El guardado completo de un comentario existente no escribe los
+        contadores, para no pisar los incrementos concurrentes.
+        """
+        is_new = self._state.adding
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not is_new:
+            update_fields = kwargs["update_fields"] = {
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS
+            } - self.get_deferred_fields()
+        if is_new or update_fields is None or "content" in update_fields:
+            self.update_fingerprint()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *FINGERPRINT_FIELDS}
+
+        with transaction.atomic():
+            if is_new and self.is_approved and self.is_near_duplicate():
+                self.is_approved = False
+            super().save(*args, **kwargs)
+            if is_new:
+                self._assign_path()
+                if self.deleted_at is None:
+                    counters.comment_added(self.post_id, self.created_at)
+                    self._adjust_replies_count(self.parent_id, 1)
+
+    def update_fingerprint(self):
+        """Calcula la firma MinHash del contenido y sus bandas."""
+        sig = fingerprint.signature(self.content or "")
+        if sig is None:
+            self.fingerprint = ""
+            band_values = [None] * fingerprint.BAND_COUNT
+        else:
+            self.fingerprint = fingerprint.encode(sig)
+            band_values = fingerprint.bands(sig)
+        for field, band in zip(FINGERPRINT_BAND_FIELDS, band_values):
+            setattr(self, field, band)
+
+    def is_near_duplicate(self):
+        """
+        Indica si hay un comentario reciente casi idéntico del mismo autor o en
+        otro post (las ráfagas de spam repiten el texto en muchos posts).
+        Se configura con COMMENT_DUPLICATE_WINDOW (segundos) y
+        COMMENT_DUPLICATE_SIMILARITY; COMMENT_DUPLICATE_DETECTION la desactiva.
+        """
+        if not self.fingerprint or not getattr(settings, "COMMENT_DUPLICATE_DETECTION", True):
+            return False
+
+        window = getattr(settings, "COMMENT_DUPLICATE_WINDOW", 24 * 60 * 60)
+        min_similarity = getattr(settings, "COMMENT_DUPLICATE_SIMILARITY", 0.75)
+        queryset = Comment.all_objects.filter(
+            Q(author_id=self.author_id) | ~Q(post_id=self.post_id)
+        )
+        if self.pk is not None:
+            queryset = queryset.exclude(pk=self.pk)
+        return bool(
+            queryset.near_duplicates_of(
+                self.content,
+                since=timezone.now() - timedelta(seconds=window),
+                min_similarity=min_similarity,
+            )
+        )
+
+    def _assign_path(self):
+        """La ruta incluye el id, así que se guarda tras el INSERT."""
+        if self.parent_id:
+            if Comment.parent.is_cached(self):
+                parent_path, parent_depth = self.parent.path, self.parent.depth
+            else:
+                parent_path, parent_depth = (
+                    Comment.all_objects.filter(pk=self.parent_id).values_list("path", "depth").get()
+                )
+            self.depth = parent_depth + 1
+        else:
+            parent_path, self.depth = "", 0
+        self.path = self.build_path(self.pk, parent_path)
+        Comment.all_objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+
     def delete(self, *args, **kwargs):
-        """Soft delete: marca el comentario como eliminado en vez de borrarlo."""
-        self.deleted_at = timezone.now()
-        self.save(update_fields=["deleted_at"])
+        """
+        Soft delete: marca el comentario como eliminado en vez de borrarlo.
+        El UPDATE es condicional, así que con borrados simultáneos solo uno
+        descuenta los contadores.
+        """
+        if self.deleted_at is not None:
+            return
+        with transaction.atomic():
+            deleted_at = timezone.now()
+            deleted = Comment.all_objects.filter(pk=self.pk, deleted_at__isnull=True).update(
+                deleted_at=deleted_at
+            )
+            if not deleted:
+                return
+            self.deleted_at = deleted_at
+            # Igual que save(update_fields=...): el índice de búsqueda retira el comentario
+            post_save.send(
+                sender=Comment,
+                instance=self,
+                created=False,
+                update_fields=frozenset({"deleted_at"}),
+                raw=False,
+                using=self._state.db,
+            )
+            counters.comment_removed(self.post_id, self.created_at)
+            self._adjust_replies_count(self.parent_id, -1)
+
+    @staticmethod
+    def _adjust_replies_count(parent_id, delta):
+        """Suma `delta` al contador de respuestas del padre sin dejarlo en negativo."""
+        if parent_id is None:
+            return 0
+        queryset = Comment.all_objects.filter(pk=parent_id)
+        if delta < 0:
+            queryset = queryset.filter(replies_count__gte=-delta)
+        return queryset.update(replies_count=F("replies_count") + delta)
 
     @property
     def is_deleted(self):
@@ -62,8 +322,8 @@ class Comment(models.Model):
     @property
     def is_reply(self):
         """Verifica si es una respuesta a otro comentario."""
-        return self.parent is not None
+        return self.parent_id is not None
 
     def get_replies_count(self):
-        """Cuenta las respuestas a este comentario."""
-        return self.replies.filter(deleted_at__isnull=True).count()
+        """Cantidad de respuestas a este comentario (contador desnormalizado)."""
+        return self.replies_count
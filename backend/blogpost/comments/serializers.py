@@ -1,5 +1,15 @@
 from rest_framework import serializers
-from .models import Comment
+
+from .models import MAX_THREAD_DEPTH, Comment
+
+
+def validate_reply_depth(parent):
+    """Valida que el hilo no supere la profundidad máxima admitida."""
+    if parent is not None and parent.depth + 1 > MAX_THREAD_DEPTH:
+        raise serializers.ValidationError(
+            "Se alcanzó la profundidad máxima de respuestas en este hilo."
+        )
+    return parent
 
 
 class CommentListSerializer(serializers.ModelSerializer):
@@ -8,9 +18,10 @@ class CommentListSerializer(serializers.ModelSerializer):
     """
 
     author = serializers.StringRelatedField(read_only=True)
-    replies_count = serializers.SerializerMethodField()
     is_reply = serializers.ReadOnlyField()
     is_edited = serializers.ReadOnlyField()
+    # Solo presente en resultados de búsqueda (?search=)
+    search_snippet = serializers.CharField(read_only=True)
 
     class Meta:
         model = Comment
@@ -24,12 +35,9 @@ class CommentListSerializer(serializers.ModelSerializer):
             "is_edited",
             "is_reply",
             "replies_count",
+            "search_snippet",
         )
-        read_only_fields = ("id", "created_at", "updated_at", "is_edited")
-
-    def get_replies_count(self, obj):
-        """Cuenta las respuestas a este comentario."""
-        return obj.get_replies_count()
+        read_only_fields = ("id", "created_at", "updated_at", "is_edited", "replies_count")
 
 
 class CommentDetailSerializer(serializers.ModelSerializer):
@@ -90,7 +98,7 @@ class CommentCreateUpdateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     "El comentario padre debe pertenecer al mismo post."
                 )
-        return value
+        return validate_reply_depth(value)
 
     def create(self, validated_data):
         """Crea un nuevo comentario con el autor actual."""
@@ -98,7 +106,12 @@ class CommentCreateUpdateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
     def update(self, instance, validated_data):
-        """Marca el comentario como editado al actualizarlo."""
+        """
+        Marca el comentario como editado al actualizarlo.
+        Un comentario no se puede mover de post ni de hilo (su ruta es fija).
+        """
+        validated_data.pop("post", None)
+        validated_data.pop("parent", None)
         instance.is_edited = True
         return super().update(instance, validated_data)
 
@@ -118,6 +131,10 @@ class CommentReplySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("El contenido del comentario no puede estar vacío.")
         return value.strip()
 
+    def validate(self, attrs):
+        validate_reply_depth(self.context["parent_comment"])
+        return attrs
+
     def create(self, validated_data):
         """Crea una respuesta a un comentario."""
         parent_comment = self.context["parent_comment"]
@@ -129,3 +146,93 @@ class CommentReplySerializer(serializers.ModelSerializer):
             }
         )
         return super().create(validated_data)
+
+
+class CommentThreadSerializer(serializers.ModelSerializer):
+    """
+    Nodo de un hilo de comentarios con sus respuestas anidadas.
+    Las respuestas vienen ya resueltas en `thread_children` (ver CommentViewSet.thread).
+    """
+
+    author = serializers.StringRelatedField(read_only=True)
+    replies = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = (
+            "id",
+            "content",
+            "author",
+            "parent",
+            "depth",
+            "created_at",
+            "updated_at",
+            "is_approved",
+            "is_edited",
+            "replies",
+        )
+        read_only_fields = fields
+
+    def get_replies(self, obj):
+        children = getattr(obj, "thread_children", [])
+        return CommentThreadSerializer(children, many=True, context=self.context).data
+
+
+class CommentBulkActionSerializer(serializers.Serializer):
+    """
+    Valida la lista de ids de las operaciones masivas de moderación.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500
+    )
+
+
+class CommentAuthorSerializer(serializers.Serializer):
+    """
+    Datos mínimos del autor de un comentario.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    avatar_url = serializers.URLField(read_only=True)
+
+
+class PostCommentReplySerializer(serializers.ModelSerializer):
+    """
+    Respuesta tal como se muestra en la página de un post.
+    """
+
+    author = CommentAuthorSerializer(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = (
+            "id",
+            "content",
+            "author",
+            "parent",
+            "created_at",
+            "updated_at",
+            "is_approved",
+            "is_edited",
+            "replies_count",
+        )
+        read_only_fields = fields
+
+
+class PostCommentSerializer(PostCommentReplySerializer):
+    """
+    Comentario principal de la página de un post con las primeras respuestas.
+    El resto se obtiene con /api/comments/thread/?parent=<id>.
+    """
+
+    replies = serializers.SerializerMethodField()
+
+    class Meta(PostCommentReplySerializer.Meta):
+        fields = PostCommentReplySerializer.Meta.fields + ("replies",)
+        read_only_fields = fields
+
+    def get_replies(self, obj):
+        replies = getattr(obj, "preview_replies", [])
+        return PostCommentReplySerializer(replies, many=True, context=self.context).data
@@ -1,3 +1,227 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from posts.models import Post
+from rest_framework.test import APIClient
+from users.models import User
 
-# Create your tests here.
+from . import fingerprint
+from .models import Comment
+
+
+class CommentTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.post = Post.objects.create(
+            title="Post", slug="post", content="Contenido", author=self.author, is_published=True
+        )
+        self.client = APIClient()
+
+    def comment(self, content="Comentario", parent=None, **kwargs):
+        kwargs.setdefault("author", self.author)
+        return Comment.objects.create(post=self.post, content=content, parent=parent, **kwargs)
+
+
+class CommentConditionalGetTests(CommentTestCase):
+    def test_detail_etag_changes_with_new_replies(self):
+        root = self.comment()
+        etag = self.client.get(f"/api/comments/{root.pk}/")["ETag"]
+
+        response = self.client.get(f"/api/comments/{root.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.comment("Respuesta", parent=root)
+        response = self.client.get(f"/api/comments/{root.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_malformed_pk_is_404(self):
+        self.assertEqual(self.client.get("/api/comments/abc/").status_code, 404)
+
+
+class NearDuplicateTests(CommentTestCase):
+    SPAM = "compra seguidores baratos en nuestra web oficial con envio inmediato hoy mismo"
+
+    def setUp(self):
+        super().setUp()
+        self.other_post = Post.objects.create(
+            title="Otro", slug="otro", content="Contenido", author=self.author, is_published=True
+        )
+        self.spammer = User.objects.create_user(username="spam", email="spam@example.com")
+
+    def _post_comment(self, post, content):
+        return Comment.objects.create(post=post, author=self.spammer, content=content)
+
+    def test_near_duplicate_on_another_post_waits_for_moderation(self):
+        self._post_comment(self.post, self.SPAM)
+        duplicate = self._post_comment(self.other_post, self.SPAM.replace("hoy mismo", "hoy!"))
+
+        self.assertFalse(duplicate.is_approved)
+
+    def test_distinct_texts_are_not_flagged(self):
+        texts = [
+            "me encanto el articulo sobre indices parciales en postgres y sqlite",
+            "alguien probo la paginacion por cursor con millones de filas en produccion",
+            "gracias por explicar como funciona minhash con bandas y firmas cortas",
+            "el ejemplo de cache versionada me sirvio para mi proyecto de django",
+            "no entiendo por que el contador de likes se desnormaliza en el post",
+            "seria interesante comparar hyperloglog con un conteo exacto de lectores",
+        ]
+        comments = [
+            self._post_comment(self.post if index % 2 else self.other_post, text)
+            for index, text in enumerate(texts)
+        ]
+
+        self.assertTrue(all(comment.is_approved for comment in comments))
+
+    def test_band_candidates_are_confirmed_with_exact_jaccard(self):
+        # Comparte una banda, pero solo la mitad de las palabras coincide
+        similar = "reales likes baratos en nuestra web oficial perfil reales inmediato hoy mismo"
+        first, second = fingerprint.signature(self.SPAM), fingerprint.signature(similar)
+        self.assertTrue(set(fingerprint.bands(first)) & set(fingerprint.bands(second)))
+        self.assertLess(
+            fingerprint.jaccard(fingerprint.words(self.SPAM), fingerprint.words(similar)), 0.6
+        )
+
+        self._post_comment(self.post, self.SPAM)
+        self.assertTrue(self._post_comment(self.other_post, similar).is_approved)
+
+
+class CommentThreadTests(CommentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = self.comment("Raíz")
+        self.reply = self.comment("Respuesta", parent=self.root)
+        self.nested = self.comment("Respuesta anidada", parent=self.reply)
+
+    def _results(self, response):
+        return response.data["results"]
+
+    def test_path_and_depth_follow_the_tree(self):
+        self.assertEqual(self.root.path, Comment.build_path(self.root.pk))
+        self.assertTrue(self.nested.path.startswith(self.reply.path))
+        self.assertEqual([self.root.depth, self.reply.depth, self.nested.depth], [0, 1, 2])
+
+    def test_post_thread_nests_replies(self):
+        response = self.client.get("/api/comments/thread/", {"post": self.post.pk})
+
+        [root] = self._results(response)
+        self.assertEqual(root["id"], self.root.pk)
+        [reply] = root["replies"]
+        self.assertEqual(reply["id"], self.reply.pk)
+        self.assertEqual([nested["id"] for nested in reply["replies"]], [self.nested.pk])
+
+    def test_max_depth_and_parent_limit_the_tree(self):
+        response = self.client.get("/api/comments/thread/", {"post": self.post.pk, "max_depth": 1})
+        [root] = self._results(response)
+        self.assertEqual(root["replies"][0]["replies"], [])
+
+        response = self.client.get("/api/comments/thread/", {"parent": self.reply.pk})
+        self.assertEqual([node["id"] for node in self._results(response)], [self.nested.pk])
+
+    def test_requires_post_or_parent(self):
+        self.assertEqual(self.client.get("/api/comments/thread/").status_code, 400)
+        response = self.client.get("/api/comments/thread/", {"parent": 999})
+        self.assertEqual(response.status_code, 404)
+
+
+class RepliesCountTests(CommentTestCase):
+    def _replies_count(self, comment):
+        comment.refresh_from_db(fields=["replies_count"])
+        return comment.replies_count
+
+    def test_counts_direct_replies_and_ignores_deleted(self):
+        root = self.comment()
+        first = self.comment("Primera", parent=root)
+        self.comment("Segunda", parent=root)
+        self.comment("Anidada", parent=first)
+        self.assertEqual((self._replies_count(root), self._replies_count(first)), (2, 1))
+
+        first.delete()
+        first.delete()
+        self.assertEqual(self._replies_count(root), 1)
+
+    def test_concurrent_deletes_decrement_once(self):
+        root = self.comment()
+        reply = self.comment("Respuesta", parent=root)
+        first, second = Comment.objects.get(pk=reply.pk), Comment.objects.get(pk=reply.pk)
+
+        first.delete()
+        second.delete()
+
+        self.post.refresh_from_db(fields=["comments_count"])
+        self.assertEqual((self._replies_count(root), self.post.comments_count), (0, 1))
+
+    def test_full_save_keeps_concurrent_replies(self):
+        root = self.comment()
+        stale = Comment.objects.get(pk=root.pk)
+        self.comment("Respuesta", parent=root)
+
+        stale.content = "Editado"
+        stale.save()
+
+        self.assertEqual(self._replies_count(root), 1)
+
+    def _list_roots(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/comments/", {"parent__isnull": "true"})
+        return response.data["results"], len(queries)
+
+    def test_list_does_not_count_replies_per_row(self):
+        self.comment("Respuesta", parent=self.comment("Raíz"))
+        _, queries = self._list_roots()
+        for index in range(3):
+            self.comment("Respuesta", parent=self.comment(f"Raíz {index}"))
+
+        results, more_queries = self._list_roots()
+
+        self.assertEqual([item["replies_count"] for item in results], [1, 1, 1, 1])
+        self.assertEqual(more_queries, queries)
+
+
+class BulkModerationTests(CommentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reader = User.objects.create_user(username="lector", email="lector@example.com")
+        self.pending = [
+            self.comment(f"Pendiente {index}", author=self.reader, is_approved=False)
+            for index in range(2)
+        ]
+        self.ids = [comment.pk for comment in self.pending]
+        self.client.force_authenticate(self.author)
+
+    def test_pending_queue_and_count(self):
+        self.comment("Aprobado", author=self.reader)
+
+        response = self.client.get("/api/comments/pending_approval/")
+        self.assertCountEqual([item["id"] for item in response.data["results"]], self.ids)
+        response = self.client.get("/api/comments/pending_count/")
+        self.assertEqual(response.data, {"pending": 2})
+
+    def test_bulk_approve_and_disapprove(self):
+        response = self.client.post("/api/comments/bulk_approve/", {"ids": self.ids}, format="json")
+        self.assertEqual(response.data, {"updated": 2, "ids": sorted(self.ids)})
+        self.assertFalse(Comment.objects.pending().exists())
+
+        response = self.client.post(
+            "/api/comments/bulk_disapprove/", {"ids": self.ids[:1]}, format="json"
+        )
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(list(Comment.objects.pending().values_list("pk", flat=True)), self.ids[:1])
+
+    def test_only_the_post_author_can_moderate(self):
+        other_post = Post.objects.create(
+            title="Ajeno", slug="ajeno", content="Contenido", author=self.reader, is_published=True
+        )
+        foreign = Comment.objects.create(
+            post=other_post, author=self.author, content="Ajeno", is_approved=False
+        )
+
+        response = self.client.post(
+            "/api/comments/bulk_approve/", {"ids": [*self.ids, foreign.pk]}, format="json"
+        )
+        self.assertEqual((response.status_code, response.data["ids"]), (403, [foreign.pk]))
+        response = self.client.post(
+            "/api/comments/bulk_approve/", {"ids": [*self.ids, 999]}, format="json"
+        )
+        self.assertEqual((response.status_code, response.data["ids"]), (404, [999]))
+        self.assertEqual(Comment.objects.pending().count(), 3)
@@ -1,28 +1,37 @@
-from rest_framework import viewsets, status, filters
-from rest_framework.exceptions import ValidationError
+from blogpost.conditional import ConditionalGetMixin
+from blogpost.pagination import OptionalCursorPagination
+from django.db.models import Q
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from search.filters import FullTextSearchFilter
 
-from .models import Comment
+from .models import MAX_THREAD_DEPTH, Comment, CommentQuerySet
 from .serializers import (
-    CommentListSerializer,
-    CommentDetailSerializer,
+    CommentBulkActionSerializer,
     CommentCreateUpdateSerializer,
+    CommentDetailSerializer,
+    CommentListSerializer,
     CommentReplySerializer,
+    CommentThreadSerializer,
 )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar comentarios con operaciones CRUD completas.
+    Las lecturas admiten GET condicional (ETag / Last-Modified).
     """
 
     queryset = Comment.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+    pagination_class = OptionalCursorPagination
+    # Una respuesta nueva cambia el contador del padre sin tocar su updated_at
+    conditional_sum_fields = ("replies_count",)
 
     # Filtros
     filterset_fields = {
@@ -34,8 +43,8 @@ class CommentViewSet(viewsets.ModelViewSet):
         "is_edited": ["exact"],
     }
 
-    # Búsqueda
-    search_fields = ["content", "author__username"]
+    # Búsqueda de texto completo (ver search/backends.py)
+    search_document = "comments"
 
     # Ordenación
     ordering_fields = ["created_at", "updated_at"]
@@ -69,21 +78,32 @@ class CommentViewSet(viewsets.ModelViewSet):
             )
         )
 
-        # Si el usuario está autenticado, puede ver sus propios comentarios no aprobados
-        if self.request.user.is_authenticated:
-            queryset = queryset.filter(Q(is_approved=True) | Q(author=self.request.user))
-        else:
-            # Usuarios no autenticados solo ven comentarios aprobados
-            queryset = queryset.filter(is_approved=True)
+        return self._filter_visible(queryset)
+
+    def _filter_visible(self, queryset):
+        """Restringe el queryset a los comentarios que el usuario puede ver."""
+        return queryset.visible_to(self.request.user)
+
+    def get_conditional_detail_queryset(self):
+        """El detalle incluye las respuestas, así que también cuentan para la ETag."""
+        visible = super().get_conditional_detail_queryset().values("pk")
+        return Comment.objects.filter(Q(pk__in=visible) | Q(parent_id__in=visible))
 
-        return queryset
+    def _get_int_param(self, name, default=None):
+        value = self.request.query_params.get(name)
+        if value in (None, ""):
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: "Debe ser un número entero."})
 
     def _check_author(self, comment, user):
         """
         Verifica si el usuario es el autor del comentario.
         Retorna Response con error si no es autor, None si es autor.
         """
-        if comment.author != user:
+        if comment.author_id != user.pk:
             return Response(
                 {"detail": "No tienes permisos para esta acción."}, status=status.HTTP_403_FORBIDDEN
             )
@@ -147,14 +167,14 @@ class CommentViewSet(viewsets.ModelViewSet):
         post = comment.post
 
         # Solo el autor del post puede aprobar comentarios
-        if post.author != request.user:
+        if post.author_id != request.user.pk:
             return Response(
                 {"detail": "Solo el autor del post puede aprobar comentarios."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
         comment.is_approved = True
-        comment.save()
+        comment.save(update_fields=["is_approved", "updated_at"])
 
         serializer = self.get_serializer(comment)
         return Response(serializer.data)
@@ -168,14 +188,14 @@ class CommentViewSet(viewsets.ModelViewSet):
         post = comment.post
 
         # Solo el autor del post puede desaprobar comentarios
-        if post.author != request.user:
+        if post.author_id != request.user.pk:
             return Response(
                 {"detail": "Solo el autor del post puede desaprobar comentarios."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
         comment.is_approved = False
-        comment.save()
+        comment.save(update_fields=["is_approved", "updated_at"])
 
         serializer = self.get_serializer(comment)
         return Response(serializer.data)
@@ -220,7 +240,7 @@ class CommentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        queryset = self.get_queryset().filter(author=request.user)
+        queryset = self.get_queryset().filter(author_id=request.user.pk)
         return self._paginated_response(queryset)
 
     @action(detail=False, methods=["get"])
@@ -235,5 +255,130 @@ class CommentViewSet(viewsets.ModelViewSet):
             )
 
         # Solo comentarios de posts del usuario actual que no están aprobados
-        queryset = self.get_queryset().filter(post__author=request.user, is_approved=False)
+        queryset = self.get_queryset().pending().filter(post__author_id=request.user.pk)
         return self._paginated_response(queryset)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def pending_count(self, request):
+        """
+        Cantidad de comentarios pendientes de aprobación en los posts del usuario.
+        """
+        count = Comment.objects.pending().filter(post__author_id=request.user.pk).count()
+        return Response({"pending": count})
+
+    def _bulk_moderation(self, request, operation):
+        """
+        Aplica una operación de moderación de CommentQuerySet a los comentarios indicados.
+        Comprueba en una sola consulta que existen y que el usuario es el autor de sus posts.
+        """
+        serializer = CommentBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        comment_ids = set(serializer.validated_data["ids"])
+
+        owners = dict(
+            Comment.objects.filter(pk__in=comment_ids).values_list("pk", "post__author_id")
+        )
+        missing = comment_ids - owners.keys()
+        if missing:
+            return Response(
+                {"detail": "Algunos comentarios no existen.", "ids": sorted(missing)},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        not_owned = [pk for pk, author_id in owners.items() if author_id != request.user.pk]
+        if not_owned:
+            return Response(
+                {
+                    "detail": "Solo el autor del post puede moderar sus comentarios.",
+                    "ids": sorted(not_owned),
+                },
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        updated = operation(Comment.objects.filter(pk__in=comment_ids))
+        return Response({"updated": updated, "ids": sorted(comment_ids)})
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk_approve(self, request):
+        """
+        Aprueba varios comentarios de los posts del usuario en una sola operación.
+        """
+        return self._bulk_moderation(request, CommentQuerySet.approve)
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk_disapprove(self, request):
+        """
+        Desaprueba varios comentarios de los posts del usuario en una sola operación.
+        """
+        return self._bulk_moderation(request, CommentQuerySet.disapprove)
+
+    @action(detail=False, methods=["get"])
+    def thread(self, request):
+        """
+        Devuelve el hilo de un post con las respuestas anidadas.
+
+        Parámetros:
+        - `post`: id del post (obligatorio salvo que se indique `parent`).
+        - `parent`: id de un comentario para obtener solo su subárbol.
+        - `max_depth`: niveles de respuestas a incluir bajo cada raíz.
+
+        Se paginan los comentarios raíz; todos sus descendientes se cargan en
+        una única consulta por prefijo de `path`.
+        """
+        post_id = self._get_int_param("post")
+        parent_id = self._get_int_param("parent")
+        max_depth = self._get_int_param("max_depth", MAX_THREAD_DEPTH)
+        max_depth = max(0, min(max_depth, MAX_THREAD_DEPTH))
+
+        visible = self._filter_visible(Comment.objects.all())
+        comments = visible.select_related("author")
+
+        if parent_id is not None:
+            parent = visible.filter(pk=parent_id).only("id", "post_id", "depth").first()
+            if parent is None or (post_id is not None and parent.post_id != post_id):
+                raise NotFound("Comentario no encontrado.")
+            post_id = parent.post_id
+            roots = comments.filter(parent_id=parent.pk)
+            root_depth = parent.depth + 1
+        elif post_id is not None:
+            roots = comments.filter(post_id=post_id, parent__isnull=True)
+            root_depth = 0
+        else:
+            raise ValidationError({"post": "Este parámetro es obligatorio."})
+
+        page = self.paginate_queryset(roots)
+        nodes = list(page if page is not None else roots)
+
+        if nodes and max_depth:
+            prefixes = Q()
+            for node in nodes:
+                prefixes |= Q(path__startswith=node.path)
+            descendants = comments.filter(
+                prefixes,
+                post_id=post_id,
+                depth__gt=root_depth,
+                depth__lte=root_depth + max_depth,
+            ).order_by("path")
+            self._attach_children(nodes, descendants)
+
+        serializer = CommentThreadSerializer(nodes, many=True, context={"request": request})
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    @staticmethod
+    def _attach_children(roots, descendants):
+        """
+        Arma el árbol en memoria. Al venir ordenados por `path`, cada padre
+        aparece antes que sus hijos; las respuestas de comentarios ocultos se omiten.
+        """
+        by_id = {}
+        for root in roots:
+            root.thread_children = []
+            by_id[root.pk] = root
+        for comment in descendants:
+            parent = by_id.get(comment.parent_id)
+            if parent is None:
+                continue
+            comment.thread_children = []
+            parent.thread_children.append(comment)
+            by_id[comment.pk] = comment
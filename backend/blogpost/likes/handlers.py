@@ -0,0 +1,17 @@
+"""
+Mantiene `Post.likes_count` cuando un like se borra con el ORM: la acción de
+borrado del admin, `QuerySet.delete()` o la cascada al eliminar un usuario.
+`Like.remove_like` borra con un DELETE directo, que no envía señales, y ya
+descuenta el like él mismo.
+"""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from posts import counters
+
+from .models import Like
+
+
+@receiver(post_delete, sender=Like, dispatch_uid="likes_count_like_deleted")
+def like_deleted(sender, instance, **kwargs):
+    counters.like_removed(instance.post_id, instance.created_at)
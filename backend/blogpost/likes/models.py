@@ -1,5 +1,8 @@
-from django.db import models
 from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+from posts import counters
+from posts.models import Post
 
 
 class Like(models.Model):
@@ -28,25 +31,102 @@ class Like(models.Model):
     def __str__(self):
         return f"{self.user.username} likes {self.post.title}"
 
+    @classmethod
+    def add_like(cls, user, post_id):
+        """
+        Da like a un post de forma idempotente y sin carreras: el INSERT solo se
+        aplica si el post está publicado y no eliminado, y un like repetido se
+        descarta con ON CONFLICT DO NOTHING en lugar de fallar por la restricción única.
+        Retorna (like, likes_count); like es None si ya existía.
+        Lanza Post.DoesNotExist si el post no admite likes.
+        """
+        now = timezone.now()
+        like_table = connection.ops.quote_name(cls._meta.db_table)
+        post_table = connection.ops.quote_name(Post._meta.db_table)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {like_table} (user_id, post_id, created_at) "
+                    f"SELECT %s, id, %s FROM {post_table} "
+                    "WHERE id = %s AND is_published AND deleted_at IS NULL "
+                    "ON CONFLICT (user_id, post_id) DO NOTHING RETURNING id",
+                    [user.pk, connection.ops.adapt_datetimefield_value(now), post_id],
+                )
+                row = cursor.fetchone()
+
+            if row is None:
+                return None, cls._likes_count(post_id, published=True)
+            likes_count = counters.like_added(post_id, now)
+
+        like = cls(id=row[0], user=user, post_id=post_id, created_at=now)
+        like._state.adding, like._state.db = False, connection.alias
+        return like, likes_count
+
+    @classmethod
+    def remove_like(cls, user, post_id):
+        """
+        Quita el like de un post de forma idempotente con un DELETE condicional.
+        Retorna (removed, likes_count). Lanza Post.DoesNotExist si el post no existe.
+        """
+        like_table = connection.ops.quote_name(cls._meta.db_table)
+        with transaction.atomic():
+            # RETURNING trae la fecha del like: el día de las estadísticas del que se resta
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {like_table} WHERE user_id = %s AND post_id = %s "
+                    "RETURNING created_at",
+                    [user.pk, post_id],
+                )
+                row = cursor.fetchone()
+
+            likes_count = None
+            if row is not None:
+                likes_count = counters.like_removed(post_id, cls._from_db("created_at", row[0]))
+            if likes_count is None:
+                likes_count = cls._likes_count(post_id)
+        return row is not None, likes_count
+
+    @classmethod
+    def _from_db(cls, field_name, value):
+        """Convierte un valor leído con SQL directo igual que lo haría el ORM."""
+        expression = cls._meta.get_field(field_name).get_col(cls._meta.db_table)
+        converters = connection.ops.get_db_converters(expression)
+        converters += expression.get_db_converters(connection)
+        for converter in converters:
+            value = converter(value, expression, connection)
+        return value
+
+    @staticmethod
+    def _likes_count(post_id, published=False):
+        """Contador actual del post; lanza Post.DoesNotExist si no está disponible."""
+        queryset = Post.objects.filter(pk=post_id)
+        if published:
+            queryset = queryset.filter(is_published=True)
+        return queryset.values_list("likes_count", flat=True).get()
+
     @classmethod
     def toggle_like(cls, user, post):
         """
         Alterna el like: si existe lo elimina, si no existe lo crea.
         Retorna (like_object, created) donde created es True si se creó.
         """
-        like, created = cls.objects.get_or_create(user=user, post=post)
-        if not created:
-            # Si ya existía, lo eliminamos
-            like.delete()
-            return None, False
+        with transaction.atomic():
+            removed, _ = cls.remove_like(user, post.pk)
+            if removed:
+                return None, False
+            like, _ = cls.add_like(user, post.pk)
+        if like is None:
+            # Otra petición lo creó entre medio: el resultado neto es el mismo
+            like = cls.objects.get(user=user, post=post)
+        like.post = post
         return like, True
 
     @classmethod
     def get_likes_count_for_post(cls, post):
-        """Cuenta los likes de un post específico."""
-        return cls.objects.filter(post=post).count()
+        """Devuelve los likes de un post (contador desnormalizado en Post)."""
+        return post.likes_count
 
     @classmethod
     def user_has_liked_post(cls, user, post):
         """Verifica si un usuario ya le dio like a un post."""
-        return cls.objects.filter(user=user, post=post).exists()
+        return cls.objects.filter(user_id=user.pk, post=post).exists()
@@ -1,4 +1,6 @@
+from posts.models import Post
 from rest_framework import serializers
+
 from .models import Like
 
 
@@ -47,12 +49,14 @@ class LikeCreateSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
         post = validated_data["post"]
 
-        # Verificar si ya existe un like
-        if Like.objects.filter(user=user, post=post).exists():
+        try:
+            like, _ = Like.add_like(user, post.pk)
+        except Post.DoesNotExist:
+            raise serializers.ValidationError("No puedes dar like a este post.")
+        if like is None:
             raise serializers.ValidationError("Ya has dado like a este post.")
-
-        validated_data["user"] = user
-        return super().create(validated_data)
+        like.post = post
+        return like
 
 
 class LikeToggleSerializer(serializers.Serializer):
@@ -60,16 +64,10 @@ class LikeToggleSerializer(serializers.Serializer):
     Serializer para alternar likes (crear o eliminar).
     """
 
-    post = serializers.PrimaryKeyRelatedField(queryset=None)
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Filtrar solo posts publicados y no eliminados
-        from posts.models import Post
-
-        self.fields["post"].queryset = Post.objects.filter(
-            is_published=True, deleted_at__isnull=True
-        )
+    # Solo posts publicados y no eliminados
+    post = serializers.PrimaryKeyRelatedField(
+        queryset=Post.objects.filter(is_published=True, deleted_at__isnull=True)
+    )
 
     def validate_post(self, value):
         """Valida que el post esté disponible para likes."""
@@ -108,3 +106,36 @@ class PostLikeStatsSerializer(serializers.Serializer):
             "likes_count": Like.get_likes_count_for_post(instance),
             "user_has_liked": Like.user_has_liked_post(user, instance) if user else False,
         }
+
+
+class LikeStateSerializer(serializers.Serializer):
+    """
+    Estado del like del usuario actual sobre un post tras un PUT/DELETE.
+    """
+
+    post_id = serializers.IntegerField(read_only=True)
+    liked = serializers.BooleanField(read_only=True)
+    changed = serializers.BooleanField(read_only=True)
+    likes_count = serializers.IntegerField(read_only=True)
+
+
+class PostLikeBatchQuerySerializer(serializers.Serializer):
+    """
+    Valida `?posts=1,2,3` del endpoint de estado de likes por lotes.
+    """
+
+    MAX_POSTS = 100
+
+    posts = serializers.CharField()
+
+    def validate_posts(self, value):
+        try:
+            post_ids = [int(part) for part in value.split(",") if part.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Debe ser una lista de ids separados por comas.")
+        if not post_ids:
+            raise serializers.ValidationError("Indica al menos un post.")
+        if len(post_ids) > self.MAX_POSTS:
+            raise serializers.ValidationError(f"Como máximo {self.MAX_POSTS} posts por consulta.")
+        # Sin duplicados, conservando el orden pedido
+        return list(dict.fromkeys(post_ids))
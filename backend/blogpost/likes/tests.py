@@ -1,3 +1,196 @@
-from django.test import TestCase
+import threading
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.test import TestCase, TransactionTestCase
+from posts.models import Post
+from rest_framework.test import APIClient
+from users.models import User
+
+from .models import Like
+
+
+class PostLikeConcurrencyTests(TransactionTestCase):
+    """
+    Peticiones de like lanzadas en paralelo por el mismo usuario sobre el mismo
+    post deben dejar como mucho un like y el contador igual al número real.
+    """
+
+    THREADS = 8
+    ROUNDS = 5
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.post = Post.objects.create(
+            title="Post", slug="post", content="Contenido", author=self.author, is_published=True
+        )
+        self.reader = User.objects.create_user(username="lector", email="lector@example.com")
+        self.url = f"/api/posts/{self.post.pk}/like"
+
+    def _client(self, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.reader)
+        return client
+
+    def _run_in_threads(self, worker):
+        """
+        Ejecuta `worker(client)` a la vez en THREADS hilos con el mismo usuario y
+        devuelve los códigos de estado de todas las peticiones.
+        """
+        barrier = threading.Barrier(self.THREADS)
+        status_codes = []
+
+        def target():
+            client = self._client()
+            barrier.wait()
+            try:
+                status_codes.extend(worker(client))
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=target) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return status_codes
+
+    def _assert_counter_matches(self, expected_likes):
+        self.post.refresh_from_db()
+        likes = Like.objects.filter(post=self.post).count()
+        self.assertEqual(likes, expected_likes)
+        self.assertEqual(self.post.likes_count, likes)
+
+    def test_concurrent_puts_create_a_single_like(self):
+        def worker(client):
+            return [client.put(self.url).status_code for _ in range(self.ROUNDS)]
+
+        status_codes = self._run_in_threads(worker)
+
+        self.assertEqual(status_codes, [200] * self.THREADS * self.ROUNDS)
+        self._assert_counter_matches(1)
+
+    def test_concurrent_put_and_delete_keep_counter_consistent(self):
+        def worker(client):
+            codes = []
+            for _ in range(self.ROUNDS):
+                codes.append(client.put(self.url).status_code)
+                codes.append(client.delete(self.url).status_code)
+            return codes
+
+        status_codes = self._run_in_threads(worker)
+
+        self.assertEqual(status_codes, [200] * self.THREADS * self.ROUNDS * 2)
+        self.post.refresh_from_db()
+        self.assertIn(self.post.likes_count, (0, 1))
+        self._assert_counter_matches(self.post.likes_count)
+
+    def test_concurrent_destroy_decrements_once(self):
+        Like.add_like(self.author, self.post.pk)
+        like, _ = Like.add_like(self.reader, self.post.pk)
+
+        def worker(client):
+            return [client.delete(f"/api/likes/{like.pk}/").status_code]
+
+        status_codes = self._run_in_threads(worker)
+
+        self.assertEqual(sorted(status_codes), [204] + [404] * (self.THREADS - 1))
+        self._assert_counter_matches(1)
+
+    def test_put_and_delete_are_idempotent(self):
+        client = self._client()
+
+        first, second = client.put(self.url).data, client.put(self.url).data
+        self.assertEqual((first["changed"], first["likes_count"]), (True, 1))
+        self.assertEqual((second["changed"], second["likes_count"]), (False, 1))
+
+        first, second = client.delete(self.url).data, client.delete(self.url).data
+        self.assertEqual((first["changed"], first["likes_count"]), (True, 0))
+        self.assertEqual((second["changed"], second["likes_count"]), (False, 0))
+
+
+class LikeStatusTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.reader = User.objects.create_user(username="lector", email="lector@example.com")
+        self.posts = [
+            Post.objects.create(
+                title=f"Post {index}",
+                slug=f"post-{index}",
+                content="Contenido",
+                author=self.author,
+                is_published=True,
+            )
+            for index in range(3)
+        ]
+        self.draft = Post.objects.create(
+            title="Borrador", slug="borrador", content="Contenido", author=self.author
+        )
+        Like.add_like(self.reader, self.posts[1].pk)
+        Like.add_like(self.author, self.posts[1].pk)
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def _status(self, ids):
+        response = self.client.get("/api/likes/status/", {"posts": ",".join(map(str, ids))})
+        return [
+            (item["post_id"], item["likes_count"], item["user_has_liked"])
+            for item in response.data["results"]
+        ]
+
+    def test_batch_status_in_two_queries(self):
+        first, second, third = (post.pk for post in self.posts)
+
+        with self.assertNumQueries(2):
+            results = self._status([third, second, first, self.draft.pk])
+
+        # Sigue el orden pedido y omite los borradores ajenos
+        self.assertEqual(results, [(third, 0, False), (second, 2, True), (first, 0, False)])
+
+    def test_anonymous_status_skips_user_likes(self):
+        self.client.force_authenticate(None)
+
+        with self.assertNumQueries(1):
+            results = self._status([self.posts[1].pk])
+
+        self.assertEqual(results, [(self.posts[1].pk, 2, False)])
+
+    def test_post_list_includes_like_flag_on_request(self):
+        response = self.client.get("/api/posts/", {"include": "likes"})
+        flags = {item["id"]: item["user_has_liked"] for item in response.data["results"]}
+        self.assertEqual(flags, {post.pk: post == self.posts[1] for post in self.posts})
+
+        response = self.client.get("/api/posts/")
+        self.assertNotIn("user_has_liked", response.data["results"][0])
+
+
+class LikeDeleteCounterTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.reader = User.objects.create_user(username="lector", email="lector@example.com")
+        self.post = Post.objects.create(
+            title="Post", slug="post", content="Contenido", author=self.author, is_published=True
+        )
+        Like.add_like(self.author, self.post.pk)
+        Like.add_like(self.reader, self.post.pk)
+
+    def _likes_count(self):
+        self.post.refresh_from_db(fields=["likes_count"])
+        return self.post.likes_count
+
+    def test_orm_deletes_decrement_the_counter(self):
+        Like.objects.filter(user=self.author).delete()
+        self.assertEqual(self._likes_count(), 1)
+
+        Like.objects.get(user=self.reader).delete()
+        self.assertEqual(self._likes_count(), 0)
+
+    def test_deleting_a_user_removes_their_likes_from_the_counter(self):
+        self.reader.delete()
+
+        self.assertEqual(self._likes_count(), 1)
+
+    def test_remove_like_decrements_once(self):
+        self.assertEqual(Like.remove_like(self.reader, self.post.pk), (True, 1))
+        self.assertEqual(self._likes_count(), 1)
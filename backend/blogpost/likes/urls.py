@@ -1,7 +1,7 @@
-from django.urls import path, include
+from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import LikeViewSet
+from .views import LikeViewSet, PostLikeView
 
 app_name = "likes"
 
@@ -10,4 +10,7 @@ router.register(r"likes", LikeViewSet, basename="likes")
 
 urlpatterns = [
     path("", include(router.urls)),
+    # PUT/DELETE idempotentes, con o sin barra final
+    path("posts/<int:post_id>/like", PostLikeView.as_view(), name="post-like"),
+    path("posts/<int:post_id>/like/", PostLikeView.as_view()),
 ]
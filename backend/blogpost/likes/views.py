@@ -1,15 +1,22 @@
-from rest_framework import viewsets, status
+from blogpost.pagination import OptionalCursorPagination
+from django.db.models import Q
+from django_filters.rest_framework import DjangoFilterBackend
+from posts.models import Post
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound
 from rest_framework.generics import get_object_or_404
-from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from .models import Like
 from .serializers import (
-    LikeSerializer,
     LikeCreateSerializer,
+    LikeSerializer,
+    LikeStateSerializer,
     LikeToggleSerializer,
+    PostLikeBatchQuerySerializer,
     PostLikeStatsSerializer,
 )
 
@@ -21,11 +28,13 @@ class LikeViewSet(viewsets.ModelViewSet):
     - destroy: Elimina un like propio (requiere autenticación)
     - toggle: Alterna like (requiere autenticación)
     - stats: Estadísticas de likes de un post
+    - status: Contadores y likes del usuario para varios posts a la vez
     """
 
     queryset = Like.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
+    pagination_class = OptionalCursorPagination
     filterset_fields = {"post": ["exact"], "user": ["exact"]}
 
     def get_permissions(self):
@@ -46,12 +55,19 @@ class LikeViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        if instance.user != request.user:
+        if instance.user_id != request.user.pk:
             return Response(
                 {"detail": "No puedes eliminar el like de otro usuario."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        return super().destroy(request, *args, **kwargs)
+        # DELETE condicional: si otra petición lo borró entre medio no se descuenta dos veces
+        try:
+            removed, _ = Like.remove_like(request.user, instance.post_id)
+        except Post.DoesNotExist:
+            removed = False
+        if not removed:
+            raise NotFound()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=False, methods=["post"])
     def toggle(self, request):
@@ -72,8 +88,69 @@ class LikeViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], url_path="stats/(?P<post_id>[^/.]+)")
     def stats(self, request, post_id=None):
         """Devuelve estadísticas de likes de un post."""
-        from posts.models import Post
-
         post = get_object_or_404(Post.objects.filter(deleted_at__isnull=True), pk=post_id)
         data = PostLikeStatsSerializer(post, context={"request": request}).data
         return Response(data)
+
+    @action(detail=False, methods=["get"], url_path="status")
+    def batch_status(self, request):
+        """
+        Estado de likes de varios posts (p. ej. una página del feed): contador y
+        si el usuario actual les dio like, con dos consultas agrupadas.
+        Uso: /api/likes/status/?posts=1,2,3
+        """
+        query = PostLikeBatchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        post_ids = query.validated_data["posts"]
+
+        user = request.user
+        visible = Q(is_published=True)
+        if user.is_authenticated:
+            visible |= Q(author_id=user.pk)
+        counts = dict(
+            Post.objects.filter(visible, pk__in=post_ids).values_list("pk", "likes_count")
+        )
+
+        liked = set()
+        if user.is_authenticated and counts:
+            liked = set(
+                Like.objects.filter(user_id=user.pk, post_id__in=counts).values_list(
+                    "post_id", flat=True
+                )
+            )
+
+        results = [
+            {"post_id": pk, "likes_count": counts[pk], "user_has_liked": pk in liked}
+            for pk in post_ids
+            if pk in counts
+        ]
+        return Response({"results": results})
+
+
+class PostLikeView(APIView):
+    """
+    Like idempotente del usuario actual sobre un post:
+    - PUT /api/posts/{id}/like: deja el like puesto (no falla si ya existía).
+    - DELETE /api/posts/{id}/like: quita el like (no falla si no existía).
+    Ambos responden con el estado final y el contador sin consultas adicionales.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, post_id):
+        try:
+            like, likes_count = Like.add_like(request.user, post_id)
+        except Post.DoesNotExist:
+            raise NotFound("El post no existe o no admite likes.")
+        return self._response(post_id, True, like is not None, likes_count)
+
+    def delete(self, request, post_id):
+        try:
+            removed, likes_count = Like.remove_like(request.user, post_id)
+        except Post.DoesNotExist:
+            raise NotFound("El post no existe.")
+        return self._response(post_id, False, removed, likes_count)
+
+    def _response(self, post_id, liked, changed, likes_count):
+        data = {"post_id": post_id, "liked": liked, "changed": changed, "likes_count": likes_count}
+        return Response(LikeStateSerializer(data).data)
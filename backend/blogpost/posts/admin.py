@@ -1,10 +1,20 @@
 from django.contrib import admin
-from .models import Post, Tag, Category
+
+from .models import Category, Post, Tag
 
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ("title", "author", "is_published", "created_at", "updated_at")
+    list_display = (
+        "title",
+        "author",
+        "is_published",
+        "likes_count",
+        "comments_count",
+        "created_at",
+        "updated_at",
+    )
+    readonly_fields = ("likes_count", "comments_count")
     list_filter = ("is_published", "created_at")
     search_fields = ("title", "content")
     prepopulated_fields = {"slug": ("title",)}
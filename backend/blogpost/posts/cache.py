@@ -0,0 +1,148 @@
+"""
+Caché de respuestas de la API de posts para usuarios anónimos.
+
+Las claves incluyen un número de versión global; en lugar de borrar entradas,
+cualquier cambio en los posts incrementa la versión y las respuestas antiguas
+dejan de usarse (caducan solas por TTL). Solo usa `get`, `add`, `set` e `incr`,
+así que funciona con los backends de memoria local y de ficheros de Django.
+
+Los likes y comentarios (posts/counters.py) son demasiado frecuentes para
+invalidarlo todo: solo incrementan la versión propia del post, que forma parte
+de la clave de su detalle. En los listados los contadores pueden ir atrasados
+como mucho un TTL, igual que `view_count` y `unique_readers`, que se vuelcan
+por lotes (posts/pageviews.py).
+"""
+
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = "posts:response-cache:version"
+POST_VERSION_KEY = "posts:response-cache:version:{post_id}"
+
+
+def get_timeout():
+    return getattr(settings, "POSTS_RESPONSE_CACHE_TIMEOUT", 300)
+
+
+def _initial_version():
+    # Si la versión se pierde (desalojo, reinicio) no se reutilizan números ya usados
+    return time.time_ns()
+
+
+def _get(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, None)
+        return version
+
+
+def get_version():
+    return _get(VERSION_KEY)
+
+
+def bump_version():
+    """Invalida todas las respuestas cacheadas incrementando la versión."""
+    return _bump(VERSION_KEY)
+
+
+def invalidate():
+    """Incrementa la versión cuando la transacción actual se confirme."""
+    transaction.on_commit(bump_version)
+
+
+def get_post_version(post_id):
+    return _get(POST_VERSION_KEY.format(post_id=post_id))
+
+
+def bump_post_version(post_id):
+    """Invalida el detalle cacheado de un post."""
+    return _bump(POST_VERSION_KEY.format(post_id=post_id))
+
+
+def invalidate_post(post_id):
+    """Invalida el detalle del post cuando la transacción actual se confirme."""
+    transaction.on_commit(lambda: bump_post_version(post_id))
+
+
+def response_key(request, action, post_id=None):
+    """
+    Clave de caché para la petición: versión, acción, esquema, host, ruta y
+    parámetros ordenados. Las respuestas incluyen URLs absolutas (imágenes), así
+    que cada host tiene sus propias entradas. El detalle de un post incluye
+    además la versión del post.
+    """
+    params = urlencode(sorted(request.query_params.lists()), doseq=True)
+    url = f"{request.scheme}://{request.get_host()}{request.path}?{params}"
+    digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+    version = get_version()
+    if post_id is not None:
+        version = f"{version}.{get_post_version(post_id)}"
+    return f"posts:response:{version}:{action}:{digest}"
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Sirve `list` y `retrieve` desde la caché para usuarios anónimos.
+    Los usuarios autenticados ven sus borradores, por lo que no se cachean.
+
+    Junto a los datos se guardan los validadores de ConditionalGetMixin
+    (blogpost/conditional.py), así un acierto de caché responde con su ETag
+    (o con 304) sin volver a calcular el agregado.
+    """
+
+    def _cache_entry(self, request):
+        """(clave, (datos, validadores) o None); la caché se consulta una vez por petición."""
+        if not hasattr(self, "_response_cache_entry"):
+            key = response_key(request, self.action, self._cached_post_id())
+            self._response_cache_entry = (key, cache.get(key))
+        return self._response_cache_entry
+
+    def _cached_post_id(self):
+        """Id del post del detalle (solo ids numéricos; el resto acaba en 404)."""
+        if self.action != "retrieve":
+            return None
+        pk = str(self.kwargs.get(self.lookup_url_kwarg or self.lookup_field, ""))
+        return int(pk) if pk.isdigit() else None
+
+    def get_stored_validators(self, request):
+        if request.user.is_authenticated or self.action not in ("list", "retrieve"):
+            return None
+        _, entry = self._cache_entry(request)
+        return entry[1] if entry is not None else None
+
+    def _cached_response(self, request, handler, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+
+        key, entry = self._cache_entry(request)
+        if entry is not None:
+            return Response(entry[0])
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            validators = getattr(self, "conditional_validators", None)
+            cache.set(key, (response.data, validators), get_timeout())
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,118 @@
+"""
+Contadores desnormalizados de los posts.
+
+Los likes y comentarios de un post se guardan en `Post.likes_count` y
+`Post.comments_count` para no tener que hacer un COUNT(*) en cada lectura.
+Todas las escrituras pasan por estas funciones, que actualizan las columnas
+con un UPDATE atómico en la base de datos (sin leer el valor antes) y
+devuelven el nuevo valor en la misma sentencia con RETURNING. El mismo
+UPDATE ajusta también la puntuación `hot_score` (ver posts/hotness.py).
+
+Cada ajuste aplicado envía `post_counter_changed` con el día de creación del
+like o comentario, para las estadísticas diarias (ver stats/rollups.py), e
+invalida el detalle cacheado del post; los listados cacheados se renuevan por
+TTL (ver posts/cache.py).
+"""
+
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import hotness
+from .cache import invalidate_post as invalidate_cached_post
+from .models import Post
+from .signals import post_counter_changed
+
+
+def _adjust_counter(post_id, field, delta, hot_weight=0):
+    """
+    Suma `delta` a un contador del post sin dejarlo nunca en negativo y, si
+    `hot_weight` no es 0, ajusta `hot_score` en la misma sentencia. Las bajas
+    restan con la antigüedad actual, así que hot_score puede quedar algo alto
+    hasta el próximo `decay_hot_scores` (ver posts/hotness.py).
+    Devuelve el nuevo valor, o None si no se modificó ninguna fila.
+    """
+    age_sql = hotness.age_hours_sql(connection, "created_at")
+    if not connection.features.can_return_columns_from_insert or age_sql is None:
+        return _adjust_counter_fallback(post_id, field, delta, hot_weight)
+
+    table = connection.ops.quote_name(Post._meta.db_table)
+    column = connection.ops.quote_name(Post._meta.get_field(field).column)
+    assignments = [f"{column} = {column} + %s"]
+    params = [delta]
+    if hot_weight:
+        change = f"(%s / POWER({age_sql} + 2, %s))"
+        if delta > 0:
+            assignments.append(f"hot_score = hot_score + {change}")
+            params += [hot_weight, hotness.GRAVITY]
+        else:
+            assignments.append(
+                f"hot_score = CASE WHEN hot_score > {change} THEN hot_score - {change} ELSE 0 END"
+            )
+            params += [hot_weight, hotness.GRAVITY, hot_weight, hotness.GRAVITY]
+
+    sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE id = %s"
+    params.append(post_id)
+    if delta < 0:
+        sql += f" AND {column} >= %s"
+        params.append(-delta)
+    with connection.cursor() as cursor:
+        cursor.execute(f"{sql} RETURNING {column}", params)
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _adjust_counter_fallback(post_id, field, delta, hot_weight):
+    """Versión con el ORM para motores sin RETURNING o sin antigüedad en SQL."""
+    queryset = Post.all_objects.filter(pk=post_id)
+    if delta < 0:
+        queryset = queryset.filter(**{f"{field}__gte": -delta})
+    changes = {field: F(field) + delta}
+    if hot_weight:
+        created_at = (
+            Post.all_objects.filter(pk=post_id).values_list("created_at", flat=True).first()
+        )
+        if created_at is not None:
+            change = hotness.increment(hot_weight, created_at, timezone.now())
+            if delta > 0:
+                changes["hot_score"] = F("hot_score") + change
+            else:
+                changes["hot_score"] = Greatest(F("hot_score") - change, Value(0.0))
+    if not queryset.update(**changes):
+        return None
+    return Post.all_objects.filter(pk=post_id).values_list(field, flat=True).first()
+
+
+def _record(post_id, field, delta, hot_weight, created_at):
+    value = _adjust_counter(post_id, field, delta, hot_weight)
+    if value is not None:
+        invalidate_cached_post(post_id)
+        post_counter_changed.send(
+            sender=Post,
+            post_id=post_id,
+            field=field,
+            delta=delta,
+            day=timezone.localdate(created_at or timezone.now()),
+        )
+    return value
+
+
+def like_added(post_id, created_at=None):
+    """Registra un like nuevo en el post."""
+    return _record(post_id, "likes_count", 1, hotness.LIKE_WEIGHT, created_at)
+
+
+def like_removed(post_id, created_at=None):
+    """Registra que se eliminó un like del post (`created_at`: cuándo se dio)."""
+    return _record(post_id, "likes_count", -1, hotness.LIKE_WEIGHT, created_at)
+
+
+def comment_added(post_id, created_at=None):
+    """Registra un comentario nuevo en el post."""
+    return _record(post_id, "comments_count", 1, hotness.COMMENT_WEIGHT, created_at)
+
+
+def comment_removed(post_id, created_at=None):
+    """Registra que se eliminó (soft delete) un comentario del post (`created_at`: cuándo se creó)."""
+    return _record(post_id, "comments_count", -1, hotness.COMMENT_WEIGHT, created_at)
@@ -0,0 +1,65 @@
+"""
+Receptores de señales que mantienen los contadores de etiquetas.
+
+`Tag.posts_count` cuenta los posts publicados y no eliminados de cada etiqueta.
+Se recalcula (un UPDATE por evento) para las etiquetas afectadas cuando cambian
+las etiquetas de un post o cuando un post se publica, despublica o elimina.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Post, Tag
+from .signals import posts_publication_changed, posts_soft_deleted
+
+
+def refresh_tags_of_posts(post_ids):
+    Tag.objects.filter(post__in=post_ids).distinct().refresh_posts_count()
+
+
+@receiver(m2m_changed, sender=Post.tags.through, dispatch_uid="tags_count_m2m")
+def tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # Tras el clear ya no se sabe qué etiquetas tenía: se guardan antes
+        if reverse:
+            instance._cleared_tag_ids = [instance.pk]
+        else:
+            instance._cleared_tag_ids = list(instance.tags.values_list("pk", flat=True))
+        return
+
+    if action == "post_clear":
+        tag_ids = getattr(instance, "_cleared_tag_ids", [])
+    elif action in ("post_add", "post_remove"):
+        tag_ids = [instance.pk] if reverse else list(pk_set or [])
+    else:
+        return
+
+    if tag_ids:
+        Tag.objects.filter(pk__in=tag_ids).refresh_posts_count()
+
+
+@receiver(posts_publication_changed, sender=Post, dispatch_uid="tags_count_publication")
+@receiver(posts_soft_deleted, sender=Post, dispatch_uid="tags_count_soft_delete")
+def posts_visibility_changed(sender, post_ids, **kwargs):
+    refresh_tags_of_posts(post_ids)
+
+
+@receiver(post_save, sender=Post, dispatch_uid="tags_count_post_save")
+def post_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Los guardados completos (edición desde la API) pueden cambiar is_published;
+    # los parciales ya se notifican con las señales propias de posts.
+    if created or not Post.is_full_save(update_fields):
+        return
+    refresh_tags_of_posts([instance.pk])
+
+
+@receiver(pre_delete, sender=Post, dispatch_uid="tags_count_pre_delete")
+def post_about_to_be_deleted(sender, instance, **kwargs):
+    instance._deleted_tag_ids = list(instance.tags.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Post, dispatch_uid="tags_count_post_delete")
+def post_deleted(sender, instance, **kwargs):
+    tag_ids = getattr(instance, "_deleted_tag_ids", [])
+    if tag_ids:
+        Tag.objects.filter(pk__in=tag_ids).refresh_posts_count()
@@ -0,0 +1,56 @@
+"""
+Puntuación "hot" (tendencias) de los posts, al estilo de Hacker News:
+
+    hot = (likes * LIKE_WEIGHT + comentarios * COMMENT_WEIGHT) / (horas + 2) ** GRAVITY
+
+`Post.hot_score` se mantiene de forma incremental desde posts/counters.py:
+cada like o comentario suma (o resta) su peso dividido por la antigüedad
+actual del post, en el mismo UPDATE que el contador. Como la antigüedad sigue
+creciendo después, el comando `decay_hot_scores` recalcula periódicamente la
+puntuación completa para aplicar el decaimiento a todos los posts.
+
+Las bajas (quitar un like, borrar un comentario) restan el peso con la
+antigüedad del momento de la baja, que es menor que lo que el alta sumó si no
+hubo un recálculo entre medio. La puntuación queda así algo por encima de la
+real (nunca por debajo ni negativa) hasta la siguiente ejecución de
+`decay_hot_scores`, que la vuelve a calcular desde los contadores; ese
+intervalo acota la desviación.
+"""
+
+from django.conf import settings
+
+GRAVITY = 1.8
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+
+
+def get_max_age_days():
+    """Posts más antiguos que esto tienen puntuación 0 (setting HOT_SCORE_MAX_AGE_DAYS)."""
+    return getattr(settings, "HOT_SCORE_MAX_AGE_DAYS", 14)
+
+
+def age_hours(created_at, now):
+    return max((now - created_at).total_seconds() / 3600, 0)
+
+
+def score(likes, comments, created_at, now):
+    """Puntuación completa de un post en el instante `now`."""
+    points = likes * LIKE_WEIGHT + comments * COMMENT_WEIGHT
+    return points / (age_hours(created_at, now) + 2) ** GRAVITY
+
+
+def increment(weight, created_at, now):
+    """Lo que aporta ahora un evento de peso `weight` a la puntuación."""
+    return weight / (age_hours(created_at, now) + 2) ** GRAVITY
+
+
+def age_hours_sql(connection, column):
+    """
+    Expresión SQL con la antigüedad en horas de `column`, o None si el motor
+    no está soportado (en ese caso se calcula en Python).
+    """
+    if connection.vendor == "sqlite":
+        return f"((julianday('now') - julianday({column})) * 24.0)"
+    if connection.vendor == "postgresql":
+        return f"(EXTRACT(EPOCH FROM (NOW() - {column})) / 3600.0)"
+    return None
@@ -0,0 +1,200 @@
+"""
+Variantes responsive de `Post.image`.
+
+Por cada imagen se generan versiones reducidas (`thumbnail`, `medium`) en el
+formato original y en WebP, guardadas junto al original (`posts/foto.jpg` ->
+`posts/foto.thumbnail.jpg`, `posts/foto.thumbnail.webp`, ...). El trabajo con
+Pillow se hace fuera del ciclo de la petición en un pool de hilos, y el
+resultado se guarda en `Post.image_variants` para que los serializers puedan
+construir el `srcset` sin tocar el disco.
+
+Al reemplazar o quitar la imagen se vuelve a ejecutar `generate_variants`, que
+además borra los ficheros de las variantes de la imagen anterior.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import cache as response_cache
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+# Nombre de la variante -> ancho máximo en píxeles
+VARIANT_WIDTHS = {
+    "thumbnail": 320,
+    "medium": 960,
+}
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+# Errores esperables al procesar una imagen (fichero ausente, corrupto o no soportado)
+IMAGE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+
+_executor = None
+
+
+def get_executor():
+    """Pool compartido por el proceso (se crea la primera vez que se usa)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "POST_IMAGE_WORKERS", 2),
+            thread_name_prefix="post-images",
+        )
+    return _executor
+
+
+def variant_name(source_name, variant, extension):
+    stem, _ = os.path.splitext(source_name)
+    return f"{stem}.{variant}.{extension}"
+
+
+def _save(storage, name, image, image_format, **options):
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **options)
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def render_variants(storage, source_name):
+    """Genera todas las variantes de una imagen y devuelve su descripción."""
+    with storage.open(source_name, "rb") as source:
+        original = Image.open(source)
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    # Las imágenes con transparencia se mantienen en PNG; el resto en JPEG
+    has_alpha = original.mode in ("RGBA", "LA") or "transparency" in original.info
+    if has_alpha:
+        fallback_format, fallback_extension, fallback_options = "PNG", "png", {"optimize": True}
+        original = original.convert("RGBA")
+    else:
+        fallback_format, fallback_extension = "JPEG", "jpg"
+        fallback_options = {"quality": JPEG_QUALITY, "optimize": True, "progressive": True}
+        original = original.convert("RGB")
+
+    variants = {}
+    for variant, width in VARIANT_WIDTHS.items():
+        resized = original.copy()
+        resized.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+        variants[variant] = {
+            "width": resized.width,
+            "height": resized.height,
+            "src": _save(
+                storage,
+                variant_name(source_name, variant, fallback_extension),
+                resized,
+                fallback_format,
+                **fallback_options,
+            ),
+            "webp": _save(
+                storage,
+                variant_name(source_name, variant, "webp"),
+                resized,
+                "WEBP",
+                quality=WEBP_QUALITY,
+            ),
+        }
+
+    return {
+        "source": source_name,
+        "width": original.width,
+        "height": original.height,
+        "variants": variants,
+    }
+
+
+def delete_variant_files(storage, data):
+    """Borra los ficheros descritos en un `image_variants` (no toca el original)."""
+    for info in (data or {}).get("variants", {}).values():
+        for name in (info["src"], info["webp"]):
+            storage.delete(name)
+
+
+def generate_variants(post_id):
+    """
+    Genera las variantes de un post y las guarda en `image_variants`. Si eran
+    de otra imagen (reemplazada o quitada), borra sus ficheros.
+    """
+    post = Post.all_objects.only("id", "image", "image_variants").filter(pk=post_id).first()
+    if post is None:
+        return None
+    previous = post.image_variants or {}
+    if not post.image and not previous:
+        return None
+
+    storage = post.image.storage
+    data = render_variants(storage, post.image.name) if post.image else {}
+    # Si la imagen cambió mientras tanto no se sobrescribe el resultado más reciente
+    updated = Post.all_objects.filter(pk=post_id, image=post.image.name).update(
+        image_variants=data, updated_at=timezone.now()
+    )
+    if updated:
+        # Con la misma imagen los nombres coinciden y ya se sobrescribieron
+        if previous.get("source") != data.get("source"):
+            delete_variant_files(storage, previous)
+        response_cache.bump_version()
+    return data or None
+
+
+def _run_in_worker(post_id):
+    try:
+        generate_variants(post_id)
+    except Exception:
+        logger.exception("No se pudieron generar las variantes de la imagen del post %s", post_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(post_id):
+    """
+    Encola la generación de variantes (y el borrado de las de una imagen anterior)
+    cuando se confirme la transacción actual.
+    """
+    transaction.on_commit(lambda: get_executor().submit(_run_in_worker, post_id))
+
+
+def build_image_sources(post, request=None):
+    """
+    Estructura tipo `srcset` para el frontend, o None si el post no tiene imagen.
+    Si las variantes aún no se generaron solo incluye el original.
+    """
+    if not post.image:
+        return None
+
+    storage = post.image.storage
+
+    def url(name):
+        location = storage.url(name)
+        return request.build_absolute_uri(location) if request else location
+
+    sources = {"original": url(post.image.name), "srcset": "", "webp_srcset": "", "variants": {}}
+    data = post.image_variants or {}
+    if data.get("source") != post.image.name:
+        return sources
+
+    srcset, webp_srcset = [], []
+    for variant, info in data["variants"].items():
+        src, webp = url(info["src"]), url(info["webp"])
+        srcset.append(f"{src} {info['width']}w")
+        webp_srcset.append(f"{webp} {info['width']}w")
+        sources["variants"][variant] = {
+            "src": src,
+            "webp": webp,
+            "width": info["width"],
+            "height": info["height"],
+        }
+    sources["srcset"] = ", ".join(srcset)
+    sources["webp_srcset"] = ", ".join(webp_srcset)
+    return sources
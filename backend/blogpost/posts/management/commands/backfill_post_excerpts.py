@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import CONTENT_SUMMARY_FIELDS, Post
+
+
+class Command(BaseCommand):
+    help = "Calcula excerpt, word_count y reading_time de los posts existentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Cantidad de posts procesados por lote (por defecto 500).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recalcula todos los posts, no solo los que no tienen extracto.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Post.all_objects.order_by("pk").only("id", "content")
+        if not options["all"]:
+            queryset = queryset.filter(excerpt="")
+
+        last_id = 0
+        updated = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+
+            for post in batch:
+                post.update_content_summary()
+            Post.all_objects.bulk_update(batch, CONTENT_SUMMARY_FIELDS)
+
+            updated += len(batch)
+            last_id = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} posts actualizados."))
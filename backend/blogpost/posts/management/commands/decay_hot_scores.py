@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from posts import hotness
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula hot_score de los posts recientes para aplicar el decaimiento "
+        "temporal y pone a 0 el de los antiguos. Pensado para ejecutarse periódicamente."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Cantidad de posts procesados por lote (por defecto 500).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        now = timezone.now()
+        cutoff = now - timedelta(days=hotness.get_max_age_days())
+
+        expired = (
+            Post.all_objects.filter(created_at__lt=cutoff).exclude(hot_score=0).update(hot_score=0)
+        )
+
+        last_id = 0
+        updated = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Post.all_objects.select_for_update()
+                    .filter(pk__gt=last_id, created_at__gte=cutoff)
+                    .order_by("pk")
+                    .only("id", "created_at", "likes_count", "comments_count", "hot_score")[
+                        :batch_size
+                    ]
+                )
+                if not batch:
+                    break
+
+                for post in batch:
+                    post.hot_score = hotness.score(
+                        post.likes_count, post.comments_count, post.created_at, now
+                    )
+                Post.all_objects.bulk_update(batch, ["hot_score"])
+
+            updated += len(batch)
+            last_id = batch[-1].pk
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{updated} posts recalculados, {expired} puestos a 0.")
+        )
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import F, Q
+
+from posts.images import IMAGE_ERRORS, generate_variants
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Genera las variantes responsive (thumbnail, medium, WebP) de las imágenes de posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenera también los posts que ya tienen variantes.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Hilos que procesan imágenes en paralelo (por defecto 4).",
+        )
+
+    def handle(self, *args, **options):
+        has_image = ~Q(image="") & Q(image__isnull=False)
+        if options["all"]:
+            queryset = Post.all_objects.filter(has_image)
+        else:
+            # Sin variantes, con variantes de una imagen anterior o de una imagen ya quitada
+            missing = Q(image_variants={}) | ~Q(image_variants__source=F("image"))
+            queryset = Post.all_objects.filter(
+                (has_image & missing) | (~has_image & ~Q(image_variants={}))
+            )
+        post_ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+
+        def process(post_id):
+            try:
+                return generate_variants(post_id)
+            finally:
+                close_old_connections()
+
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = {executor.submit(process, post_id): post_id for post_id in post_ids}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    done += 1
+                except IMAGE_ERRORS as exc:
+                    failed += 1
+                    self.stderr.write(f"Post {futures[future]}: {exc}")
+
+        self.stdout.write(self.style.SUCCESS(f"{done} imágenes procesadas, {failed} con errores."))
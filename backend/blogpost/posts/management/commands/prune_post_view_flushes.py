@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.models import PostViewFlush
+
+
+class Command(BaseCommand):
+    help = "Elimina los registros antiguos de volcados de lecturas (PostViewFlush)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=7,
+            help="Conserva los registros de los últimos N días (por defecto 7).",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = PostViewFlush.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} registros eliminados."))
@@ -0,0 +1,88 @@
+from comments.models import Comment
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from likes.models import Like
+from users.models import AuthorStats
+
+from posts import cache as response_cache
+from posts.models import Post
+
+
+def _count_subquery(queryset):
+    """Subconsulta que cuenta las filas relacionadas con el post exterior."""
+    counts = (
+        queryset.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula likes_count y comments_count de los posts y corrige los desajustes, "
+        "junto con las estadísticas de sus autores."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Cantidad de posts procesados por lote (por defecto 500).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informa los posts desajustados, sin modificarlos.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        last_id = 0
+        checked = fixed = 0
+
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Post.all_objects.select_for_update()
+                    .filter(pk__gt=last_id)
+                    .order_by("pk")
+                    .only("id", "author_id", "likes_count", "comments_count")
+                    .annotate(
+                        real_likes=_count_subquery(Like.objects.all()),
+                        real_comments=_count_subquery(Comment.objects.all()),
+                    )[:batch_size]
+                )
+                if not batch:
+                    break
+
+                drifted = []
+                for post in batch:
+                    if (post.likes_count, post.comments_count) != (
+                        post.real_likes,
+                        post.real_comments,
+                    ):
+                        post.likes_count = post.real_likes
+                        post.comments_count = post.real_comments
+                        drifted.append(post)
+
+                if drifted and not dry_run:
+                    # bulk_update no envía señales: los totales de los autores se recalculan aquí
+                    Post.all_objects.bulk_update(drifted, ["likes_count", "comments_count"])
+                    AuthorStats.objects.refresh({post.author_id for post in drifted})
+
+            checked += len(batch)
+            fixed += len(drifted)
+            last_id = batch[-1].pk
+
+        if fixed and not dry_run:
+            response_cache.invalidate()
+
+        verb = "desajustados" if dry_run else "corregidos"
+        self.stdout.write(self.style.SUCCESS(f"{checked} posts revisados, {fixed} {verb}."))
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """Inicializa los contadores con los likes y comentarios existentes."""
+    Post = apps.get_model("posts", "Post")
+    Like = apps.get_model("likes", "Like")
+    Comment = apps.get_model("comments", "Comment")
+
+    def count_of(model, **filters):
+        counts = (
+            model.objects.filter(post=OuterRef("pk"), **filters)
+            .order_by()
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(counts), Value(0))
+
+    Post.objects.update(
+        likes_count=count_of(Like),
+        comments_count=count_of(Comment, deleted_at__isnull=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0002_initial"),
+        ("likes", "0001_initial"),
+        ("comments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0003_post_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.CharField(blank=True, default="", max_length=153),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(default=0, help_text="Minutos de lectura"),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
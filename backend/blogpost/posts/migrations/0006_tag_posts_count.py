@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_posts_count(apps, schema_editor):
+    """Inicializa posts_count con los posts publicados de cada etiqueta."""
+    Post = apps.get_model("posts", "Post")
+    Tag = apps.get_model("posts", "Tag")
+    counts = (
+        Post.tags.through.objects.filter(
+            tag_id=OuterRef("pk"), post__is_published=True, post__deleted_at__isnull=True
+        )
+        .order_by()
+        .values("tag_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Tag.objects.update(posts_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0005_post_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tag",
+            name="posts_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(fields=["-posts_count", "name"], name="posts_tag_popularity_idx"),
+        ),
+        migrations.RunPython(backfill_posts_count, migrations.RunPython.noop),
+    ]
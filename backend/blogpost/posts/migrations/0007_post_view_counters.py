@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0006_tag_posts_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostReaderSketch",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="reader_sketch",
+                        serialize=False,
+                        to="posts.post",
+                    ),
+                ),
+                ("registers", models.BinaryField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PostViewFlush",
+            fields=[
+                ("batch_id", models.UUIDField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("posts", models.PositiveIntegerField(default=0)),
+                ("views", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="unique_readers",
+            field=models.PositiveIntegerField(default=0, help_text="Estimación (HyperLogLog)"),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="view_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:13
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# Copia de la fórmula de posts/hotness.py en el momento de la migración
+GRAVITY = 1.8
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+
+
+def seed_hot_scores(apps, schema_editor):
+    """Calcula hot_score de los posts recientes a partir de sus contadores y antigüedad."""
+    Post = apps.get_model("posts", "Post")
+    now = timezone.now()
+    cutoff = now - timedelta(days=getattr(settings, "HOT_SCORE_MAX_AGE_DAYS", 14))
+    posts = Post.objects.filter(created_at__gte=cutoff).only(
+        "id", "created_at", "likes_count", "comments_count"
+    )
+    batch = []
+    for post in posts.iterator(chunk_size=500):
+        hours = max((now - post.created_at).total_seconds() / 3600, 0)
+        points = post.likes_count * LIKE_WEIGHT + post.comments_count * COMMENT_WEIGHT
+        post.hot_score = points / (hours + 2) ** GRAVITY
+        batch.append(post)
+        if len(batch) == 500:
+            Post.objects.bulk_update(batch, ["hot_score"])
+            batch = []
+    Post.objects.bulk_update(batch, ["hot_score"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0007_post_view_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="hot_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(seed_hot_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True), ("is_published", True)),
+                fields=["-hot_score"],
+                name="posts_post_hot_idx",
+            ),
+        ),
+    ]
@@ -1,21 +1,77 @@
-from django.db import models
+import math
+
 from django.conf import settings
+from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from .cache import invalidate as invalidate_response_cache
+from .signals import posts_publication_changed, posts_soft_deleted
+
+EXCERPT_LENGTH = 150
+WORDS_PER_MINUTE = 200
+CONTENT_SUMMARY_FIELDS = ("excerpt", "word_count", "reading_time")
+# Contadores desnormalizados: solo se escriben con UPDATE atómicos, nunca al guardar
+# el post completo (ver Post.save)
+COUNTER_FIELDS = ("likes_count", "comments_count", "view_count", "unique_readers", "hot_score")
 
-class PostManager(models.Manager):
+
+class PostQuerySet(models.QuerySet):
     """
-    Manager personalizado que filtra automáticamente los posts eliminados.
+    Operaciones masivas sobre posts: cada una es un único UPDATE.
+    Notifican el cambio con las señales de posts/signals.py.
     """
 
-    def get_queryset(self):
-        return super().get_queryset().filter(deleted_at__isnull=True)
+    def _bulk_update(self, signal, **changes):
+        post_ids = list(self.values_list("pk", flat=True))
+        if not post_ids:
+            return 0
+        updated = self.model.all_objects.filter(pk__in=post_ids).update(
+            updated_at=timezone.now(), **changes
+        )
+        signal.send(sender=self.model, post_ids=post_ids, **changes)
+        invalidate_response_cache()
+        return updated
 
     def soft_delete(self):
         """
         Marca todos los posts del queryset como eliminados (soft delete).
         """
-        return self.update(deleted_at=timezone.now())
+        return self.filter(deleted_at__isnull=True)._bulk_update(
+            posts_soft_deleted, deleted_at=timezone.now()
+        )
+
+    def publish(self):
+        """Publica todos los posts del queryset."""
+        return self.filter(is_published=False)._bulk_update(
+            posts_publication_changed, is_published=True
+        )
+
+    def unpublish(self):
+        """Despublica todos los posts del queryset."""
+        return self.filter(is_published=True)._bulk_update(
+            posts_publication_changed, is_published=False
+        )
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    """
+    Manager personalizado que filtra automáticamente los posts eliminados.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class CategoryQuerySet(models.QuerySet):
+    def with_posts_count(self):
+        """Anota `published_posts_count` con los posts publicados de cada categoría."""
+        return self.annotate(
+            published_posts_count=models.Count(
+                "posts",
+                filter=models.Q(posts__is_published=True, posts__deleted_at__isnull=True),
+            )
+        )
 
 
 class Category(models.Model):
@@ -29,6 +85,8 @@ class Category(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CategoryQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Category"
         verbose_name_plural = "Categories"
@@ -38,6 +96,27 @@ class Category(models.Model):
         return self.name
 
 
+class TagQuerySet(models.QuerySet):
+    def refresh_posts_count(self):
+        """
+        Recalcula `posts_count` (posts publicados y no eliminados) de las
+        etiquetas del queryset con un único UPDATE.
+        """
+        through = Post.tags.through
+        counts = (
+            through.objects.filter(
+                tag_id=models.OuterRef("pk"),
+                post__is_published=True,
+                post__deleted_at__isnull=True,
+            )
+            .order_by()
+            .values("tag_id")
+            .annotate(total=models.Count("pk"))
+            .values("total")
+        )
+        return self.update(posts_count=Coalesce(models.Subquery(counts), models.Value(0)))
+
+
 class Tag(models.Model):
     """
     Etiquetas para etiquetar los posts.
@@ -49,9 +128,16 @@ class Tag(models.Model):
         max_length=7, default="#007bff", help_text="Color en formato hex (ej: #007bff)"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Posts publicados con esta etiqueta, mantenido por posts/handlers.py
+    posts_count = models.PositiveIntegerField(default=0)
+
+    objects = TagQuerySet.as_manager()
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["-posts_count", "name"], name="posts_tag_popularity_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -66,6 +152,10 @@ class Post(models.Model):
     title = models.CharField(max_length=255)
     slug = models.SlugField(unique=True, max_length=255)
     content = models.TextField()
+    # Derivados de `content`, precalculados al guardar (ver Post.summarize_content)
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH + 3, blank=True, default="")
+    word_count = models.PositiveIntegerField(default=0)
+    reading_time = models.PositiveSmallIntegerField(default=0, help_text="Minutos de lectura")
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="posts"
     )
@@ -79,6 +169,19 @@ class Post(models.Model):
         "Category", null=True, blank=True, on_delete=models.SET_NULL, related_name="posts"
     )
     image = models.ImageField(upload_to="posts/", null=True, blank=True)
+    # Variantes reducidas/WebP generadas en segundo plano (ver posts/images.py)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    # Contadores desnormalizados (ver posts/counters.py)
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+
+    # Lecturas acumuladas en memoria y volcadas por lotes (ver posts/pageviews.py)
+    view_count = models.PositiveBigIntegerField(default=0)
+    unique_readers = models.PositiveIntegerField(default=0, help_text="Estimación (HyperLogLog)")
+
+    # Puntuación de tendencias con decaimiento temporal (ver posts/hotness.py)
+    hot_score = models.FloatField(default=0)
 
     # Managers
     objects = PostManager()  # Manager personalizado (filtra eliminados)
@@ -90,17 +193,117 @@ class Post(models.Model):
             models.Index(fields=["is_published", "created_at"]),
             models.Index(fields=["author", "created_at"]),
             models.Index(fields=["category", "created_at"]),
+            # Parcial: coincide con el filtro del feed público (publicados y no eliminados)
+            models.Index(
+                fields=["-hot_score"],
+                name="posts_post_hot_idx",
+                condition=models.Q(is_published=True, deleted_at__isnull=True),
+            ),
         ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Recalcula excerpt, word_count y reading_time cuando se guarda el contenido,
+        venga el cambio de la API, del admin o del ORM.
+
+        El guardado completo de un post existente no escribe los contadores: los
+        valores leídos al cargarlo pisarían los incrementos concurrentes.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not self._state.adding:
+            update_fields = kwargs["update_fields"] = (
+                self.full_save_fields() - self.get_deferred_fields()
+            )
+        if "content" not in self.get_deferred_fields() and (
+            update_fields is None or "content" in update_fields
+        ):
+            self.update_content_summary()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *CONTENT_SUMMARY_FIELDS}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def full_save_fields(cls):
+        """Campos que escribe un guardado completo: todos salvo la clave y los contadores."""
+        return frozenset(
+            field.attname
+            for field in cls._meta.concrete_fields
+            if not field.primary_key and field.name not in COUNTER_FIELDS
+        )
+
+    @classmethod
+    def is_full_save(cls, update_fields):
+        """Indica si los `update_fields` de un post_save corresponden a un guardado completo."""
+        return update_fields is None or cls.full_save_fields() <= set(update_fields)
+
+    def update_content_summary(self):
+        for field, value in self.summarize_content(self.content or "").items():
+            setattr(self, field, value)
+
     def delete(self, *args, **kwargs):
         """Soft delete: marca el post como eliminado en vez de borrarlo."""
         self.deleted_at = timezone.now()
         self.save(update_fields=["deleted_at"])
+        posts_soft_deleted.send(sender=Post, post_ids=[self.pk], deleted_at=self.deleted_at)
+        invalidate_response_cache()
+
+    def set_published(self, is_published):
+        """Publica o despublica el post guardando solo los campos afectados."""
+        self.is_published = is_published
+        self.save(update_fields=["is_published", "updated_at"])
+        posts_publication_changed.send(sender=Post, post_ids=[self.pk], is_published=is_published)
+        invalidate_response_cache()
 
     @property
     def is_deleted(self):
         """Verifica si el post está marcado como eliminado (soft delete)."""
         return self.deleted_at is not None
+
+    @staticmethod
+    def summarize_content(content):
+        """Calcula extracto, número de palabras y minutos de lectura del contenido."""
+        if len(content) <= EXCERPT_LENGTH:
+            excerpt = content
+        else:
+            excerpt = content[:EXCERPT_LENGTH] + "..."
+        word_count = len(content.split())
+        return {
+            "excerpt": excerpt,
+            "word_count": word_count,
+            "reading_time": math.ceil(word_count / WORDS_PER_MINUTE),
+        }
+
+
+class PostReaderSketch(models.Model):
+    """
+    Sketch HyperLogLog de los lectores de un post (ver posts/hyperloglog.py).
+    Se guarda aparte para no arrastrar 1 KiB binario en cada consulta de posts.
+    """
+
+    post = models.OneToOneField(
+        Post, on_delete=models.CASCADE, primary_key=True, related_name="reader_sketch"
+    )
+    registers = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Lectores de {self.post_id}"
+
+
+class PostViewFlush(models.Model):
+    """
+    Registro de los lotes de lecturas ya aplicados. El id del lote se inserta
+    en la misma transacción que los contadores: si un volcado se reintenta
+    (p. ej. tras un error o un reinicio), el lote repetido se descarta.
+    """
+
+    batch_id = models.UUIDField(primary_key=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    posts = models.PositiveIntegerField(default=0)
+    views = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return str(self.batch_id)
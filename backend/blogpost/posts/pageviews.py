@@ -0,0 +1,204 @@
+"""
+Contador de lecturas de posts con buffer en memoria.
+
+Cada lectura (`PostViewSet.retrieve`) solo incrementa un contador en memoria
+y añade el lector a un sketch HyperLogLog del proceso; nada se escribe en la
+base de datos durante la petición. Cada POST_VIEWS_FLUSH_INTERVAL segundos (y
+al terminar el proceso) el lote acumulado se vuelca en una transacción:
+
+- un único UPDATE con CASE suma las lecturas a `Post.view_count` y guarda la
+  estimación de lectores únicos en `Post.unique_readers`;
+- los sketches se fusionan con los guardados en `PostReaderSketch`;
+- el id del lote se registra en `PostViewFlush`;
+- se envía `post_views_recorded` para las estadísticas diarias (stats/rollups.py).
+
+Si el volcado falla, el lote se conserva con el mismo id y se reintenta en el
+siguiente intervalo; si en realidad ya se había confirmado, el registro de
+`PostViewFlush` hace que el reintento se descarte y no se cuente dos veces.
+Las lecturas aún no volcadas se pierden si el proceso muere sin salir
+limpiamente (como mucho un intervalo).
+"""
+
+import atexit
+import logging
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, PositiveBigIntegerField, PositiveIntegerField, Value, When
+from django.utils import timezone
+
+from .hyperloglog import HyperLogLog
+from .models import Post, PostReaderSketch, PostViewFlush
+from .signals import post_views_recorded
+
+logger = logging.getLogger(__name__)
+
+
+def get_flush_interval():
+    """Segundos entre volcados (setting POST_VIEWS_FLUSH_INTERVAL, 30 por defecto)."""
+    return getattr(settings, "POST_VIEWS_FLUSH_INTERVAL", 30)
+
+
+class ViewBatch:
+    """Lecturas acumuladas entre dos volcados, con un id estable para los reintentos."""
+
+    def __init__(self):
+        self.batch_id = uuid.uuid4()
+        self.views = Counter()
+        self.readers = {}
+
+    def __bool__(self):
+        return bool(self.views)
+
+    def add(self, post_id, reader=None):
+        self.views[post_id] += 1
+        if reader is not None:
+            if post_id not in self.readers:
+                self.readers[post_id] = HyperLogLog()
+            self.readers[post_id].add(reader)
+
+
+def apply_batch(batch):
+    """
+    Aplica un lote en una sola transacción.
+    Retorna False si el lote ya se había aplicado antes.
+    """
+    with transaction.atomic():
+        if PostViewFlush.objects.filter(batch_id=batch.batch_id).exists():
+            return False
+        PostViewFlush.objects.create(
+            batch_id=batch.batch_id, posts=len(batch.views), views=sum(batch.views.values())
+        )
+
+        # Bloquea los posts del lote y trae sus sketches en la misma consulta
+        # (los posts borrados físicamente entre medio simplemente se omiten)
+        rows = (
+            Post.all_objects.select_for_update(of=("self",))
+            .filter(pk__in=list(batch.views))
+            .values_list("pk", "reader_sketch__registers")
+        )
+        sketches = []
+        unique_readers = {}
+        existing = set()
+        for post_id, registers in rows:
+            existing.add(post_id)
+            sketch = batch.readers.get(post_id)
+            if sketch is None:
+                continue
+            if registers is not None:
+                sketch.merge(HyperLogLog(registers))
+            sketches.append(PostReaderSketch(post_id=post_id, registers=sketch.to_bytes()))
+            unique_readers[post_id] = sketch.count()
+
+        if sketches:
+            PostReaderSketch.objects.bulk_create(
+                sketches,
+                update_conflicts=True,
+                unique_fields=["post"],
+                update_fields=["registers", "updated_at"],
+            )
+
+        changes = {
+            "view_count": F("view_count")
+            + Case(
+                *(When(pk=post_id, then=Value(views)) for post_id, views in batch.views.items()),
+                default=Value(0),
+                output_field=PositiveBigIntegerField(),
+            )
+        }
+        if unique_readers:
+            changes["unique_readers"] = Case(
+                *(When(pk=post_id, then=Value(count)) for post_id, count in unique_readers.items()),
+                default=F("unique_readers"),
+                output_field=PositiveIntegerField(),
+            )
+        Post.all_objects.filter(pk__in=list(batch.views)).update(**changes)
+
+        views = {post_id: batch.views[post_id] for post_id in existing}
+        if views:
+            post_views_recorded.send(sender=Post, views=views, day=timezone.localdate())
+    return True
+
+
+class ViewBuffer:
+    """Buffer de lecturas del proceso, seguro entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._current = ViewBatch()
+        self._pending = []
+        self._timer = None
+
+    def record(self, post_id, reader=None):
+        """Cuenta una lectura; programa un volcado si no hay uno pendiente."""
+        with self._lock:
+            self._current.add(post_id, reader)
+            self._schedule()
+
+    def _schedule(self):
+        if self._timer is None:
+            self._timer = threading.Timer(get_flush_interval(), self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush_quietly()
+        close_old_connections()
+        with self._lock:
+            # Si el volcado falló, se reintenta en el siguiente intervalo
+            if self._pending or self._current:
+                self._schedule()
+
+    def flush(self):
+        """Vuelca los lotes pendientes. Retorna cuántos se aplicaron."""
+        with self._flush_lock:
+            with self._lock:
+                if self._current:
+                    self._pending.append(self._current)
+                    self._current = ViewBatch()
+                batches = list(self._pending)
+
+            applied = 0
+            for batch in batches:
+                # Si falla, este lote y los siguientes quedan pendientes con su id
+                if apply_batch(batch):
+                    applied += 1
+                with self._lock:
+                    self._pending.remove(batch)
+            return applied
+
+    def flush_quietly(self):
+        try:
+            return self.flush()
+        except Exception:
+            logger.exception("No se pudieron volcar las lecturas de posts")
+            return 0
+
+
+buffer = ViewBuffer()
+atexit.register(buffer.flush_quietly)
+
+
+def reader_key(request):
+    """Identificador del lector: el usuario o, si es anónimo, su IP y navegador."""
+    user = request.user
+    if user.is_authenticated:
+        return f"user:{user.pk}"
+    address = request.META.get("REMOTE_ADDR", "")
+    agent = request.META.get("HTTP_USER_AGENT", "")
+    return f"anon:{address}:{agent}"
+
+
+def record_view(request, post_id):
+    """Registra la lectura de un post en el buffer del proceso."""
+    try:
+        post_id = int(post_id)
+    except (TypeError, ValueError):
+        return
+    buffer.record(post_id, reader_key(request))
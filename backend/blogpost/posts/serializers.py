@@ -1,12 +1,14 @@
 from rest_framework import serializers
-from .models import Post, Tag, Category
+
+from .images import build_image_sources, schedule_variants
+from .models import Category, Post, Tag
 
 
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
-        fields = ("id", "name", "slug", "color", "created_at")
-        read_only_fields = ("id", "created_at")
+        fields = ("id", "name", "slug", "color", "created_at", "posts_count")
+        read_only_fields = ("id", "created_at", "posts_count")
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -18,8 +20,14 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "created_at", "updated_at", "posts_count")
 
     def get_posts_count(self, obj):
-        """Cuenta los posts publicados en esta categoría."""
-        return obj.posts.filter(is_published=True, deleted_at__isnull=True).count()
+        """
+        Posts publicados en esta categoría. Usa la anotación de
+        `Category.objects.with_posts_count()` y solo cuenta si no está disponible.
+        """
+        count = getattr(obj, "published_posts_count", None)
+        if count is None:
+            count = obj.posts.filter(is_published=True, deleted_at__isnull=True).count()
+        return count
 
 
 class PostListSerializer(serializers.ModelSerializer):
@@ -30,7 +38,11 @@ class PostListSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
-    excerpt = serializers.SerializerMethodField()
+    image_sources = serializers.SerializerMethodField()
+    # Solo presente en resultados de búsqueda (?search=)
+    search_snippet = serializers.CharField(read_only=True)
+    # Solo presente con ?include=likes
+    user_has_liked = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Post
@@ -39,6 +51,8 @@ class PostListSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "excerpt",
+            "word_count",
+            "reading_time",
             "author",
             "created_at",
             "updated_at",
@@ -46,14 +60,32 @@ class PostListSerializer(serializers.ModelSerializer):
             "tags",
             "category",
             "image",
+            "image_sources",
+            "likes_count",
+            "comments_count",
+            "view_count",
+            "unique_readers",
+            "hot_score",
+            "user_has_liked",
+            "search_snippet",
+        )
+        read_only_fields = (
+            "id",
+            "excerpt",
+            "word_count",
+            "reading_time",
+            "created_at",
+            "updated_at",
+            "likes_count",
+            "comments_count",
+            "view_count",
+            "unique_readers",
+            "hot_score",
         )
-        read_only_fields = ("id", "created_at", "updated_at")
 
-    def get_excerpt(self, obj):
-        """Genera un extracto del contenido (primeros 150 caracteres)."""
-        if len(obj.content) <= 150:
-            return obj.content
-        return obj.content[:150] + "..."
+    def get_image_sources(self, obj):
+        """Original y variantes responsive (srcset) de la imagen."""
+        return build_image_sources(obj, self.context.get("request"))
 
 
 class PostDetailSerializer(serializers.ModelSerializer):
@@ -65,6 +97,9 @@ class PostDetailSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
     is_deleted = serializers.ReadOnlyField()
+    image_sources = serializers.SerializerMethodField()
+    # Solo presente con ?include=likes
+    user_has_liked = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Post
@@ -73,6 +108,8 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "content",
+            "word_count",
+            "reading_time",
             "author",
             "created_at",
             "updated_at",
@@ -81,9 +118,30 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "tags",
             "category",
             "image",
+            "image_sources",
+            "is_deleted",
+            "likes_count",
+            "comments_count",
+            "view_count",
+            "unique_readers",
+            "user_has_liked",
+        )
+        read_only_fields = (
+            "id",
+            "word_count",
+            "reading_time",
+            "created_at",
+            "updated_at",
             "is_deleted",
+            "likes_count",
+            "comments_count",
+            "view_count",
+            "unique_readers",
         )
-        read_only_fields = ("id", "created_at", "updated_at", "is_deleted")
+
+    def get_image_sources(self, obj):
+        """Original y variantes responsive (srcset) de la imagen."""
+        return build_image_sources(obj, self.context.get("request"))
 
 
 class PostCreateUpdateSerializer(serializers.ModelSerializer):
@@ -116,3 +174,28 @@ class PostCreateUpdateSerializer(serializers.ModelSerializer):
         if not value.strip():
             raise serializers.ValidationError("El contenido no puede estar vacío.")
         return value.strip()
+
+    def _schedule_image_variants(self, post, validated_data):
+        # Las variantes de una imagen anterior se conservan hasta regenerarlas: no se
+        # sirven (su `source` ya no coincide) y generate_variants borra sus ficheros
+        if "image" in validated_data:
+            schedule_variants(post.pk)
+        return post
+
+    def create(self, validated_data):
+        post = super().create(validated_data)
+        return self._schedule_image_variants(post, validated_data)
+
+    def update(self, instance, validated_data):
+        post = super().update(instance, validated_data)
+        return self._schedule_image_variants(post, validated_data)
+
+
+class PostBulkActionSerializer(serializers.Serializer):
+    """
+    Valida la lista de ids de las operaciones masivas sobre posts.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500
+    )
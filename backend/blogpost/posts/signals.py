@@ -0,0 +1,24 @@
+"""
+Señales propias de la app posts.
+
+Las operaciones masivas usan UPDATE directos, que no disparan `post_save`;
+estas señales permiten que otras apps (búsqueda, contadores, estadísticas...)
+reaccionen.
+"""
+
+from django.dispatch import Signal
+
+# Se envía tras marcar posts como eliminados. Argumentos: post_ids, deleted_at
+posts_soft_deleted = Signal()
+
+# Se envía tras publicar o despublicar posts. Argumentos: post_ids, is_published
+posts_publication_changed = Signal()
+
+# Se envía tras ajustar un contador de posts/counters.py.
+# Argumentos: post_id, field ("likes_count" o "comments_count"), delta, day
+# (día al que corresponde el like o comentario, según su fecha de creación)
+post_counter_changed = Signal()
+
+# Se envía al volcar un lote de lecturas (posts/pageviews.py). Argumentos: views, day
+# (views es un dict {post_id: lecturas})
+post_views_recorded = Signal()
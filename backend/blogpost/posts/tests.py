@@ -1,3 +1,665 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from comments.models import Comment
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from likes.models import Like
+from PIL import Image
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from users.models import AuthorStats, User
+
+from . import counters, hotness, pageviews
+from .cache import response_key
+from .hyperloglog import HyperLogLog
+from .images import generate_variants
+from .models import EXCERPT_LENGTH, Category, Post, PostReaderSketch, Tag
+from .serializers import PostListSerializer
+
+
+def create_post(author, slug, **kwargs):
+    kwargs.setdefault("title", slug)
+    kwargs.setdefault("content", "Contenido")
+    kwargs.setdefault("is_published", True)
+    return Post.objects.create(slug=slug, author=author, **kwargs)
+
+
+class ContentSummaryTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+
+    def test_save_computes_summary(self):
+        post = create_post(self.author, "largo", content="palabra " * 450)
+
+        post.refresh_from_db()
+        self.assertEqual(len(post.excerpt), EXCERPT_LENGTH + 3)
+        self.assertTrue(post.excerpt.endswith("..."))
+        self.assertEqual((post.word_count, post.reading_time), (450, 3))
+
+    def test_save_with_update_fields_refreshes_summary(self):
+        post = create_post(self.author, "corto", content="uno dos")
+        post.content = "uno dos tres"
+        post.save(update_fields=["content"])
+
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.word_count), ("uno dos tres", 3))
+
+    def test_api_update_refreshes_summary(self):
+        post = create_post(self.author, "api", content="uno")
+        client = APIClient()
+        client.force_authenticate(self.author)
+
+        response = client.patch(f"/api/posts/{post.pk}/", {"content": "uno dos"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.word_count, post.reading_time), ("uno dos", 2, 1))
+
+
+class AnonymousResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.post = create_post(self.author, "cacheado")
+        self.client = APIClient()
+        # retrieve cuenta lecturas en el buffer del proceso: se vuelcan en esta misma BD
+        self.addCleanup(pageviews.buffer.flush)
+
+    def test_cached_until_posts_change(self):
+        url = f"/api/posts/{self.post.pk}/"
+        self.assertEqual(self.client.get(url).data["title"], "cacheado")
+
+        Post.objects.filter(pk=self.post.pk).update(title="sin invalidar")
+        self.assertEqual(self.client.get(url).data["title"], "cacheado")
+
+        editor = APIClient()
+        editor.force_authenticate(self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            editor.patch(url, {"title": "editado"}, format="json")
+        self.assertEqual(self.client.get(url).data["title"], "editado")
+
+    def test_counter_changes_invalidate_only_the_post_detail(self):
+        url = f"/api/posts/{self.post.pk}/"
+        other = create_post(self.author, "otro")
+        other_url = f"/api/posts/{other.pk}/"
+        self.assertEqual(self.client.get(url).data["likes_count"], 0)
+        self.client.get(other_url)
+        self.client.get("/api/posts/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            counters.like_added(self.post.pk)
+            counters.comment_added(self.post.pk)
+        data = self.client.get(url).data
+        self.assertEqual((data["likes_count"], data["comments_count"]), (1, 1))
+
+        # El detalle de otros posts y los listados siguen en caché (los listados
+        # se renuevan por TTL)
+        with self.assertNumQueries(0):
+            self.client.get(other_url)
+            response = self.client.get("/api/posts/")
+        likes = {item["id"]: item["likes_count"] for item in response.data["results"]}
+        self.assertEqual(likes[self.post.pk], 0)
+
+    @override_settings(ALLOWED_HOSTS=["a.example.com", "b.example.com"])
+    def test_key_depends_on_host_and_sorted_params(self):
+        factory = APIRequestFactory()
+
+        def key(host, query):
+            return response_key(
+                Request(factory.get(f"/api/posts/?{query}", HTTP_HOST=host)), "list"
+            )
+
+        self.assertEqual(key("a.example.com", "a=1&b=2"), key("a.example.com", "b=2&a=1"))
+        self.assertNotEqual(key("a.example.com", "a=1"), key("b.example.com", "a=1"))
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.post = create_post(self.author, "etag")
+        self.client = APIClient()
+        self.addCleanup(pageviews.buffer.flush)
+
+    def test_detail_returns_304_until_counters_change(self):
+        url = f"/api/posts/{self.post.pk}/"
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            counters.like_added(self.post.pk)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_authenticated_list_etag_follows_counters(self):
+        self.client.force_authenticate(self.author)
+        etag = self.client.get("/api/posts/")["ETag"]
+
+        counters.like_added(self.post.pk)
+        response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_retrieve_sends_last_modified(self):
+        response = self.client.get(f"/api/posts/{self.post.pk}/")
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(
+            f"/api/posts/{self.post.pk}/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_response_keeps_its_etag_without_queries(self):
+        etag = self.client.get("/api/posts/")["ETag"]
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/posts/")["ETag"], etag)
+            response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_user(self):
+        anonymous = self.client.get("/api/posts/")["ETag"]
+        self.client.force_authenticate(self.author)
+        self.assertNotEqual(self.client.get("/api/posts/")["ETag"], anonymous)
+
+    def test_malformed_pk_is_404(self):
+        self.assertEqual(self.client.get("/api/posts/abc/").status_code, 404)
+        self.assertEqual(self.client.get("/api/posts/999/").status_code, 404)
+
+
+def image_file(name, size=(1200, 800)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "teal").save(buffer, format="JPEG")
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+class ImageVariantsMixin:
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.post = create_post(self.author, "imagen", image=image_file("foto.jpg"))
+
+    def _files(self, data):
+        return [name for info in data["variants"].values() for name in (info["src"], info["webp"])]
+
+
+class ImageVariantsTests(ImageVariantsMixin, TestCase):
+    def test_replacing_the_image_deletes_old_variants(self):
+        storage = self.post.image.storage
+        old = generate_variants(self.post.pk)
+        self.assertEqual(old["variants"]["thumbnail"]["width"], 320)
+        self.assertTrue(all(storage.exists(name) for name in self._files(old)))
+
+        self.post.refresh_from_db()
+        self.post.image = image_file("otra.jpg")
+        self.post.save()
+        new = generate_variants(self.post.pk)
+
+        self.assertFalse(any(storage.exists(name) for name in self._files(old)))
+        self.assertTrue(all(storage.exists(name) for name in self._files(new)))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.image_variants["source"], self.post.image.name)
+
+    def test_removing_the_image_deletes_variants(self):
+        storage = self.post.image.storage
+        old = generate_variants(self.post.pk)
+
+        Post.all_objects.filter(pk=self.post.pk).update(image="")
+        generate_variants(self.post.pk)
+
+        self.assertFalse(any(storage.exists(name) for name in self._files(old)))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.image_variants, {})
+
+
+class GenerateImageVariantsCommandTests(ImageVariantsMixin, TransactionTestCase):
+    """El comando procesa las imágenes en hilos: necesita datos confirmados."""
+
+    def test_processes_stale_posts_and_reports_broken_images(self):
+        generate_variants(self.post.pk)
+        broken = create_post(
+            self.author, "rota", image=ContentFile(b"no es una imagen", name="rota.jpg")
+        )
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command("generate_post_image_variants", "--workers", "1", stdout=stdout, stderr=stderr)
+
+        self.assertIn("0 imágenes procesadas, 1 con errores", stdout.getvalue())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.image_variants["source"], self.post.image.name)
+        self.assertIn(f"Post {broken.pk}", stderr.getvalue())
+
+
+class PostCommentsEndpointTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.post = create_post(self.author, "comentado")
+        self.url = f"/api/posts/{self.post.pk}/comments/"
+        self.client = APIClient()
+
+    def _comment(self, content, parent=None):
+        return Comment.objects.create(
+            post=self.post, author=self.author, content=content, parent=parent
+        )
+
+    def test_paginates_roots_with_reply_preview(self):
+        roots = [self._comment(f"raíz {index}") for index in range(3)]
+        replies = [self._comment(f"respuesta {index}", parent=roots[0]) for index in range(4)]
+
+        response = self.client.get(self.url, {"page_size": 2, "replies": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], [roots[2].pk, roots[1].pk]
+        )
+        self.assertIsNotNone(response.data["next"])
+
+        last = self.client.get(response.data["next"]).data
+        self.assertEqual([item["id"] for item in last["results"]], [roots[0].pk])
+        self.assertIsNone(last["next"])
+        preview = [reply["id"] for reply in last["results"][0]["replies"]]
+        self.assertEqual(preview, [replies[0].pk, replies[1].pk])
+
+    def test_unknown_or_malformed_post_is_404(self):
+        self.assertEqual(self.client.get("/api/posts/abc/comments/").status_code, 404)
+        self.assertEqual(self.client.get("/api/posts/999/comments/").status_code, 404)
+
+    def test_draft_post_is_hidden_from_other_users(self):
+        draft = create_post(self.author, "borrador", is_published=False)
+        url = f"/api/posts/{draft.pk}/comments/"
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.force_authenticate(self.author)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class HyperLogLogTests(TestCase):
+    def test_estimate_is_close_to_the_real_cardinality(self):
+        sketch = HyperLogLog()
+        for reader in range(20000):
+            sketch.add(f"user:{reader}")
+            sketch.add(f"user:{reader}")
+
+        self.assertAlmostEqual(sketch.count(), 20000, delta=20000 * 0.1)
+
+    def test_merge_is_the_union(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        for reader in range(300):
+            first.add(reader)
+            second.add(reader + 200)
+        first.merge(second)
+
+        self.assertAlmostEqual(first.count(), 500, delta=25)
+        self.assertEqual(HyperLogLog(first.to_bytes()).count(), first.count())
+
+
+class ViewBufferTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.post = create_post(self.author, "leido")
+        self.buffer = pageviews.ViewBuffer()
+        self.addCleanup(pageviews.buffer.flush)
+
+    def test_flush_adds_views_and_unique_readers(self):
+        for reader in ("a", "b", "a", "c"):
+            self.buffer.record(self.post.pk, reader)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.buffer.record(self.post.pk, "a")
+        self.buffer.record(self.post.pk, "d")
+        self.buffer.flush()
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.view_count, self.post.unique_readers), (6, 4))
+        self.assertTrue(PostReaderSketch.objects.filter(post=self.post).exists())
+
+    def test_retried_batch_is_not_counted_twice(self):
+        batch = pageviews.ViewBatch()
+        batch.add(self.post.pk, "a")
+
+        self.assertTrue(pageviews.apply_batch(batch))
+        self.assertFalse(pageviews.apply_batch(batch))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+    def test_buffered_views_do_not_change_the_etag(self):
+        url = f"/api/posts/{self.post.pk}/"
+        client = APIClient()
+        client.get(url)
+        etag = client.get(url)["ETag"]
+
+        pageviews.buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 2)
+        # Las lecturas no invalidan la ETag del post
+        cache.clear()
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class HotScoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+
+    def _post(self, slug, hours_ago):
+        post = create_post(self.author, slug)
+        created_at = timezone.now() - timedelta(hours=hours_ago)
+        Post.objects.filter(pk=post.pk).update(created_at=created_at)
+        post.created_at = created_at
+        return post
+
+    def _hot_score(self, post):
+        return Post.all_objects.values_list("hot_score", flat=True).get(pk=post.pk)
+
+    def test_counters_add_and_remove_weighted_points(self):
+        post = self._post("nuevo", hours_ago=1)
+
+        counters.like_added(post.pk)
+        counters.comment_added(post.pk)
+        expected = hotness.score(1, 1, post.created_at, timezone.now())
+        self.assertAlmostEqual(self._hot_score(post), expected, places=3)
+
+        counters.comment_removed(post.pk)
+        counters.like_removed(post.pk)
+        self.assertAlmostEqual(self._hot_score(post), 0, places=3)
+        self.assertGreaterEqual(self._hot_score(post), 0)
+
+    def test_decay_recomputes_scores_and_expires_old_posts(self):
+        recent = self._post("reciente", hours_ago=10)
+        old = self._post("viejo", hours_ago=24 * 30)
+        Post.objects.filter(pk=recent.pk).update(likes_count=4, comments_count=1, hot_score=99)
+        Post.objects.filter(pk=old.pk).update(likes_count=50, hot_score=5)
+
+        call_command("decay_hot_scores", stdout=StringIO())
+
+        expected = hotness.score(4, 1, recent.created_at, timezone.now())
+        self.assertAlmostEqual(self._hot_score(recent), expected, places=3)
+        self.assertEqual(self._hot_score(old), 0)
+
+    def test_hot_ordering_ranks_fresh_activity_first(self):
+        older = self._post("antiguo", hours_ago=48)
+        newer = self._post("fresco", hours_ago=2)
+        for _ in range(5):
+            counters.like_added(older.pk)
+        counters.like_added(newer.pk)
+
+        response = APIClient().get("/api/posts/", {"ordering": "-hot"})
+
+        self.assertEqual([post["id"] for post in response.data["results"]], [newer.pk, older.pk])
+
+    def test_hot_score_is_read_only(self):
+        self.assertTrue(PostListSerializer().fields["hot_score"].read_only)
+
+
+class PostCounterTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.reader = User.objects.create_user(username="lector", email="lector@example.com")
+        self.post = create_post(self.author, "contado")
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def _counts(self):
+        self.post.refresh_from_db()
+        return self.post.likes_count, self.post.comments_count
+
+    def test_writes_keep_counters_up_to_date(self):
+        self.client.put(f"/api/posts/{self.post.pk}/like")
+        response = self.client.post(
+            "/api/comments/", {"post": self.post.pk, "content": "Primero"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        comment = Comment.objects.get()
+        Comment.objects.create(post=self.post, author=self.author, content="Hola", parent=comment)
+        self.assertEqual(self._counts(), (1, 2))
+
+        comment.delete()
+        comment.delete()
+        self.client.delete(f"/api/posts/{self.post.pk}/like")
+        self.assertEqual(self._counts(), (0, 1))
+
+    def test_full_saves_keep_concurrent_increments(self):
+        stale = Post.objects.get(pk=self.post.pk)
+        self.client.put(f"/api/posts/{self.post.pk}/like")
+        Comment.objects.create(post=self.post, author=self.reader, content="Hola")
+
+        stale.title = "Renombrado"
+        stale.save()
+        self.client.force_authenticate(self.author)
+        response = self.client.patch(
+            f"/api/posts/{self.post.pk}/", {"content": "Nuevo texto"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._counts(), (1, 1))
+        self.assertEqual((self.post.title, self.post.content), ("Renombrado", "Nuevo texto"))
+
+    def test_recount_fixes_drift(self):
+        Comment.objects.create(post=self.post, author=self.reader, content="Hola")
+        Post.objects.filter(pk=self.post.pk).update(likes_count=7, comments_count=0)
+
+        stdout = StringIO()
+        call_command("recount_post_counters", "--dry-run", stdout=stdout)
+        self.assertIn("1 desajustados", stdout.getvalue())
+        self.assertEqual(self._counts(), (7, 0))
+
+        call_command("recount_post_counters", stdout=StringIO())
+        self.assertEqual(self._counts(), (0, 1))
+
+    def test_recount_refreshes_author_stats_and_cached_responses(self):
+        cache.clear()
+        self.addCleanup(pageviews.buffer.flush)
+        Like.add_like(self.reader, self.post.pk)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=5)
+        AuthorStats.objects.refresh([self.author.pk])
+        anonymous = APIClient()
+        self.assertEqual(anonymous.get(f"/api/posts/{self.post.pk}/").data["likes_count"], 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("recount_post_counters", stdout=StringIO())
+
+        stats = AuthorStats.objects.get(user=self.author)
+        self.assertEqual(stats.likes_received, 1)
+        self.assertEqual(anonymous.get(f"/api/posts/{self.post.pk}/").data["likes_count"], 1)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        now = timezone.now()
+        self.posts = []
+        # Dos posts comparten created_at: el id desempata
+        for index, hours_ago in enumerate([5, 4, 3, 3, 2, 1, 0]):
+            post = create_post(self.author, f"post-{index}")
+            Post.objects.filter(pk=post.pk).update(created_at=now - timedelta(hours=hours_ago))
+            self.posts.append(post)
+        self.expected = [
+            post.pk
+            for post in sorted(
+                Post.objects.all(), key=lambda post: (post.created_at, post.pk), reverse=True
+            )
+        ]
+        self.client = APIClient()
+
+    def test_walks_every_post_once_in_order(self):
+        url, seen = "/api/posts/?pagination=cursor&page_size=3", []
+        while url:
+            data = self.client.get(url).data
+            self.assertNotIn("count", data)
+            seen += [post["id"] for post in data["results"]]
+            url = data["next"]
+
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_link_returns_the_previous_page(self):
+        first = self.client.get("/api/posts/", {"pagination": "cursor", "page_size": 3}).data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+
+        self.assertIsNone(first["previous"])
+        self.assertEqual([post["id"] for post in second["results"]], self.expected[3:6])
+        self.assertEqual(
+            [post["id"] for post in back["results"]],
+            [post["id"] for post in first["results"]],
+        )
+
+    def test_invalid_cursor_is_404_and_page_numbers_still_work(self):
+        self.assertEqual(self.client.get("/api/posts/", {"cursor": "basura"}).status_code, 404)
+
+        data = self.client.get("/api/posts/", {"page": 1}).data
+        self.assertEqual(data["count"], len(self.posts))
+        # Sin cursor se ordena solo por created_at: los empates no tienen orden fijo
+        self.assertCountEqual([post["id"] for post in data["results"]], self.expected)
+
+
+class CategoryPostsCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.categories = [
+            Category.objects.create(name=f"Categoría {index}", slug=f"categoria-{index}")
+            for index in range(4)
+        ]
+        for index, category in enumerate(self.categories):
+            for number in range(index):
+                create_post(self.author, f"post-{index}-{number}", category=category)
+        first = self.categories[1]
+        create_post(self.author, "borrador", category=first, is_published=False)
+        create_post(self.author, "eliminado", category=first).delete()
+        self.client = APIClient()
+
+    def test_list_counts_published_posts_in_one_query(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/categories/")
+
+        counts = {
+            category["slug"]: category["posts_count"] for category in response.data["results"]
+        }
+        self.assertEqual(counts, {f"categoria-{index}": index for index in range(4)})
+
+    def test_post_list_embeds_categories_with_counts(self):
+        response = self.client.get("/api/posts/", {"category": self.categories[2].pk})
+
+        counts = {post["category"]["posts_count"] for post in response.data["results"]}
+        self.assertEqual(counts, {2})
+
+
+class BulkPostActionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.other = User.objects.create_user(username="otro", email="otro@example.com")
+        self.drafts = [
+            create_post(self.author, f"borrador-{index}", is_published=False) for index in range(3)
+        ]
+        self.ids = [post.pk for post in self.drafts]
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def _published(self):
+        return set(Post.objects.filter(is_published=True).values_list("pk", flat=True))
+
+    def test_publish_and_unpublish_in_one_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/posts/bulk_publish/", {"ids": self.ids}, format="json"
+            )
+        post_updates = [
+            query for query in queries if query["sql"].startswith('UPDATE "posts_post"')
+        ]
+        self.assertEqual(len(post_updates), 1)
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(self._published(), set(self.ids))
+
+        response = self.client.post(
+            "/api/posts/bulk_unpublish/", {"ids": self.ids[:2]}, format="json"
+        )
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(self._published(), {self.ids[2]})
+
+    def test_bulk_delete_soft_deletes(self):
+        response = self.client.post("/api/posts/bulk_delete/", {"ids": self.ids}, format="json")
+
+        self.assertEqual(response.data["updated"], 3)
+        self.assertFalse(Post.objects.filter(pk__in=self.ids).exists())
+        self.assertEqual(Post.all_objects.filter(pk__in=self.ids).count(), 3)
+
+    def test_rejects_foreign_and_missing_posts_without_changes(self):
+        foreign = create_post(self.other, "ajeno", is_published=False)
+
+        response = self.client.post(
+            "/api/posts/bulk_publish/", {"ids": [*self.ids, foreign.pk]}, format="json"
+        )
+        self.assertEqual((response.status_code, response.data["ids"]), (403, [foreign.pk]))
+
+        response = self.client.post(
+            "/api/posts/bulk_publish/", {"ids": [*self.ids, 999]}, format="json"
+        )
+        self.assertEqual((response.status_code, response.data["ids"]), (404, [999]))
+        self.assertEqual(self._published(), set())
+
+
+class TagPostsCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.django = Tag.objects.create(name="Django", slug="django")
+        self.python = Tag.objects.create(name="Python", slug="python")
+        self.post = create_post(self.author, "etiquetado")
+        self.draft = create_post(self.author, "borrador", is_published=False)
+
+    def _counts(self):
+        return dict(Tag.objects.values_list("slug", "posts_count"))
+
+    def test_tag_changes_update_counts(self):
+        self.post.tags.add(self.django, self.python)
+        self.draft.tags.add(self.django)
+        self.assertEqual(self._counts(), {"django": 1, "python": 1})
+
+        self.post.tags.remove(self.python)
+        self.assertEqual(self._counts(), {"django": 1, "python": 0})
+
+        self.post.tags.clear()
+        self.assertEqual(self._counts(), {"django": 0, "python": 0})
+
+    def test_publication_and_deletion_update_counts(self):
+        self.post.tags.add(self.django)
+        self.draft.tags.add(self.django)
+
+        Post.objects.filter(pk=self.draft.pk).publish()
+        self.assertEqual(self._counts()["django"], 2)
+
+        self.post.set_published(False)
+        self.assertEqual(self._counts()["django"], 1)
+
+        self.draft.delete()
+        self.assertEqual(self._counts()["django"], 0)
+
+    def test_cloud_lists_used_tags_by_popularity(self):
+        other = create_post(self.author, "otro")
+        self.post.tags.add(self.django, self.python)
+        other.tags.add(self.python)
+        Tag.objects.create(name="Vacía", slug="vacia")
+
+        response = APIClient().get("/api/tags/cloud/", {"limit": 5})
+
+        self.assertEqual(
+            [(tag["slug"], tag["posts_count"]) for tag in response.data],
+            [("python", 2), ("django", 1)],
+        )
@@ -1,28 +1,46 @@
-from rest_framework import viewsets, status, filters
+from blogpost.conditional import ConditionalGetMixin
+from blogpost.pagination import KeysetPagination, OptionalCursorPagination
+from comments.models import Comment
+from comments.serializers import PostCommentSerializer
+from django.db.models import BooleanField, Exists, F, OuterRef, Prefetch, Q, Value, Window
+from django.db.models.functions import RowNumber
+from django_filters.rest_framework import DjangoFilterBackend
+from likes.models import Like
+from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from search.filters import FullTextSearchFilter
 
-from .models import Post, Tag, Category
+from . import cache as response_cache
+from . import pageviews
+from .cache import AnonymousResponseCacheMixin
+from .models import Category, Post, PostQuerySet, Tag
 from .serializers import (
-    PostListSerializer,
-    PostDetailSerializer,
+    CategorySerializer,
+    PostBulkActionSerializer,
     PostCreateUpdateSerializer,
+    PostDetailSerializer,
+    PostListSerializer,
     TagSerializer,
-    CategorySerializer,
 )
 
+# Respuestas que se incluyen por comentario en la página de un post
+COMMENT_REPLIES_PREVIEW = 3
+MAX_COMMENT_REPLIES_PREVIEW = 20
+
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(ConditionalGetMixin, AnonymousResponseCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar posts con operaciones CRUD completas.
+    Las lecturas admiten GET condicional y las anónimas se sirven desde caché.
     """
 
     queryset = Post.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+    pagination_class = OptionalCursorPagination
 
     # Filtros
     filterset_fields = {
@@ -33,13 +51,19 @@ class PostViewSet(viewsets.ModelViewSet):
         "created_at": ["gte", "lte", "exact"],
     }
 
-    # Búsqueda
-    search_fields = ["title", "content", "author__username"]
+    # Búsqueda de texto completo (ver search/backends.py)
+    search_document = "posts"
 
     # Ordenación
-    ordering_fields = ["created_at", "updated_at", "title"]
+    # "hot" es un alias de hot_score (ver get_queryset): ?ordering=-hot para tendencias
+    ordering_fields = ["created_at", "updated_at", "title", "view_count", "hot"]
     ordering = ["-created_at"]
 
+    # Contadores que cambian sin actualizar updated_at (ver ConditionalGetMixin).
+    # view_count no se incluye: cambia en cada volcado de lecturas y anularía casi
+    # todas las revalidaciones (un 304 puede llevar un view_count algo atrasado)
+    conditional_sum_fields = ("likes_count", "comments_count")
+
     def get_serializer_class(self):
         """
         Retorna el serializer apropiado según la acción.
@@ -58,23 +82,61 @@ class PostViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
 
         # Optimización de consultas: evitar N+1 queries
-        queryset = queryset.select_related("author", "category").prefetch_related("tags")
+        # La categoría se precarga con su contador de posts (una sola consulta por página)
+        queryset = (
+            queryset.select_related("author")
+            .prefetch_related(
+                Prefetch("category", queryset=Category.objects.with_posts_count()),
+                "tags",
+            )
+            .alias(hot=F("hot_score"))
+        )
+
+        # Los listados usan el excerpt precalculado: no hace falta traer el contenido completo
+        if self.action in ("list", "my_posts"):
+            queryset = queryset.defer("content")
 
+        # ?include=likes agrega si el usuario actual dio like, en la misma consulta
+        if self._includes("likes"):
+            queryset = queryset.annotate(user_has_liked=self._user_has_liked())
+
+        return self._filter_visible(queryset)
+
+    def _includes(self, name):
+        """Indica si el cliente pidió el bloque opcional `name` con ?include=a,b."""
+        include = self.request.query_params.get("include", "")
+        return name in (part.strip() for part in include.split(","))
+
+    def _user_has_liked(self):
+        user = self.request.user
+        if not user.is_authenticated:
+            return Value(False, output_field=BooleanField())
+        return Exists(Like.objects.filter(post_id=OuterRef("pk"), user_id=user.pk))
+
+    def _filter_visible(self, queryset):
+        """Restringe el queryset a los posts que el usuario puede ver."""
         # Si el usuario está autenticado, puede ver sus propios posts no publicados
         if self.request.user.is_authenticated:
-            queryset = queryset.filter(Q(is_published=True) | Q(author=self.request.user))
-        else:
-            # Usuarios no autenticados solo ven posts publicados
-            queryset = queryset.filter(is_published=True)
+            return queryset.filter(Q(is_published=True) | Q(author_id=self.request.user.pk))
+        # Usuarios no autenticados solo ven posts publicados
+        return queryset.filter(is_published=True)
 
-        return queryset
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Detalle de un post. La lectura se cuenta también cuando la respuesta
+        sale de la caché o es un 304 (ver posts/pageviews.py).
+        """
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            pageviews.record_view(request, kwargs.get(self.lookup_url_kwarg or self.lookup_field))
+        return response
 
     def _check_author(self, post, user):
         """
         Verifica si el usuario es el autor del post.
         Retorna Response con error si no es autor, None si es autor.
         """
-        if post.author != user:
+        if post.author_id != user.pk:
             return Response(
                 {"detail": "No tienes permisos para esta acción."}, status=status.HTTP_403_FORBIDDEN
             )
@@ -85,6 +147,11 @@ class PostViewSet(viewsets.ModelViewSet):
         Asigna el autor del post al usuario actual.
         """
         serializer.save(author=self.request.user)
+        response_cache.invalidate()
+
+    def perform_update(self, serializer):
+        serializer.save()
+        response_cache.invalidate()
 
     def get_permissions(self):
         """
@@ -125,8 +192,7 @@ class PostViewSet(viewsets.ModelViewSet):
         if error_response:
             return error_response
 
-        post.is_published = True
-        post.save()
+        post.set_published(True)
 
         serializer = self.get_serializer(post)
         return Response(serializer.data)
@@ -143,12 +209,108 @@ class PostViewSet(viewsets.ModelViewSet):
         if error_response:
             return error_response
 
-        post.is_published = False
-        post.save()
+        post.set_published(False)
 
         serializer = self.get_serializer(post)
         return Response(serializer.data)
 
+    def _bulk_action(self, request, operation):
+        """
+        Aplica una operación masiva de PostQuerySet a los posts indicados.
+        Comprueba en una sola consulta que existen y que el usuario es su autor.
+        """
+        serializer = PostBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        post_ids = set(serializer.validated_data["ids"])
+
+        authors = dict(Post.objects.filter(pk__in=post_ids).values_list("pk", "author_id"))
+        missing = post_ids - authors.keys()
+        if missing:
+            return Response(
+                {"detail": "Algunos posts no existen.", "ids": sorted(missing)},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        not_owned = [pk for pk, author_id in authors.items() if author_id != request.user.pk]
+        if not_owned:
+            return Response(
+                {"detail": "No tienes permisos para esta acción.", "ids": sorted(not_owned)},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        updated = operation(Post.objects.filter(pk__in=post_ids))
+        return Response({"updated": updated, "ids": sorted(post_ids)})
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk_publish(self, request):
+        """
+        Publica varios posts del usuario en una sola operación.
+        """
+        return self._bulk_action(request, PostQuerySet.publish)
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk_unpublish(self, request):
+        """
+        Despublica varios posts del usuario en una sola operación.
+        """
+        return self._bulk_action(request, PostQuerySet.unpublish)
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk_delete(self, request):
+        """
+        Elimina (soft delete) varios posts del usuario en una sola operación.
+        """
+        return self._bulk_action(request, PostQuerySet.soft_delete)
+
+    @action(detail=True, methods=["get"])
+    def comments(self, request, pk=None):
+        """
+        Comentarios principales de un post para su página, con paginación keyset
+        (más recientes primero) y las primeras respuestas de cada uno.
+
+        `?replies=N` indica cuántas respuestas incluir por comentario (0-20, por defecto 3).
+        """
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound("Post no encontrado.")
+        if not self._filter_visible(Post.objects.filter(pk=pk)).exists():
+            raise NotFound("Post no encontrado.")
+
+        try:
+            replies_limit = int(request.query_params.get("replies", COMMENT_REPLIES_PREVIEW))
+        except ValueError:
+            replies_limit = COMMENT_REPLIES_PREVIEW
+        replies_limit = max(0, min(replies_limit, MAX_COMMENT_REPLIES_PREVIEW))
+
+        visible = Comment.objects.visible_to(request.user).for_post_page()
+        # Filtra por post y recorre created_at: usa el índice (post, created_at)
+        roots = visible.filter(post_id=pk, parent__isnull=True)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(roots, request, view=self)
+
+        for comment in page:
+            comment.preview_replies = []
+        if page and replies_limit:
+            by_id = {comment.pk: comment for comment in page}
+            # Las primeras N respuestas de cada comentario en una sola consulta
+            replies = (
+                visible.filter(parent_id__in=by_id)
+                .annotate(
+                    reply_position=Window(
+                        RowNumber(),
+                        partition_by=F("parent_id"),
+                        order_by=(F("created_at").asc(), F("id").asc()),
+                    )
+                )
+                .filter(reply_position__lte=replies_limit)
+                .order_by("parent_id", "created_at", "id")
+            )
+            for reply in replies:
+                by_id[reply.parent_id].preview_replies.append(reply)
+
+        serializer = PostCommentSerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=["get"])
     def my_posts(self, request):
         """
@@ -160,7 +322,7 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        queryset = self.get_queryset().filter(author=request.user)
+        queryset = self.get_queryset().filter(author_id=request.user.pk)
         page = self.paginate_queryset(queryset)
 
         if page is not None:
@@ -182,16 +344,32 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ["name", "slug"]
     search_fields = ["name"]
-    ordering_fields = ["name", "created_at"]
+    # ?ordering=-posts_count ordena por popularidad
+    ordering_fields = ["name", "created_at", "posts_count"]
     ordering = ["name"]
 
+    @action(detail=False, methods=["get"])
+    def cloud(self, request):
+        """
+        Nube de etiquetas: las más usadas con su número de posts publicados.
+        Se sirve con el índice de popularidad, sin consultar los posts.
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 50)), 200))
+        except ValueError:
+            limit = 50
+
+        queryset = Tag.objects.filter(posts_count__gt=0).order_by("-posts_count", "name")
+        serializer = self.get_serializer(queryset[:limit], many=True)
+        return Response(serializer.data)
+
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet de solo lectura para categorías.
     """
 
-    queryset = Category.objects.all()
+    queryset = Category.objects.with_posts_count()
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -0,0 +1,295 @@
+"""
+Índices de texto completo para posts y comentarios.
+
+Cada motor de base de datos usa su propia implementación:
+- SQLite: tablas virtuales FTS5 (rowid = id del post/comentario).
+- PostgreSQL: tablas con una columna `tsvector` indexada con GIN.
+- Otros motores: búsqueda `icontains` (sin índice) para no romper la API.
+
+Los índices se mantienen de forma incremental desde `search/signals.py`.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from django.db import connection as default_connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """Describe qué columnas de un modelo se indexan y de dónde salen."""
+
+    name: str
+    base_table: str
+    index_table: str
+    columns: tuple
+    attributes: tuple
+    weights: tuple
+    snippet_column: str
+    source_sql: str
+    fallback_fields: tuple
+
+    def values_for(self, instance):
+        """Valores a indexar para una instancia, en el orden de `columns`."""
+        values = []
+        for path in self.attributes:
+            value = instance
+            for attr in path.split("."):
+                value = getattr(value, attr)
+            values.append(value or "")
+        return tuple(values)
+
+
+POSTS = SearchDocument(
+    name="posts",
+    base_table="posts_post",
+    index_table="search_post_index",
+    columns=("title", "content", "author"),
+    attributes=("title", "content", "author.username"),
+    weights=(5.0, 1.0, 2.0),
+    snippet_column="content",
+    source_sql=(
+        "SELECT p.id, p.title, p.content, u.username FROM posts_post p "
+        "INNER JOIN users_user u ON u.id = p.author_id WHERE p.deleted_at IS NULL"
+    ),
+    fallback_fields=("title", "content", "author__username"),
+)
+
+COMMENTS = SearchDocument(
+    name="comments",
+    base_table="comments_comment",
+    index_table="search_comment_index",
+    columns=("content", "author"),
+    attributes=("content", "author.username"),
+    weights=(1.0, 2.0),
+    snippet_column="content",
+    source_sql=(
+        "SELECT c.id, c.content, u.username FROM comments_comment c "
+        "INNER JOIN users_user u ON u.id = c.author_id WHERE c.deleted_at IS NULL"
+    ),
+    fallback_fields=("content", "author__username"),
+)
+
+DOCUMENTS = {document.name: document for document in (POSTS, COMMENTS)}
+
+SNIPPET_START = "<mark>"
+SNIPPET_STOP = "</mark>"
+
+
+class BaseSearchIndex(ABC):
+    """
+    Interfaz común de los índices de búsqueda. Las implementaciones deben
+    definir `search`; el mantenimiento del esquema y del índice no hace nada
+    por defecto (motores sin índice).
+    """
+
+    def __init__(self, connection=None):
+        self.connection = connection or default_connection
+
+    def create_schema(self):
+        pass
+
+    def drop_schema(self):
+        pass
+
+    def rebuild(self, document):
+        pass
+
+    def index(self, document, instance):
+        pass
+
+    def remove(self, document, pk):
+        pass
+
+    def remove_many(self, document, pks):
+        for pk in pks:
+            self.remove(document, pk)
+
+    @abstractmethod
+    def search(self, queryset, document, query):
+        """
+        Filtra `queryset` con la búsqueda y lo anota con `search_rank`
+        (mayor es mejor) y `search_snippet` (fragmento resaltado).
+        """
+
+
+class SQLiteSearchIndex(BaseSearchIndex):
+    """Índice basado en tablas virtuales FTS5 de SQLite."""
+
+    def create_schema(self):
+        with self.connection.cursor() as cursor:
+            for document in DOCUMENTS.values():
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {document.index_table} "
+                    f"USING fts5({', '.join(document.columns)}, "
+                    "tokenize = 'unicode61 remove_diacritics 2')"
+                )
+
+    def drop_schema(self):
+        with self.connection.cursor() as cursor:
+            for document in DOCUMENTS.values():
+                cursor.execute(f"DROP TABLE IF EXISTS {document.index_table}")
+
+    def rebuild(self, document):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {document.index_table}")
+            cursor.execute(
+                f"INSERT INTO {document.index_table} (rowid, {', '.join(document.columns)}) "
+                f"{document.source_sql}"
+            )
+
+    def index(self, document, instance):
+        placeholders = ", ".join(["%s"] * (len(document.columns) + 1))
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {document.index_table} WHERE rowid = %s", [instance.pk])
+            cursor.execute(
+                f"INSERT INTO {document.index_table} (rowid, {', '.join(document.columns)}) "
+                f"VALUES ({placeholders})",
+                [instance.pk, *document.values_for(instance)],
+            )
+
+    def remove(self, document, pk):
+        self.remove_many(document, [pk])
+
+    def remove_many(self, document, pks):
+        placeholders = ", ".join(["%s"] * len(pks))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {document.index_table} WHERE rowid IN ({placeholders})", list(pks)
+            )
+
+    @staticmethod
+    def build_match(query):
+        """Convierte el texto del usuario en una consulta FTS5 segura (AND de prefijos)."""
+        terms = re.findall(r"\w+", query)
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, document, query):
+        match = self.build_match(query)
+        if not match:
+            return queryset.none()
+
+        table = document.index_table
+        weights = ", ".join(str(weight) for weight in document.weights)
+        correlated = f"FROM {table} WHERE {table} MATCH %s AND rowid = {document.base_table}.id"
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [match])
+        ).annotate(
+            # bm25() devuelve valores negativos: cuanto menor, más relevante
+            search_rank=RawSQL(f"SELECT -bm25({table}, {weights}) {correlated}", [match]),
+            search_snippet=RawSQL(
+                f"SELECT snippet({table}, -1, %s, %s, '…', 24) {correlated}",
+                [SNIPPET_START, SNIPPET_STOP, match],
+            ),
+        )
+
+
+class PostgresSearchIndex(BaseSearchIndex):
+    """Índice basado en columnas `tsvector` con índice GIN de PostgreSQL."""
+
+    config = "simple"
+    weight_labels = ("A", "B", "C", "D")
+
+    def create_schema(self):
+        with self.connection.cursor() as cursor:
+            for document in DOCUMENTS.values():
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {document.index_table} ("
+                    f"id bigint PRIMARY KEY REFERENCES {document.base_table} (id) "
+                    "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+                    "document tsvector NOT NULL)"
+                )
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {document.index_table}_gin "
+                    f"ON {document.index_table} USING GIN (document)"
+                )
+
+    def drop_schema(self):
+        with self.connection.cursor() as cursor:
+            for document in DOCUMENTS.values():
+                cursor.execute(f"DROP TABLE IF EXISTS {document.index_table}")
+
+    def _vector_sql(self, document, columns):
+        """Expresión SQL que combina las columnas en un tsvector ponderado (A-D)."""
+        ranking = sorted(set(document.weights), reverse=True)
+        return " || ".join(
+            f"setweight(to_tsvector('{self.config}', coalesce({column}, '')), "
+            f"'{self.weight_labels[min(ranking.index(weight), 3)]}')"
+            for weight, column in zip(document.weights, columns)
+        )
+
+    def rebuild(self, document):
+        columns = [f"source.{column}" for column in document.columns]
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {document.index_table}")
+            cursor.execute(
+                f"INSERT INTO {document.index_table} (id, document) "
+                f"SELECT source.id, {self._vector_sql(document, columns)} "
+                f"FROM ({document.source_sql}) AS source (id, {', '.join(document.columns)})"
+            )
+
+    def index(self, document, instance):
+        vector = self._vector_sql(document, ["%s"] * len(document.columns))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {document.index_table} (id, document) VALUES (%s, {vector}) "
+                "ON CONFLICT (id) DO UPDATE SET document = EXCLUDED.document",
+                [instance.pk, *document.values_for(instance)],
+            )
+
+    def remove(self, document, pk):
+        self.remove_many(document, [pk])
+
+    def remove_many(self, document, pks):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {document.index_table} WHERE id = ANY(%s)", [list(pks)])
+
+    def search(self, queryset, document, query):
+        if not query.strip():
+            return queryset.none()
+
+        table = document.index_table
+        tsquery = f"websearch_to_tsquery('{self.config}', %s)"
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT id FROM {table} WHERE document @@ {tsquery}", [query])
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT ts_rank(document, {tsquery}) FROM {table} "
+                f"WHERE id = {document.base_table}.id",
+                [query],
+            ),
+            search_snippet=RawSQL(
+                f"ts_headline('{self.config}', "
+                f"{document.base_table}.{document.snippet_column}, {tsquery}, "
+                f"'StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxWords=35, MinWords=15')",
+                [query],
+            ),
+        )
+
+
+class FallbackSearchIndex(BaseSearchIndex):
+    """Búsqueda sin índice para motores sin soporte de texto completo."""
+
+    def search(self, queryset, document, query):
+        condition = Q()
+        for term in query.split():
+            term_condition = Q()
+            for field in document.fallback_fields:
+                term_condition |= Q(**{f"{field}__icontains": term})
+            condition &= term_condition
+        return queryset.filter(condition)
+
+
+SEARCH_INDEXES = {
+    "sqlite": SQLiteSearchIndex,
+    "postgresql": PostgresSearchIndex,
+}
+
+
+def get_search_index(connection=None):
+    """Devuelve el índice adecuado para el motor de la conexión."""
+    connection = connection or default_connection
+    return SEARCH_INDEXES.get(connection.vendor, FallbackSearchIndex)(connection)
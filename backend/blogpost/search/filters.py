@@ -0,0 +1,47 @@
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from .backends import DOCUMENTS, get_search_index
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Búsqueda de texto completo sobre el índice del motor de base de datos.
+
+    Sustituye a `SearchFilter` (mismo parámetro `?search=`). La vista indica
+    qué índice usar con `search_document` ("posts" o "comments"). Los resultados
+    se ordenan por relevancia salvo que el cliente pida otro `?ordering=`, y
+    cada objeto lleva `search_snippet` con los términos resaltados.
+    Debe ir después de `OrderingFilter` en `filter_backends`.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def get_search_query(self, request):
+        return request.query_params.get(self.search_param, "").replace("\x00", "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        document_name = getattr(view, "search_document", None)
+        if not query or document_name is None:
+            return queryset
+
+        queryset = get_search_index().search(queryset, DOCUMENTS[document_name], query)
+
+        if "search_rank" in queryset.query.annotations and not request.query_params.get(
+            self.ordering_param
+        ):
+            queryset = queryset.order_by("-search_rank", *queryset.query.order_by)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Términos de búsqueda de texto completo.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from posts import cache as response_cache
+
+from search.backends import DOCUMENTS, get_search_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruye desde cero los índices de texto completo de posts y comentarios."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "documents",
+            nargs="*",
+            help=f"Índices a reconstruir: {', '.join(sorted(DOCUMENTS))} (por defecto todos).",
+        )
+
+    def handle(self, *args, **options):
+        index = get_search_index()
+        names = options["documents"] or sorted(DOCUMENTS)
+        unknown = set(names) - set(DOCUMENTS)
+        if unknown:
+            raise CommandError(f"Índices desconocidos: {', '.join(sorted(unknown))}")
+
+        with transaction.atomic():
+            index.create_schema()
+            for name in names:
+                index.rebuild(DOCUMENTS[name])
+                self.stdout.write(f"Índice '{name}' reconstruido.")
+        # Las búsquedas anónimas cacheadas pueden haber cambiado
+        response_cache.invalidate()
+
+        self.stdout.write(self.style.SUCCESS("Índices de búsqueda actualizados."))
@@ -0,0 +1,74 @@
+from django.db import migrations
+
+# SQL congelado al crear la migración: no depende de search/backends.py, que
+# puede cambiar después sin alterar lo que hace esta migración.
+CREATE_SQL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_post_index "
+        "USING fts5(title, content, author, tokenize = 'unicode61 remove_diacritics 2')",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_comment_index "
+        "USING fts5(content, author, tokenize = 'unicode61 remove_diacritics 2')",
+        "INSERT INTO search_post_index (rowid, title, content, author) "
+        "SELECT p.id, p.title, p.content, u.username FROM posts_post p "
+        "INNER JOIN users_user u ON u.id = p.author_id WHERE p.deleted_at IS NULL",
+        "INSERT INTO search_comment_index (rowid, content, author) "
+        "SELECT c.id, c.content, u.username FROM comments_comment c "
+        "INNER JOIN users_user u ON u.id = c.author_id WHERE c.deleted_at IS NULL",
+    ],
+    "postgresql": [
+        "CREATE TABLE IF NOT EXISTS search_post_index ("
+        "id bigint PRIMARY KEY REFERENCES posts_post (id) "
+        "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS search_post_index_gin "
+        "ON search_post_index USING GIN (document)",
+        "CREATE TABLE IF NOT EXISTS search_comment_index ("
+        "id bigint PRIMARY KEY REFERENCES comments_comment (id) "
+        "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS search_comment_index_gin "
+        "ON search_comment_index USING GIN (document)",
+        "INSERT INTO search_post_index (id, document) SELECT source.id, "
+        "setweight(to_tsvector('simple', coalesce(source.title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(source.content, '')), 'C') || "
+        "setweight(to_tsvector('simple', coalesce(source.author, '')), 'B') "
+        "FROM (SELECT p.id, p.title, p.content, u.username FROM posts_post p "
+        "INNER JOIN users_user u ON u.id = p.author_id WHERE p.deleted_at IS NULL) "
+        "AS source (id, title, content, author)",
+        "INSERT INTO search_comment_index (id, document) SELECT source.id, "
+        "setweight(to_tsvector('simple', coalesce(source.content, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(source.author, '')), 'A') "
+        "FROM (SELECT c.id, c.content, u.username FROM comments_comment c "
+        "INNER JOIN users_user u ON u.id = c.author_id WHERE c.deleted_at IS NULL) "
+        "AS source (id, content, author)",
+    ],
+}
+
+DROP_SQL = [
+    "DROP TABLE IF EXISTS search_post_index",
+    "DROP TABLE IF EXISTS search_comment_index",
+]
+
+
+def create_indexes(apps, schema_editor):
+    """Crea las tablas de texto completo y las llena con los datos existentes."""
+    for sql in CREATE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("posts", "0003_post_counters"),
+        ("comments", "0001_initial"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,55 @@
+"""
+Mantiene los índices de búsqueda al día cuando se guardan o eliminan
+posts y comentarios (incluido el soft delete, que guarda `deleted_at`).
+"""
+
+from comments.models import Comment
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from posts.models import Post
+from posts.signals import posts_soft_deleted
+
+from .backends import COMMENTS, POSTS, get_search_index
+
+# Campos que afectan al contenido indexado; si un save() no toca ninguno se omite
+INDEXED_FIELDS = {
+    POSTS.name: {"title", "content", "author", "deleted_at"},
+    COMMENTS.name: {"content", "author", "deleted_at"},
+}
+
+
+def sync_instance(document, instance, update_fields=None):
+    """Indexa la instancia o la retira del índice si está eliminada."""
+    if update_fields is not None and not INDEXED_FIELDS[document.name] & set(update_fields):
+        return
+
+    index = get_search_index()
+    if instance.deleted_at is None:
+        index.index(document, instance)
+    else:
+        index.remove(document, instance.pk)
+
+
+@receiver(post_save, sender=Post, dispatch_uid="search_index_post")
+def index_post(sender, instance, update_fields=None, **kwargs):
+    sync_instance(POSTS, instance, update_fields)
+
+
+@receiver(post_save, sender=Comment, dispatch_uid="search_index_comment")
+def index_comment(sender, instance, update_fields=None, **kwargs):
+    sync_instance(COMMENTS, instance, update_fields)
+
+
+@receiver(posts_soft_deleted, sender=Post, dispatch_uid="search_unindex_deleted_posts")
+def unindex_deleted_posts(sender, post_ids, **kwargs):
+    get_search_index().remove_many(POSTS, post_ids)
+
+
+@receiver(post_delete, sender=Post, dispatch_uid="search_unindex_post")
+def unindex_post(sender, instance, **kwargs):
+    get_search_index().remove(POSTS, instance.pk)
+
+
+@receiver(post_delete, sender=Comment, dispatch_uid="search_unindex_comment")
+def unindex_comment(sender, instance, **kwargs):
+    get_search_index().remove(COMMENTS, instance.pk)
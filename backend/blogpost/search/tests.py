@@ -0,0 +1,79 @@
+from io import StringIO
+
+from comments.models import Comment
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from posts.models import Post
+from rest_framework.test import APIClient
+from users.models import User
+
+from .backends import POSTS, get_search_index
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.client = APIClient()
+
+    def post(self, slug, title, content="Contenido"):
+        return Post.objects.create(
+            title=title, slug=slug, content=content, author=self.author, is_published=True
+        )
+
+    def search_ids(self, path, query, **params):
+        response = self.client.get(path, {"search": query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_ranks_title_matches_first_and_highlights_snippet(self):
+        in_content = self.post("contenido", "Otro tema", "Hablamos de índices parciales.")
+        in_title = self.post("titulo", "Índices en SQLite", "Notas varias sobre rendimiento.")
+        self.post("nada", "Sin relación")
+
+        results = self.client.get("/api/posts/", {"search": "indice"}).data["results"]
+
+        self.assertEqual([post["id"] for post in results], [in_title.pk, in_content.pk])
+        self.assertIn("<mark>", results[1]["search_snippet"])
+
+    def test_edits_and_soft_deletes_update_the_index(self):
+        post = self.post("editado", "Paginación keyset")
+        deleted = self.post("borrado", "Paginación por cursor")
+
+        post.title = "Contadores"
+        post.save()
+        deleted.delete()
+
+        self.assertEqual(self.search_ids("/api/posts/", "paginacion"), [])
+        self.assertEqual(self.search_ids("/api/posts/", "contadores"), [post.pk])
+
+    def test_bulk_soft_delete_unindexes_posts(self):
+        post = self.post("masivo", "Operaciones masivas")
+        Post.objects.filter(pk=post.pk).soft_delete()
+
+        self.assertEqual(self.search_ids("/api/posts/", "masivas"), [])
+
+    def test_searches_comments(self):
+        post = self.post("post", "Post")
+        comment = Comment.objects.create(post=post, author=self.author, content="Muy útil, gracias")
+        Comment.objects.create(post=post, author=self.author, content="No me convence")
+
+        self.assertEqual(self.search_ids("/api/comments/", "util"), [comment.pk])
+
+    def test_operators_in_the_query_are_treated_as_text(self):
+        post = self.post("seguro", "Consultas seguras")
+
+        self.assertEqual(self.search_ids("/api/posts/", 'consultas" (*'), [post.pk])
+        self.assertEqual(self.search_ids("/api/posts/", '"()*'), [])
+
+    def test_rebuild_command_restores_the_index(self):
+        post = self.post("reconstruido", "Índice reconstruido")
+        get_search_index(connection).remove(POSTS, post.pk)
+        self.assertEqual(self.search_ids("/api/posts/", "reconstruido"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("rebuild_search_index", "posts", stdout=StringIO())
+
+        self.assertEqual(self.search_ids("/api/posts/", "reconstruido"), [post.pk])
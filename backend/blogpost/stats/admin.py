@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import PostDailyStats
+
+
+@admin.register(PostDailyStats)
+class PostDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ("post", "author", "day", "likes", "comments", "views")
+    list_filter = ("day",)
+    search_fields = ("post__title", "author__username")
+    date_hierarchy = "day"
+    raw_id_fields = ("post", "author")
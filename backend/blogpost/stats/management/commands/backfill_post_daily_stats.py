@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from comments.models import Comment
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDate
+from likes.models import Like
+from posts.models import Post
+
+from stats.models import PostDailyStats
+
+
+def _daily_counts(queryset, first_id, last_id):
+    """{(post_id, día): cantidad} de los likes o comentarios del rango de posts."""
+    rows = (
+        queryset.filter(post_id__gte=first_id, post_id__lte=last_id)
+        .order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values_list("post_id", "day")
+        .annotate(total=Count("pk"))
+    )
+    return {(post_id, day): total for post_id, day, total in rows}
+
+
+def backfill_range(first_id, last_id):
+    """
+    Recalcula likes y comentarios diarios de los posts con id en [first_id, last_id].
+    Las lecturas no se pueden reconstruir (no hay registro por lectura), así que se conservan.
+    Retorna cuántas filas (post, día) se escribieron.
+    """
+    with transaction.atomic():
+        # Bloquea los posts: los likes y comentarios en curso esperan al final
+        # del rango y suman después sobre las filas ya recalculadas
+        authors = dict(
+            Post.all_objects.select_for_update()
+            .filter(pk__range=(first_id, last_id))
+            .values_list("pk", "author_id")
+        )
+        likes = _daily_counts(Like.objects.all(), first_id, last_id)
+        comments = _daily_counts(Comment.objects.all(), first_id, last_id)
+
+        existing = PostDailyStats.objects.filter(post_id__gte=first_id, post_id__lte=last_id)
+        existing.update(likes=0, comments=0)
+        rows = [
+            PostDailyStats(
+                post_id=post_id,
+                author_id=authors[post_id],
+                day=day,
+                likes=likes.get((post_id, day), 0),
+                comments=comments.get((post_id, day), 0),
+            )
+            for post_id, day in likes.keys() | comments.keys()
+            if post_id in authors
+        ]
+        PostDailyStats.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["post", "day"],
+            update_fields=["author", "likes", "comments"],
+        )
+        existing.filter(likes=0, comments=0, views=0).delete()
+    return len(rows)
+
+
+def _backfill_in_thread(bounds):
+    """Cada hilo abre su propia conexión; se cierra al terminar el rango."""
+    try:
+        return backfill_range(*bounds)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los likes y comentarios diarios de PostDailyStats a partir de los "
+        "likes y comentarios existentes, procesando rangos de ids de posts en paralelo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Cantidad de ids de posts por rango (por defecto 1000).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Rangos procesados a la vez (por defecto 4; en SQLite se usa 1).",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        # SQLite solo admite un escritor a la vez: en paralelo solo habría esperas
+        workers = 1 if connection.vendor == "sqlite" else max(options["workers"], 1)
+
+        bounds = Post.all_objects.aggregate(first=Min("pk"), last=Max("pk"))
+        if bounds["first"] is None:
+            self.stdout.write(self.style.SUCCESS("No hay posts."))
+            return
+        ranges = [
+            (start, min(start + chunk_size - 1, bounds["last"]))
+            for start in range(bounds["first"], bounds["last"] + 1, chunk_size)
+        ]
+
+        if workers == 1:
+            totals = [backfill_range(first, last) for first, last in ranges]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                totals = list(executor.map(_backfill_in_thread, ranges))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(ranges)} rangos procesados, {sum(totals)} filas escritas.")
+        )
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("posts", "0008_post_hot_score"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("likes", models.PositiveIntegerField(default=0)),
+                ("comments", models.PositiveIntegerField(default=0)),
+                ("views", models.PositiveBigIntegerField(default=0)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_daily_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="posts.post",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["post", "day"],
+                "indexes": [
+                    models.Index(fields=["author", "day"], name="stats_author_day_idx"),
+                    models.Index(fields=["day"], name="stats_day_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("post", "day"), name="stats_post_day_unique")
+                ],
+            },
+        ),
+    ]
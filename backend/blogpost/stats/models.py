@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import models
+
+
+class PostDailyStats(models.Model):
+    """
+    Actividad diaria de un post: likes y comentarios creados ese día que siguen
+    existiendo, y lecturas registradas ese día. Se mantiene de forma incremental
+    (ver stats/rollups.py) para servir series temporales sin recorrer las tablas
+    de likes y comentarios.
+    """
+
+    post = models.ForeignKey("posts.Post", on_delete=models.CASCADE, related_name="daily_stats")
+    # Copia del autor del post: las series por autor se filtran con el índice
+    # (author, day); el JOIN con posts solo comprueba la visibilidad
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="post_daily_stats"
+    )
+    day = models.DateField()
+    likes = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    views = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["post", "day"]
+        constraints = [
+            models.UniqueConstraint(fields=["post", "day"], name="stats_post_day_unique")
+        ]
+        indexes = [
+            models.Index(fields=["author", "day"], name="stats_author_day_idx"),
+            models.Index(fields=["day"], name="stats_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} @ {self.day}"
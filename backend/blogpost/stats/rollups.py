@@ -0,0 +1,76 @@
+"""
+Mantenimiento incremental de `PostDailyStats`.
+
+Cada like, comentario o lote de lecturas suma a la fila (post, día) con un
+único INSERT ... ON CONFLICT DO UPDATE (el autor se copia del post en el mismo
+INSERT ... SELECT). Los likes y comentarios eliminados restan del día en que se
+crearon, así que las filas coinciden siempre con agrupar por fecha los likes y
+comentarios existentes (que es lo que recalcula `backfill_post_daily_stats`).
+"""
+
+from django.db import connection
+from django.db.models import F
+from posts.models import Post
+
+from .models import PostDailyStats
+
+METRICS = ("likes", "comments", "views")
+
+
+def add(day, metric, counts):
+    """
+    Suma a `metric` del día `day` las cantidades de `counts` ({post_id: n}).
+    Las cantidades negativas nunca dejan el valor por debajo de 0.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Métrica desconocida: {metric}")
+    increments = {post_id: n for post_id, n in counts.items() if n > 0}
+    decrements = {post_id: -n for post_id, n in counts.items() if n < 0}
+    if increments:
+        if connection.features.supports_update_conflicts_with_target:
+            _upsert(day, metric, increments)
+        else:
+            _upsert_fallback(day, metric, increments)
+    for post_id, n in decrements.items():
+        PostDailyStats.objects.filter(post_id=post_id, day=day, **{f"{metric}__gte": n}).update(
+            **{metric: F(metric) - n}
+        )
+
+
+def _upsert(day, metric, increments):
+    quote = connection.ops.quote_name
+    table = quote(PostDailyStats._meta.db_table)
+    post_table = quote(Post._meta.db_table)
+    column = quote(metric)
+
+    cases = " ".join("WHEN %s THEN %s" for _ in increments)
+    values = [f"CASE id {cases} ELSE 0 END" if name == metric else "0" for name in METRICS]
+    params = [connection.ops.adapt_datefield_value(day)]
+    for post_id, n in increments.items():
+        params += [post_id, n]
+    params += list(increments)
+    placeholders = ", ".join(["%s"] * len(increments))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (post_id, author_id, day, {', '.join(map(quote, METRICS))}) "
+            f"SELECT id, author_id, %s, {', '.join(values)} FROM {post_table} "
+            f"WHERE id IN ({placeholders}) "
+            f"ON CONFLICT (post_id, day) DO UPDATE SET {column} = {table}.{column} + excluded.{column}",
+            params,
+        )
+
+
+def _upsert_fallback(day, metric, increments):
+    """Versión con el ORM para motores sin ON CONFLICT (una fila por post)."""
+    authors = dict(Post.all_objects.filter(pk__in=increments).values_list("pk", "author_id"))
+    for post_id, author_id in authors.items():
+        stats, created = PostDailyStats.objects.get_or_create(
+            post_id=post_id,
+            day=day,
+            defaults={"author_id": author_id, metric: increments[post_id]},
+        )
+        if not created:
+            PostDailyStats.objects.filter(pk=stats.pk).update(
+                **{metric: F(metric) + increments[post_id]}
+            )
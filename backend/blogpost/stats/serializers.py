@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+from .rollups import METRICS
+
+
+class StatsSeriesQuerySerializer(serializers.Serializer):
+    """Valida `?days=N` de las series diarias (los últimos N días, hoy incluido)."""
+
+    days = serializers.IntegerField(min_value=1, max_value=365, default=30)
+
+
+class TopPostsQuerySerializer(serializers.Serializer):
+    """Valida los parámetros del ranking de posts."""
+
+    days = serializers.IntegerField(min_value=1, max_value=90, default=7)
+    metric = serializers.ChoiceField(choices=METRICS, default="likes")
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class DailyStatsSerializer(serializers.Serializer):
+    """Actividad de un día de la serie."""
+
+    day = serializers.DateField()
+    likes = serializers.IntegerField()
+    comments = serializers.IntegerField()
+    views = serializers.IntegerField()
+
+
+class TopPostSerializer(serializers.Serializer):
+    """Post del ranking con su actividad en el periodo."""
+
+    post_id = serializers.IntegerField()
+    title = serializers.CharField(source="post__title")
+    slug = serializers.CharField(source="post__slug")
+    likes = serializers.IntegerField()
+    comments = serializers.IntegerField()
+    views = serializers.IntegerField()
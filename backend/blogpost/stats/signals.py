@@ -0,0 +1,25 @@
+"""
+Mantiene las estadísticas diarias al día a partir de los contadores de posts
+(likes y comentarios) y de los volcados de lecturas.
+"""
+
+from django.dispatch import receiver
+from posts.models import Post
+from posts.signals import post_counter_changed, post_views_recorded
+
+from . import rollups
+
+# Contador de Post -> métrica de PostDailyStats
+COUNTER_METRICS = {"likes_count": "likes", "comments_count": "comments"}
+
+
+@receiver(post_counter_changed, sender=Post, dispatch_uid="stats_counter_changed")
+def record_counter_change(sender, post_id, field, delta, day, **kwargs):
+    metric = COUNTER_METRICS.get(field)
+    if metric is not None:
+        rollups.add(day, metric, {post_id: delta})
+
+
+@receiver(post_views_recorded, sender=Post, dispatch_uid="stats_views_recorded")
+def record_views(sender, views, day, **kwargs):
+    rollups.add(day, "views", views)
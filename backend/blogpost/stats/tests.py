@@ -0,0 +1,128 @@
+from datetime import timedelta
+from io import StringIO
+
+from comments.models import Comment
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from likes.models import Like
+from posts.models import Post
+from posts.signals import post_views_recorded
+from rest_framework.test import APIClient
+from users.models import User
+
+from .models import PostDailyStats
+
+
+class StatsTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="autor", email="autor@example.com")
+        self.readers = [
+            User.objects.create_user(username=f"lector{index}", email=f"lector{index}@example.com")
+            for index in range(3)
+        ]
+        self.post = self.create_post("post")
+        self.today = timezone.localdate()
+
+    def create_post(self, slug, **kwargs):
+        kwargs.setdefault("is_published", True)
+        return Post.objects.create(
+            title=slug, slug=slug, content="Contenido", author=self.author, **kwargs
+        )
+
+    def day_stats(self, post, day=None):
+        return (
+            PostDailyStats.objects.filter(post=post, day=day or self.today)
+            .values("likes", "comments", "views")
+            .first()
+        )
+
+
+class RollupSignalTests(StatsTestCase):
+    def test_likes_comments_and_views_are_added_to_today(self):
+        for reader in self.readers[:2]:
+            Like.add_like(reader, self.post.pk)
+        Comment.objects.create(post=self.post, author=self.readers[0], content="Hola")
+        post_views_recorded.send(sender=Post, views={self.post.pk: 7}, day=self.today)
+
+        self.assertEqual(self.day_stats(self.post), {"likes": 2, "comments": 1, "views": 7})
+        self.assertEqual(PostDailyStats.objects.get(post=self.post).author_id, self.author.pk)
+
+    def test_removals_subtract_from_the_day_they_were_created(self):
+        yesterday = self.today - timedelta(days=1)
+        like, _ = Like.add_like(self.readers[0], self.post.pk)
+        created_at = like.created_at - timedelta(days=1)
+        Like.objects.filter(pk=like.pk).update(created_at=created_at)
+        PostDailyStats.objects.filter(post=self.post).update(day=yesterday)
+
+        Like.remove_like(self.readers[0], self.post.pk)
+        comment = Comment.objects.create(post=self.post, author=self.readers[1], content="Hola")
+        comment.delete()
+
+        self.assertEqual(self.day_stats(self.post, yesterday)["likes"], 0)
+        self.assertEqual(self.day_stats(self.post)["comments"], 0)
+
+
+class BackfillPostDailyStatsTests(StatsTestCase):
+    def test_rebuilds_likes_and_comments_and_keeps_views(self):
+        other = self.create_post("otro")
+        for reader in self.readers:
+            Like.add_like(reader, self.post.pk)
+        Comment.objects.create(post=other, author=self.readers[0], content="Hola")
+        post_views_recorded.send(sender=Post, views={self.post.pk: 4}, day=self.today)
+        PostDailyStats.objects.update(likes=0, comments=0)
+        PostDailyStats.objects.create(
+            post=other, author=self.author, day=self.today - timedelta(days=1)
+        )
+
+        call_command("backfill_post_daily_stats", "--chunk-size", "1", stdout=StringIO())
+
+        self.assertEqual(self.day_stats(self.post), {"likes": 3, "comments": 0, "views": 4})
+        self.assertEqual(self.day_stats(other), {"likes": 0, "comments": 1, "views": 0})
+        # Las filas que quedan sin actividad se eliminan
+        self.assertEqual(PostDailyStats.objects.filter(post=other).count(), 1)
+
+
+class StatsEndpointTests(StatsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+
+    def test_post_series_fills_days_without_activity(self):
+        Like.add_like(self.readers[0], self.post.pk)
+
+        response = self.client.get(f"/api/stats/posts/{self.post.pk}/", {"days": 3})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["likes"] for row in response.data["results"]], [0, 0, 1])
+        self.assertEqual(response.data["to"], self.today)
+
+    def test_author_series_hides_drafts_from_other_users(self):
+        draft = self.create_post("borrador", is_published=False)
+        Like.add_like(self.readers[0], self.post.pk)
+        post_views_recorded.send(sender=Post, views={draft.pk: 5}, day=self.today)
+        url = f"/api/stats/authors/{self.author.pk}/"
+
+        today = self.client.get(url, {"days": 1}).data["results"][0]
+        self.assertEqual((today["likes"], today["views"]), (1, 0))
+
+        self.client.force_authenticate(self.author)
+        today = self.client.get(url, {"days": 1}).data["results"][0]
+        self.assertEqual((today["likes"], today["views"]), (1, 5))
+
+    def test_top_orders_by_metric(self):
+        other = self.create_post("otro")
+        Like.add_like(self.readers[0], self.post.pk)
+        for reader in self.readers:
+            Like.add_like(reader, other.pk)
+
+        response = self.client.get("/api/stats/top/", {"metric": "likes", "limit": 5})
+
+        self.assertEqual(
+            [(row["post_id"], row["likes"]) for row in response.data["results"]],
+            [(other.pk, 3), (self.post.pk, 1)],
+        )
+
+    def test_draft_post_series_is_404_for_anonymous_users(self):
+        draft = self.create_post("borrador", is_published=False)
+        self.assertEqual(self.client.get(f"/api/stats/posts/{draft.pk}/").status_code, 404)
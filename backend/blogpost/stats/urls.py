@@ -0,0 +1,13 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from .views import StatsViewSet
+
+app_name = "stats"
+
+router = DefaultRouter()
+router.register(r"stats", StatsViewSet, basename="stats")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
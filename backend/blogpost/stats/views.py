@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q, Sum
+from django.utils import timezone
+from posts.models import Post
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from .models import PostDailyStats
+from .rollups import METRICS
+from .serializers import (
+    DailyStatsSerializer,
+    StatsSeriesQuerySerializer,
+    TopPostSerializer,
+    TopPostsQuerySerializer,
+)
+
+
+def _totals():
+    return {metric: Sum(metric) for metric in METRICS}
+
+
+class StatsViewSet(viewsets.ViewSet):
+    """
+    Estadísticas diarias de actividad, servidas solo desde PostDailyStats:
+    - posts/{id}: serie diaria de un post
+    - authors/{id}: serie diaria sumando los posts de un autor
+    - top: posts con más actividad en los últimos días (por defecto, la semana)
+    """
+
+    permission_classes = []
+
+    def _visible_posts_filter(self):
+        """Filtro (sobre PostDailyStats) de los posts que el usuario puede ver."""
+        visible = Q(post__is_published=True)
+        if self.request.user.is_authenticated:
+            visible |= Q(post__author_id=self.request.user.pk)
+        return visible & Q(post__deleted_at__isnull=True)
+
+    def _series(self, queryset):
+        """Serie de los últimos ?days=N días, con los días sin actividad a 0."""
+        query = StatsSeriesQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        days = query.validated_data["days"]
+        today = timezone.localdate()
+        start = today - timedelta(days=days - 1)
+
+        rows = {
+            row["day"]: row
+            for row in queryset.filter(day__gte=start, day__lte=today)
+            .order_by()
+            .values("day")
+            .annotate(**_totals())
+        }
+        empty = dict.fromkeys(METRICS, 0)
+        results = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            results.append({**empty, **rows.get(day, {}), "day": day})
+        return {
+            "from": start,
+            "to": today,
+            "results": DailyStatsSerializer(results, many=True).data,
+        }
+
+    @action(detail=False, methods=["get"], url_path=r"posts/(?P<post_id>\d+)")
+    def post_series(self, request, post_id=None):
+        """Uso: /api/stats/posts/{id}/?days=30"""
+        visible = Q(is_published=True)
+        if request.user.is_authenticated:
+            visible |= Q(author_id=request.user.pk)
+        post = get_object_or_404(Post.objects.filter(visible).only("id"), pk=post_id)
+        data = self._series(PostDailyStats.objects.filter(post_id=post.pk))
+        return Response({"post_id": post.pk, **data})
+
+    @action(detail=False, methods=["get"], url_path=r"authors/(?P<author_id>\d+)")
+    def author_series(self, request, author_id=None):
+        """Uso: /api/stats/authors/{id}/?days=30"""
+        author = get_object_or_404(get_user_model().objects.only("id"), pk=author_id)
+        queryset = PostDailyStats.objects.filter(self._visible_posts_filter(), author_id=author.pk)
+        return Response({"author_id": author.pk, **self._series(queryset)})
+
+    @action(detail=False, methods=["get"])
+    def top(self, request):
+        """Uso: /api/stats/top/?days=7&metric=likes&limit=10"""
+        query = TopPostsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        days, metric, limit = (query.validated_data[key] for key in ("days", "metric", "limit"))
+        today = timezone.localdate()
+        start = today - timedelta(days=days - 1)
+
+        rows = (
+            PostDailyStats.objects.filter(
+                Q(post__is_published=True, post__deleted_at__isnull=True),
+                day__gte=start,
+                day__lte=today,
+            )
+            .order_by()
+            .values("post_id", "post__title", "post__slug")
+            .annotate(**_totals())
+            .filter(**{f"{metric}__gt": 0})
+            .order_by(f"-{metric}", "-post_id")[:limit]
+        )
+        return Response(
+            {
+                "from": start,
+                "to": today,
+                "metric": metric,
+                "results": TopPostSerializer(rows, many=True).data,
+            }
+        )
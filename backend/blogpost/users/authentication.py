@@ -0,0 +1,154 @@
+"""
+Clases de autenticación de la API.
+
+JWT sin consultas en las lecturas:
+
+Los tokens de acceso llevan el id y el username del usuario (ver
+`TokenObtainPairWithClaimsSerializer`). En los métodos seguros (GET, HEAD,
+OPTIONS) el usuario de la petición se construye solo con esos claims, sin leer
+`users_user` ni `django_session`; las escrituras cargan el usuario real, que
+además comprueba que siga activo. Un usuario desactivado conserva el acceso de
+lectura hasta que caduca su token (ACCESS_TOKEN_LIFETIME en SIMPLE_JWT).
+
+Las vistas que reciben este usuario deben compararlo por id
+(`author_id=user.pk`), no pasarlo al ORM como instancia.
+
+Basic con caché de credenciales verificadas (`CachedBasicAuthentication`):
+ver `VerifiedCredentialCache`.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.functional import cached_property
+from rest_framework import authentication as drf_authentication
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt import authentication, models
+from rest_framework_simplejwt.settings import api_settings
+
+
+class TokenUser(models.TokenUser):
+    """Usuario construido a partir de los claims del token, con id entero como los modelos."""
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """JWT que no consulta la base de datos en las peticiones de solo lectura."""
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS:
+            return api_settings.TOKEN_USER_CLASS(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+
+class VerifiedCredentialCache:
+    """
+    Credenciales Basic ya verificadas, para no repetir el hash de la contraseña
+    (PBKDF2) en cada petición. Es un LRU por proceso, acotado a
+    BASIC_AUTH_CACHE_SIZE entradas que caducan a los BASIC_AUTH_CACHE_TTL segundos.
+
+    La clave es un HMAC (con SECRET_KEY) del usuario y la contraseña, así que
+    en memoria no queda la contraseña. Cada entrada guarda el id del usuario y
+    el hash de su contraseña en el momento de verificarla: si la contraseña
+    cambia (aunque sea desde otro proceso), el hash deja de coincidir y se
+    vuelve a verificar. Los cambios en el propio proceso además vacían las
+    entradas del usuario (ver users/signals.py).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def get_max_size():
+        return getattr(settings, "BASIC_AUTH_CACHE_SIZE", 1024)
+
+    @staticmethod
+    def get_ttl():
+        return getattr(settings, "BASIC_AUTH_CACHE_TTL", 300)
+
+    @staticmethod
+    def make_key(userid, password):
+        return salted_hmac(__name__, f"{userid}\0{password}", algorithm="sha256").hexdigest()
+
+    def get(self, key):
+        """Retorna (user_id, password_hash) o None si no está o caducó."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user_id, password_hash, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user_id, password_hash
+
+    def set(self, key, user_id, password_hash):
+        with self._lock:
+            self._entries[key] = (user_id, password_hash, time.monotonic() + self.get_ttl())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.get_max_size():
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_user(self, user_id):
+        """Elimina las entradas de un usuario (al cambiar su contraseña o estado)."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+credential_cache = VerifiedCredentialCache()
+
+
+class CachedBasicAuthentication(drf_authentication.BasicAuthentication):
+    """
+    BasicAuthentication que solo ejecuta el hasher la primera vez que ve unas
+    credenciales. En las siguientes carga el usuario (una consulta por clave
+    primaria) y comprueba que siga activo, con el mismo login y el mismo hash
+    de contraseña; si algo cambió se verifica de nuevo como siempre.
+    Los intentos fallidos nunca se guardan.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        key = credential_cache.make_key(userid, password)
+        cached = credential_cache.get(key)
+        if cached is not None:
+            user_id, password_hash = cached
+            user = get_user_model()._default_manager.filter(pk=user_id).first()
+            if (
+                user is not None
+                and user.is_active
+                and user.get_username() == userid
+                and constant_time_compare(user.password, password_hash)
+            ):
+                return (user, None)
+            credential_cache.discard(key)
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        credential_cache.set(key, user.pk, user.password)
+        return (user, auth)
@@ -0,0 +1,66 @@
+"""
+Caché de la respuesta de /api/auth/me/ por usuario.
+
+El frontend la pide en cada navegación; la entrada se invalida cuando cambian
+el usuario o sus proveedores de login (ver users/signals.py) y, como red de
+seguridad para los UPDATE masivos que no disparan señales, caduca a los
+ME_CACHE_TIMEOUT segundos.
+
+Igual que en posts/cache.py, las claves llevan una versión por usuario y la
+invalidación la incrementa en lugar de borrar. La vista lee la versión antes de
+cargar el usuario, así que si un cambio se confirma mientras tanto, la respuesta
+ya desactualizada se guarda con la versión anterior y nadie la vuelve a leer.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_timeout():
+    return getattr(settings, "ME_CACHE_TIMEOUT", 300)
+
+
+def version_key(user_id):
+    return f"users:me-version:{user_id}"
+
+
+def me_key(user_id, version):
+    return f"users:me:{user_id}:{version}"
+
+
+def get_version(user_id):
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Si la versión se pierde no se reutilizan números ya usados
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(user_id):
+    key = version_key(user_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, None)
+        return version
+
+
+def get_me(user_id):
+    """Retorna (respuesta cacheada o None, versión); la versión se pasa a `set_me`."""
+    version = get_version(user_id)
+    return cache.get(me_key(user_id, version)), version
+
+
+def set_me(user_id, version, data):
+    cache.set(me_key(user_id, version), data, get_timeout())
+
+
+def invalidate_me(user_id):
+    """Invalida la respuesta cacheada del usuario cuando la transacción actual se confirme."""
+    transaction.on_commit(lambda: bump_version(user_id))
@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.models import User
+from users.serializer import TokenObtainPairWithClaimsSerializer
+
+DEFAULT_PATHS = (
+    "/api/auth/me/",
+    "/api/posts/",
+    "/api/posts/my_posts/",
+    "/api/comments/my_comments/",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara las consultas SQL por petición autenticando con sesión y con JWT. "
+        "Todo se ejecuta en una transacción que se deshace al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="Email del usuario con el que se autentica.")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Ruta a medir (se puede repetir). Por defecto, varias lecturas de la API.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Peticiones por ruta y modo; se informa la media (por defecto 3).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["email"])
+        except User.DoesNotExist:
+            raise CommandError("No existe un usuario con ese email.")
+
+        paths = options["paths"] or DEFAULT_PATHS
+        repeat = max(options["repeat"], 1)
+        results = []
+        # El login por sesión escribe en django_session: no se deja rastro
+        with transaction.atomic():
+            session = APIClient(SERVER_NAME="localhost")
+            session.force_login(user)
+            jwt = APIClient(SERVER_NAME="localhost")
+            token = TokenObtainPairWithClaimsSerializer.get_token(user).access_token
+            jwt.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+            for path in paths:
+                results.append(
+                    (path, self._measure(session, path, repeat), self._measure(jwt, path, repeat))
+                )
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'ruta':<40} {'sesión':>14} {'JWT':>14}")
+        for path, with_session, with_jwt in results:
+            self.stdout.write(f"{path:<40} {with_session:>14} {with_jwt:>14}")
+        self.stdout.write(
+            "(consultas por petición; entre paréntesis, a django_session + users_user)"
+        )
+
+    def _measure(self, client, path, repeat):
+        total = auth = 0
+        status_code = None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                status_code = client.get(path).status_code
+            total += len(queries)
+            auth += sum(
+                1
+                for query in queries.captured_queries
+                if '"django_session"' in query["sql"] or 'FROM "users_user"' in query["sql"]
+            )
+        if status_code >= 400:
+            return f"HTTP {status_code}"
+        return f"{total / repeat:.1f} ({auth / repeat:.1f})"
@@ -0,0 +1,53 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from users.oauth import get_refresh_client, refresh_expiring_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Renueva los tokens OAuth de los proveedores que caducan pronto. "
+        "Con --loop se queda ejecutándose cada N segundos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window",
+            type=int,
+            default=15,
+            help="Renueva los tokens que caducan en los próximos N minutos (por defecto 15).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Máximo de tokens por pasada (por defecto 200).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Renovaciones simultáneas (por defecto 4).",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            metavar="SECONDS",
+            help="Repite cada N segundos en lugar de ejecutar una sola pasada.",
+        )
+
+    def handle(self, *args, **options):
+        client = get_refresh_client()
+        window = timedelta(minutes=options["window"])
+        while True:
+            refreshed, failed = refresh_expiring_tokens(
+                window, options["batch_size"], options["workers"], client
+            )
+            self.stdout.write(f"{refreshed} tokens renovados, {failed} fallidos.")
+            if not options["loop"]:
+                break
+            close_old_connections()
+            time.sleep(options["loop"])
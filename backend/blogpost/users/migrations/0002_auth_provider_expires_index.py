@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userauthprovider",
+            index=models.Index(fields=["token_expires_at"], name="users_provider_expires_idx"),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_author_stats(apps, schema_editor):
+    """Crea las estadísticas de los autores con posts a partir de sus contadores."""
+    Post = apps.get_model("posts", "Post")
+    AuthorStats = apps.get_model("users", "AuthorStats")
+
+    def total(aggregate):
+        totals = (
+            Post.objects.filter(
+                author_id=OuterRef("user_id"), is_published=True, deleted_at__isnull=True
+            )
+            .order_by()
+            .values("author_id")
+            .annotate(total=aggregate)
+            .values("total")
+        )
+        return Coalesce(Subquery(totals), Value(0))
+
+    author_ids = Post.objects.order_by().values_list("author_id", flat=True).distinct()
+    AuthorStats.objects.bulk_create(
+        [AuthorStats(user_id=pk) for pk in author_ids], batch_size=500, ignore_conflicts=True
+    )
+    AuthorStats.objects.update(
+        posts_count=total(Count("pk")),
+        likes_received=total(Sum("likes_count")),
+        comments_received=total(Sum("comments_count")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0008_post_hot_score"),
+        ("users", "0002_auth_provider_expires_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuthorStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="author_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("posts_count", models.PositiveIntegerField(default=0)),
+                ("likes_received", models.PositiveIntegerField(default=0)),
+                ("comments_received", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_author_stats, migrations.RunPython.noop),
+    ]
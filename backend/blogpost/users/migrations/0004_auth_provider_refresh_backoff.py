@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_author_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userauthprovider",
+            name="next_refresh_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="userauthprovider",
+            name="refresh_failures",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -1,5 +1,7 @@
-from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 
 
 class User(AbstractUser):
@@ -41,6 +43,9 @@ class UserAuthProvider(models.Model):
     access_token = models.TextField(null=True, blank=True)
     refresh_token = models.TextField(null=True, blank=True)
     token_expires_at = models.DateTimeField(null=True, blank=True)
+    # Renovaciones fallidas seguidas y cuándo se puede volver a intentar (ver users/oauth.py)
+    refresh_failures = models.PositiveSmallIntegerField(default=0)
+    next_refresh_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -51,6 +56,77 @@ class UserAuthProvider(models.Model):
                 name="uq_provider_user_id_per_provider",
             )
         ]
+        indexes = [
+            # Búsqueda de tokens a punto de caducar (ver users/oauth.py)
+            models.Index(fields=["token_expires_at"], name="users_provider_expires_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} ({self.provider})"
+
+
+def _author_posts_aggregate(aggregate):
+    """Subconsulta con `aggregate` sobre los posts publicados y no eliminados del autor exterior."""
+    from posts.models import Post
+
+    totals = (
+        Post.all_objects.filter(
+            author_id=OuterRef("user_id"), is_published=True, deleted_at__isnull=True
+        )
+        .order_by()
+        .values("author_id")
+        .annotate(total=aggregate)
+        .values("total")
+    )
+    return Coalesce(Subquery(totals), Value(0))
+
+
+class AuthorStatsQuerySet(models.QuerySet):
+    def refresh(self, user_ids):
+        """
+        Recalcula las estadísticas de los autores indicados (creando las filas
+        que falten) a partir de los contadores de sus posts publicados.
+        """
+        user_ids = set(user_ids)
+        self.bulk_create([AuthorStats(user_id=pk) for pk in user_ids], ignore_conflicts=True)
+        return self.filter(user_id__in=user_ids).update(
+            posts_count=_author_posts_aggregate(Count("pk")),
+            likes_received=_author_posts_aggregate(Sum("likes_count")),
+            comments_received=_author_posts_aggregate(Sum("comments_count")),
+        )
+
+    def add_to_post_author(self, post_id, field, delta):
+        """
+        Suma `delta` a `field` del autor del post con un único UPDATE, solo si
+        el post está publicado y no eliminado (sin dejarlo nunca en negativo).
+        """
+        from posts.models import Post
+
+        author = Post.all_objects.filter(
+            pk=post_id, is_published=True, deleted_at__isnull=True
+        ).values("author_id")
+        queryset = self.filter(user_id=Subquery(author))
+        if delta < 0:
+            queryset = queryset.filter(**{f"{field}__gte": -delta})
+        return queryset.update(**{field: F(field) + delta})
+
+
+class AuthorStats(models.Model):
+    """
+    Estadísticas públicas de un autor sobre sus posts publicados y no eliminados.
+    Se mantienen de forma incremental desde users/signals.py: los likes y
+    comentarios suman o restan al autor del post, y publicar, despublicar o
+    eliminar posts recalcula los totales de sus autores.
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="author_stats"
+    )
+    posts_count = models.PositiveIntegerField(default=0)
+    likes_received = models.PositiveIntegerField(default=0)
+    comments_received = models.PositiveIntegerField(default=0)
+
+    objects = AuthorStatsQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Estadísticas de {self.user_id}"
@@ -0,0 +1,223 @@
+"""
+Renovación anticipada de los tokens OAuth de los proveedores de login.
+
+`refresh_expiring_tokens` busca los tokens que caducan dentro de una ventana
+(índice sobre `token_expires_at`), los renueva en paralelo con un pool de
+hilos acotado (solo las llamadas HTTP; los hilos no tocan la base de datos)
+y guarda los resultados con un único `bulk_update`. Lo ejecuta periódicamente
+el comando `refresh_oauth_tokens`.
+
+Los fallos se registran por token (`refresh_failures`, `next_refresh_at`) y el
+token no se vuelve a intentar hasta pasada una espera que se duplica con cada
+fallo (de RETRY_BACKOFF a MAX_RETRY_BACKOFF). Así los tokens revocados o
+caducados hace tiempo no ocupan para siempre el principio de cada lote.
+
+El cliente HTTP se configura con OAUTH_TOKEN_REFRESH_CLIENT (ruta a una clase
+con un método `refresh(provider, refresh_token)`), así los tests pueden usar
+un proveedor falso local.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .cache import invalidate_me
+from .models import UserAuthProvider
+
+logger = logging.getLogger(__name__)
+
+# Endpoints de renovación (grant_type=refresh_token) de cada proveedor
+TOKEN_ENDPOINTS = {
+    "discord": "https://discord.com/api/oauth2/token",
+    "google": "https://oauth2.googleapis.com/token",
+    "github": "https://github.com/login/oauth/access_token",
+}
+
+# Espera tras el primer fallo; se duplica con cada fallo seguido hasta el máximo
+RETRY_BACKOFF = timedelta(minutes=5)
+MAX_RETRY_BACKOFF = timedelta(days=1)
+
+
+class TokenRefreshError(Exception):
+    """El proveedor rechazó la renovación o respondió algo inesperado."""
+
+
+@dataclass(frozen=True)
+class RefreshedToken:
+    access_token: str
+    # Algunos proveedores no rotan el token de refresco: None conserva el actual
+    refresh_token: str | None
+    expires_in: int | None
+
+
+class RequestsTokenRefreshClient:
+    """
+    Cliente por defecto: usa las credenciales de las apps de allauth
+    (SocialApp) y el endpoint de cada proveedor.
+    """
+
+    timeout = 10
+
+    def __init__(self):
+        self._session = requests.Session()
+        self._apps = {}
+
+    def _credentials(self, provider):
+        if provider not in self._apps:
+            from allauth.socialaccount.models import SocialApp
+
+            app = SocialApp.objects.filter(provider=provider).first()
+            self._apps[provider] = (app.client_id, app.secret) if app else None
+        credentials = self._apps[provider]
+        if credentials is None:
+            raise TokenRefreshError(f"No hay una app de {provider} configurada.")
+        return credentials
+
+    def prepare(self, providers):
+        """Carga las credenciales antes de repartir el trabajo entre hilos."""
+        for provider in providers:
+            try:
+                self._credentials(provider)
+            except TokenRefreshError:
+                pass
+
+    def refresh(self, provider, refresh_token):
+        endpoint = TOKEN_ENDPOINTS.get(provider)
+        if endpoint is None:
+            raise TokenRefreshError(f"Proveedor no soportado: {provider}")
+        client_id, secret = self._credentials(provider)
+        try:
+            response = self._session.post(
+                endpoint,
+                data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": refresh_token,
+                    "client_id": client_id,
+                    "client_secret": secret,
+                },
+                headers={"Accept": "application/json"},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError) as exc:
+            raise TokenRefreshError(str(exc)) from exc
+        if "access_token" not in payload:
+            raise TokenRefreshError(payload.get("error", "Respuesta sin access_token"))
+        return RefreshedToken(
+            access_token=payload["access_token"],
+            refresh_token=payload.get("refresh_token"),
+            expires_in=payload.get("expires_in"),
+        )
+
+
+def get_refresh_client():
+    """Instancia el cliente configurado en OAUTH_TOKEN_REFRESH_CLIENT."""
+    path = getattr(settings, "OAUTH_TOKEN_REFRESH_CLIENT", "users.oauth.RequestsTokenRefreshClient")
+    return import_string(path)()
+
+
+def retry_delay(failures):
+    """Espera antes de reintentar un token que falló `failures` veces seguidas."""
+    return min(RETRY_BACKOFF * 2 ** min(failures - 1, 16), MAX_RETRY_BACKOFF)
+
+
+def expiring_tokens(window, now=None):
+    """
+    Proveedores con token de refresco cuyo token de acceso caduca antes de
+    now + window, sin los que fallaron hace poco y aún esperan para reintentarse.
+    """
+    now = now or timezone.now()
+    return (
+        UserAuthProvider.objects.filter(token_expires_at__lte=now + window)
+        .filter(Q(next_refresh_at__isnull=True) | Q(next_refresh_at__lte=now))
+        .exclude(refresh_token__isnull=True)
+        .exclude(refresh_token="")
+        .order_by("token_expires_at")
+    )
+
+
+def refresh_expiring_tokens(window=timedelta(minutes=15), batch_size=200, workers=4, client=None):
+    """
+    Renueva hasta `batch_size` tokens que caducan dentro de `window`.
+    Retorna (renovados, fallidos).
+
+    Los fallos aplazan el siguiente intento del token (ver `retry_delay`) y una
+    renovación correcta reinicia el contador de fallos.
+    """
+    client = client or get_refresh_client()
+    batch = list(expiring_tokens(window).only("id", "provider", "refresh_token")[:batch_size])
+    if not batch:
+        return 0, 0
+
+    if hasattr(client, "prepare"):
+        client.prepare({item.provider for item in batch})
+
+    def refresh(item):
+        try:
+            return client.refresh(item.provider, item.refresh_token)
+        except (TokenRefreshError, requests.RequestException) as exc:
+            logger.warning("No se pudo renovar el token %s (%s): %s", item.pk, item.provider, exc)
+        except Exception:
+            # Un fallo inesperado de un token no debe perder las renovaciones del resto del lote
+            logger.exception("Error inesperado al renovar el token %s (%s)", item.pk, item.provider)
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        results = list(executor.map(refresh, batch))
+
+    now = timezone.now()
+    used = {item.pk: item.refresh_token for item in batch}
+    outcomes = {item.pk: result for item, result in zip(batch, results)}
+    with transaction.atomic():
+        # Si entre medio el usuario volvió a iniciar sesión, sus tokens nuevos se conservan
+        current = (
+            UserAuthProvider.objects.select_for_update()
+            .filter(pk__in=outcomes)
+            .only("id", "user_id", "refresh_token", "refresh_failures")
+        )
+        updated = []
+        failed = []
+        for item in current:
+            if item.refresh_token != used[item.pk]:
+                continue
+            result = outcomes[item.pk]
+            if result is None:
+                item.refresh_failures += 1
+                item.next_refresh_at = now + retry_delay(item.refresh_failures)
+                failed.append(item)
+                continue
+            item.access_token = result.access_token
+            if result.refresh_token:
+                item.refresh_token = result.refresh_token
+            item.token_expires_at = (
+                now + timedelta(seconds=result.expires_in) if result.expires_in else None
+            )
+            item.refresh_failures = 0
+            item.next_refresh_at = None
+            item.updated_at = now
+            updated.append(item)
+        UserAuthProvider.objects.bulk_update(
+            updated,
+            [
+                "access_token",
+                "refresh_token",
+                "token_expires_at",
+                "refresh_failures",
+                "next_refresh_at",
+                "updated_at",
+            ],
+        )
+        UserAuthProvider.objects.bulk_update(failed, ["refresh_failures", "next_refresh_at"])
+        # bulk_update no envía post_save: se invalida /me como haría users/signals.py
+        for user_id in {item.user_id for item in updated}:
+            invalidate_me(user_id)
+    return len(updated), results.count(None)
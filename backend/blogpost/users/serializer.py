@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import User, UserAuthProvider
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from .models import AuthorStats, User, UserAuthProvider
 
 
 class UserAuthProviderSerializer(serializers.ModelSerializer):
@@ -45,6 +47,31 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
 
+class AuthorStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuthorStats
+        fields = ("posts_count", "likes_received", "comments_received")
+        read_only_fields = fields
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    """
+    Perfil público de un autor (sin email) con sus estadísticas precalculadas.
+    """
+
+    stats = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ("id", "username", "first_name", "last_name", "avatar_url", "date_joined", "stats")
+        read_only_fields = fields
+
+    def get_stats(self, obj):
+        # Los autores sin posts aún no tienen fila de estadísticas
+        stats = getattr(obj, "author_stats", None) or AuthorStats(user=obj)
+        return AuthorStatsSerializer(stats).data
+
+
 class UserRegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
 
@@ -63,3 +90,17 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         user.set_password(password)
         user.save()
         return user
+
+
+class TokenObtainPairWithClaimsSerializer(TokenObtainPairSerializer):
+    """
+    Emite el par de tokens (acceso y refresco) con el username como claim, para
+    que las lecturas autentiquen sin consultar la base de datos (ver users/authentication.py).
+    Los tokens de acceso renovados copian los claims del token de refresco.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        return token
@@ -0,0 +1,59 @@
+"""
+Invalida las cachés de usuarios cuando cambian sus datos: las credenciales
+Basic verificadas (users/authentication.py) y la respuesta de /me (users/cache.py).
+Mantiene también las estadísticas de autor (`AuthorStats`).
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from posts.models import Post
+from posts.signals import post_counter_changed, posts_publication_changed, posts_soft_deleted
+
+from .authentication import credential_cache
+from .cache import invalidate_me
+from .models import AuthorStats, User, UserAuthProvider
+
+# Contador de Post -> campo de AuthorStats
+COUNTER_FIELDS = {"likes_count": "likes_received", "comments_count": "comments_received"}
+
+
+@receiver(post_save, sender=User, dispatch_uid="users_user_saved")
+@receiver(post_delete, sender=User, dispatch_uid="users_user_deleted")
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Guardar solo last_login (cada login) no afecta a las credenciales ni a /me
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    credential_cache.invalidate_user(instance.pk)
+    invalidate_me(instance.pk)
+
+
+@receiver(post_save, sender=UserAuthProvider, dispatch_uid="users_auth_provider_saved")
+@receiver(post_delete, sender=UserAuthProvider, dispatch_uid="users_auth_provider_deleted")
+def auth_provider_changed(sender, instance, **kwargs):
+    invalidate_me(instance.user_id)
+
+
+@receiver(post_counter_changed, sender=Post, dispatch_uid="author_stats_counter_changed")
+def post_counter_updated(sender, post_id, field, delta, **kwargs):
+    if field in COUNTER_FIELDS:
+        AuthorStats.objects.add_to_post_author(post_id, COUNTER_FIELDS[field], delta)
+
+
+@receiver(posts_publication_changed, sender=Post, dispatch_uid="author_stats_publication")
+@receiver(posts_soft_deleted, sender=Post, dispatch_uid="author_stats_soft_delete")
+def posts_visibility_changed(sender, post_ids, **kwargs):
+    author_ids = Post.all_objects.filter(pk__in=post_ids).values_list("author_id", flat=True)
+    AuthorStats.objects.refresh(author_ids.distinct())
+
+
+@receiver(post_save, sender=Post, dispatch_uid="author_stats_post_save")
+def post_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Igual que los contadores de etiquetas: los guardados parciales ya se
+    # notifican con las señales propias de posts
+    if created or Post.is_full_save(update_fields):
+        AuthorStats.objects.refresh([instance.author_id])
+
+
+@receiver(post_delete, sender=Post, dispatch_uid="author_stats_post_delete")
+def post_deleted(sender, instance, **kwargs):
+    AuthorStats.objects.refresh([instance.author_id])
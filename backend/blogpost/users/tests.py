@@ -1,3 +1,321 @@
-from django.test import TestCase
+import base64
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from comments.models import Comment
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from likes.models import Like
+from posts.models import Post
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import cache as me_cache
+from .authentication import credential_cache
+from .models import User, UserAuthProvider
+from .oauth import RefreshedToken, TokenRefreshError, refresh_expiring_tokens, retry_delay
+
+
+class FakeTokenRefreshClient:
+    """Proveedor falso: rota los tokens y rechaza los que empiezan por "revocado"."""
+
+    calls = []
+
+    def refresh(self, provider, refresh_token):
+        self.calls.append((provider, refresh_token))
+        if refresh_token.startswith("revocado"):
+            raise TokenRefreshError("invalid_grant")
+        if refresh_token.startswith("roto"):
+            raise KeyError("expires_in")
+        return RefreshedToken(
+            access_token=f"acceso-{refresh_token}",
+            refresh_token=f"{refresh_token}-2",
+            expires_in=3600,
+        )
+
+
+@override_settings(OAUTH_TOKEN_REFRESH_CLIENT="users.tests.FakeTokenRefreshClient")
+class RefreshOAuthTokensTests(TestCase):
+    def setUp(self):
+        FakeTokenRefreshClient.calls = []
+        self.user = User.objects.create_user(username="ana", email="ana@example.com")
+        self.now = timezone.now()
+
+    def _provider(self, provider, refresh_token, expires_in):
+        return UserAuthProvider.objects.create(
+            user=self.user,
+            provider=provider,
+            provider_user_id=refresh_token,
+            access_token="viejo",
+            refresh_token=refresh_token,
+            token_expires_at=self.now + expires_in,
+        )
+
+    def test_refreshes_only_tokens_expiring_within_window(self):
+        expiring = self._provider("discord", "r1", timedelta(minutes=5))
+        later = self._provider("github", "r2", timedelta(hours=2))
+
+        call_command("refresh_oauth_tokens", "--window", "15", stdout=StringIO())
+
+        expiring.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual(expiring.access_token, "acceso-r1")
+        self.assertEqual(expiring.refresh_token, "r1-2")
+        self.assertGreater(expiring.token_expires_at, self.now + timedelta(minutes=50))
+        self.assertEqual(later.access_token, "viejo")
+        self.assertEqual(FakeTokenRefreshClient.calls, [("discord", "r1")])
+
+    def test_failed_refresh_keeps_current_tokens(self):
+        revoked = self._provider("google", "revocado", timedelta(minutes=1))
+        ok = self._provider("discord", "r3", timedelta(minutes=2))
+
+        with self.assertLogs("users.oauth", level="WARNING"):
+            call_command("refresh_oauth_tokens", stdout=StringIO())
+
+        revoked.refresh_from_db()
+        ok.refresh_from_db()
+        self.assertEqual((revoked.access_token, revoked.refresh_token), ("viejo", "revocado"))
+        self.assertEqual(ok.access_token, "acceso-r3")
+
+    def test_unexpected_errors_are_logged_and_do_not_stop_the_batch(self):
+        broken = self._provider("github", "roto", timedelta(minutes=1))
+        ok = self._provider("discord", "r4", timedelta(minutes=2))
+
+        with self.assertLogs("users.oauth", level="ERROR") as logs:
+            refreshed, failed = refresh_expiring_tokens(client=FakeTokenRefreshClient())
+
+        self.assertEqual((refreshed, failed), (1, 1))
+        self.assertIn(f"token {broken.pk}", logs.output[0])
+        ok.refresh_from_db()
+        self.assertEqual(ok.access_token, "acceso-r4")
+
+    def test_failing_tokens_back_off_and_do_not_starve_the_batch(self):
+        revoked = self._provider("google", "revocado", timedelta(minutes=-30))
+        ok = self._provider("discord", "r5", timedelta(minutes=5))
+        client = FakeTokenRefreshClient()
+
+        with self.assertLogs("users.oauth", level="WARNING"):
+            self.assertEqual(refresh_expiring_tokens(batch_size=1, client=client), (0, 1))
+        self.assertEqual(refresh_expiring_tokens(batch_size=1, client=client), (1, 0))
+        self.assertEqual(refresh_expiring_tokens(batch_size=1, client=client), (0, 0))
+
+        revoked.refresh_from_db()
+        ok.refresh_from_db()
+        self.assertEqual(ok.access_token, "acceso-r5")
+        self.assertEqual(revoked.refresh_failures, 1)
+        self.assertGreater(revoked.next_refresh_at, self.now + timedelta(minutes=4))
+        self.assertEqual(FakeTokenRefreshClient.calls, [("google", "revocado"), ("discord", "r5")])
+
+    def test_backoff_grows_until_the_limit(self):
+        self.assertEqual(retry_delay(1), timedelta(minutes=5))
+        self.assertEqual(retry_delay(3), timedelta(minutes=20))
+        self.assertEqual(retry_delay(500), timedelta(days=1))
+
+    def test_success_resets_failures_and_invalidates_me(self):
+        provider = self._provider("discord", "r6", timedelta(minutes=5))
+        UserAuthProvider.objects.filter(pk=provider.pk).update(
+            refresh_failures=3, next_refresh_at=self.now - timedelta(minutes=1)
+        )
+        version = me_cache.get_version(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_expiring_tokens(client=FakeTokenRefreshClient())
+
+        provider.refresh_from_db()
+        self.assertEqual((provider.refresh_failures, provider.next_refresh_at), (0, None))
+        self.assertNotEqual(me_cache.get_version(self.user.pk), version)
+
+
+class MeCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="ana", email="ana@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_second_request_is_served_from_cache(self):
+        self.assertEqual(self.client.get("/api/auth/me/").data["username"], "ana")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/auth/me/").data["username"], "ana")
+
+    def test_user_and_provider_changes_invalidate(self):
+        self.client.get("/api/auth/me/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Ana"
+            self.user.save()
+        self.assertEqual(self.client.get("/api/auth/me/").data["first_name"], "Ana")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserAuthProvider.objects.create(
+                user=self.user, provider="github", provider_user_id="1", access_token="x"
+            )
+        # Cada petición real carga el usuario de nuevo (sin los proveedores ya precargados)
+        self.client.force_authenticate(User.objects.get(pk=self.user.pk))
+        providers = self.client.get("/api/auth/me/").data["auth_providers"]
+        self.assertEqual([provider["provider"] for provider in providers], ["github"])
+
+    def test_stale_response_stored_after_invalidation_is_ignored(self):
+        # Una petición lee la versión y carga datos viejos; el cambio se confirma antes del set
+        data, version = me_cache.get_me(self.user.pk)
+        self.assertIsNone(data)
+        with self.captureOnCommitCallbacks(execute=True):
+            me_cache.invalidate_me(self.user.pk)
+        me_cache.set_me(self.user.pk, version, {"username": "viejo"})
+
+        self.assertIsNone(me_cache.get_me(self.user.pk)[0])
+
+
+class JWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="ana", email="ana@example.com", password="secreto123"
+        )
+        self.client = APIClient()
+
+    def _tokens(self):
+        response = self.client.post(
+            "/api/auth/token/", {"email": "ana@example.com", "password": "secreto123"}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_reads_do_not_load_the_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._tokens()['access']}")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/posts/my_posts/")
+
+        self.assertEqual(response.status_code, 200)
+        sql = [query["sql"] for query in queries]
+        self.assertFalse([query for query in sql if 'FROM "users_user"' in query])
+        self.assertFalse([query for query in sql if '"django_session"' in query])
+
+    def test_writes_reject_inactive_users(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._tokens()['access']}")
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        response = self.client.post("/api/posts/", {"title": "Nuevo", "content": "Texto"})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_refreshed_token_keeps_the_claims(self):
+        refresh = self._tokens()["refresh"]
+
+        response = self.client.post("/api/auth/token/refresh/", {"refresh": refresh})
+        access = AccessToken(response.data["access"])
+
+        self.assertEqual((int(access["user_id"]), access["username"]), (self.user.pk, "ana"))
+
+
+class CachedBasicAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        credential_cache.clear()
+        self.addCleanup(credential_cache.clear)
+        self.user = User.objects.create_user(
+            username="ana", email="ana@example.com", password="secreto123"
+        )
+        self.client = APIClient()
+
+    def _get_me(self, password="secreto123"):
+        credentials = base64.b64encode(f"ana@example.com:{password}".encode()).decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+        return self.client.get("/api/auth/me/").status_code
+
+    def _hasher_calls(self, *passwords):
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", wraps=check_password
+        ) as hasher:
+            status_codes = [self._get_me(password) for password in passwords]
+        return status_codes, hasher.call_count
+
+    def test_verified_credentials_skip_the_hasher(self):
+        self.assertEqual(self._hasher_calls("secreto123", "secreto123"), ([200, 200], 1))
+
+    def test_failed_attempts_are_not_cached(self):
+        status_codes, one_attempt = self._hasher_calls("incorrecta")
+        self.assertEqual(status_codes, [401])
+
+        status_codes, two_attempts = self._hasher_calls("incorrecta", "incorrecta")
+        self.assertEqual(status_codes, [401, 401])
+        self.assertEqual(two_attempts, 2 * one_attempt)
+
+    def test_password_change_invalidates_cached_credentials(self):
+        self.assertEqual(self._get_me(), 200)
+
+        self.user.set_password("nueva-clave")
+        self.user.save()
+
+        self.assertEqual(self._get_me(), 401)
+        self.assertEqual(self._get_me("nueva-clave"), 200)
+
+    def test_changes_from_other_processes_are_detected(self):
+        self.assertEqual(self._get_me(), 200)
+
+        # Un UPDATE directo no envía señales, como un cambio hecho en otro proceso
+        User.objects.filter(pk=self.user.pk).update(password=make_password("nueva-clave"))
+
+        self.assertEqual(self._get_me(), 401)
+
+
+class AuthorDetailTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="autora", email="autora@example.com")
+        self.reader = User.objects.create_user(username="lector", email="lector@example.com")
+        self.post = self._post("publicado", is_published=True)
+        self.client = APIClient()
+
+    def _post(self, slug, **kwargs):
+        return Post.objects.create(
+            title=slug, slug=slug, content="Contenido", author=self.author, **kwargs
+        )
+
+    def _stats(self, user=None):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/authors/{(user or self.author).pk}/")
+        self.assertNotIn("email", response.data)
+        return response.data["stats"]
+
+    def test_likes_and_comments_update_the_totals(self):
+        self._post("borrador")
+        Like.add_like(self.reader, self.post.pk)
+        comment = Comment.objects.create(post=self.post, author=self.reader, content="Hola")
+        self.assertEqual(
+            self._stats(), {"posts_count": 1, "likes_received": 1, "comments_received": 1}
+        )
+
+        Like.remove_like(self.reader, self.post.pk)
+        comment.delete()
+        self.assertEqual(
+            self._stats(), {"posts_count": 1, "likes_received": 0, "comments_received": 0}
+        )
+
+    def test_publication_changes_recompute_the_totals(self):
+        draft = self._post("borrador")
+        Like.add_like(self.reader, self.post.pk)
+
+        Post.objects.filter(pk=draft.pk).publish()
+        self.assertEqual(self._stats()["posts_count"], 2)
+
+        self.post.set_published(False)
+        self.assertEqual(
+            self._stats(), {"posts_count": 1, "likes_received": 0, "comments_received": 0}
+        )
+
+    def test_authors_without_posts_and_inactive_users(self):
+        self.assertEqual(
+            self._stats(self.reader),
+            {"posts_count": 0, "likes_received": 0, "comments_received": 0},
+        )
+
+        User.objects.filter(pk=self.author.pk).update(is_active=False)
+        self.assertEqual(self.client.get(f"/api/authors/{self.author.pk}/").status_code, 404)
@@ -1,10 +1,14 @@
 from django.urls import path
+from rest_framework_simplejwt.views import TokenRefreshView
 
-from .views import RegisterView, MeView
+from .views import AuthorDetailView, MeView, RegisterView, TokenObtainView
 
 app_name = "users"
 
 urlpatterns = [
     path("auth/register/", RegisterView.as_view(), name="register"),
     path("auth/me/", MeView.as_view(), name="me"),
+    path("auth/token/", TokenObtainView.as_view(), name="token-obtain"),
+    path("auth/token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
+    path("authors/<int:pk>/", AuthorDetailView.as_view(), name="author-detail"),
 ]
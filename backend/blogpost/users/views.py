@@ -1,8 +1,18 @@
+from django.db.models import prefetch_related_objects
 from rest_framework import generics
+from rest_framework.generics import RetrieveAPIView, get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.generics import RetrieveAPIView
+from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView
 
-from .serializer import UserSerializer, UserRegisterSerializer
+from . import cache as me_cache
+from .models import User
+from .serializer import (
+    AuthorSerializer,
+    TokenObtainPairWithClaimsSerializer,
+    UserRegisterSerializer,
+    UserSerializer,
+)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -11,8 +21,54 @@ class RegisterView(generics.CreateAPIView):
 
 
 class MeView(RetrieveAPIView):
+    """
+    Datos del usuario actual. La respuesta se cachea por usuario (ver users/cache.py);
+    en frío se carga el usuario con sus proveedores de login en una sola pasada.
+    """
+
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        user = self.request.user
+        if isinstance(user, User):
+            prefetch_related_objects([user], "auth_providers")
+            return user
+        # Con JWT las lecturas solo traen los claims del token: se carga el usuario completo
+        return get_object_or_404(User.objects.prefetch_related("auth_providers"), pk=user.pk)
+
+    def retrieve(self, request, *args, **kwargs):
+        data, version = me_cache.get_me(request.user.pk)
+        if data is None:
+            data = self.get_serializer(self.get_object()).data
+            me_cache.set_me(request.user.pk, version, data)
+        return Response(data)
+
+
+class AuthorDetailView(RetrieveAPIView):
+    """
+    Perfil público de un autor con sus totales (posts publicados, likes y
+    comentarios recibidos), leídos de AuthorStats sin agregar en cada petición.
+    """
+
+    serializer_class = AuthorSerializer
+    permission_classes = [AllowAny]
+    queryset = (
+        User.objects.filter(is_active=True)
+        .select_related("author_stats")
+        .only(
+            "id",
+            "username",
+            "first_name",
+            "last_name",
+            "avatar_url",
+            "date_joined",
+            "author_stats",
+        )
+    )
+
+
+class TokenObtainView(TokenObtainPairView):
+    """Login con email y contraseña; devuelve los tokens de acceso y refresco."""
+
+    serializer_class = TokenObtainPairWithClaimsSerializer